@@ -0,0 +1,42 @@
+"""
+Contrat d'entrée de l'API de scoring : les 20 features attendues par le
+modèle, dans l'ordre du pipeline.
+
+Module sans dépendance lourde (pydantic seulement) : l'API, le cache
+des jeux de données et les scripts d'entraînement le partagent sans
+importer app_api (ni charger le modèle).
+"""
+
+from pydantic import BaseModel
+
+
+# ============================================================
+# 🔐 SCHÉMA OFFICIEL — CONTRAT API
+# ============================================================
+
+
+class InputFeatures(BaseModel):
+    AMT_ANNUITY: float
+    AMT_CREDIT: float
+    AMT_GOODS_PRICE: float
+    AMT_INCOME_TOTAL: float
+    AMT_REQ_CREDIT_BUREAU_QRT: float
+    AMT_REQ_CREDIT_BUREAU_YEAR: float
+    CODE_GENDER_F: int
+    DAYS_BIRTH: float
+    DAYS_EMPLOYED: float
+    DAYS_ID_PUBLISH: float
+    DAYS_LAST_PHONE_CHANGE: float
+    DAYS_REGISTRATION: float
+    EXT_SOURCE_1: float
+    EXT_SOURCE_2: float
+    EXT_SOURCE_3: float
+    HOUR_APPR_PROCESS_START: int
+    NAME_CONTRACT_TYPE: int
+    OWN_CAR_AGE: float
+    REGION_POPULATION_RELATIVE: float
+    TOTALAREA_MODE: float
+
+
+# Ordre des colonnes attendu par le pipeline (identique au schéma)
+FEATURE_NAMES = list(InputFeatures.model_fields)
@@ -1,8 +1,40 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, File, Header, HTTPException, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import ValidationError
+from typing import Any, List, Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+import asyncio
+import contextvars
+import functools
+import hashlib
+import hmac
+import itertools
+import threading
+import time
+import numpy as np
 import pandas as pd
 import joblib
 import os
+import random
+
+from api_schema import FEATURE_NAMES, InputFeatures
+from fast_scorer import FastScorer
+from global_explain import GlobalSummary, summary_path
+from drift_monitoring import DriftProfile, OnlineDriftMonitor, reference_path, to_json
+import metrics
+from sampling_profiler import SamplingProfiler
+from audit_log import AuditLog
+from model_registry import ArtifactMismatch, ModelRegistry, file_sha256, manifest_path
+from sample_clients import sample_clients
+
+# Parquet optionnel (pyarrow)
+try:
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except Exception:
+    HAS_PYARROW = False
 
 
 # ============================================================
@@ -12,8 +44,71 @@ import os
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # Vérifie bien que ton dossier s'appelle "models" sur GitHub
-MODEL_PATH = os.path.join(BASE_DIR, "models", "pipeline_best_model_top20.joblib")
+MODELS_DIR = os.path.join(BASE_DIR, "models")
+MODEL_PATH = os.path.join(MODELS_DIR, "pipeline_best_model_top20.joblib")
 SEUIL_METIER = 0.29
+# Registre des versions (models/registry.json, cf. model_registry.py) :
+# la version par défaut (MODEL_VERSION, sinon celle du manifeste) fixe
+# MODEL_PATH et SEUIL_METIER ; les autres sont servies par
+# /predict?model=<version>, chargées à la demande et au plus
+# MODEL_POOL_SIZE résidentes en plus du modèle par défaut
+MODEL_REGISTRY_PATH = os.getenv("MODEL_REGISTRY_PATH", "") or manifest_path(MODELS_DIR)
+MODEL_POOL_SIZE = int(os.getenv("MODEL_POOL_SIZE", "2"))
+_registry = ModelRegistry.load(MODEL_REGISTRY_PATH)
+MODEL_VERSION = os.getenv("MODEL_VERSION", "") or _registry.default
+if MODEL_VERSION in _registry.versions:
+    MODEL_PATH = _registry.artifact_path(MODEL_VERSION)
+    SEUIL_METIER = _registry.versions[MODEL_VERSION]["threshold"]
+# Nombre maximal de lignes acceptées par /predict/batch
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "10000"))
+# Moteur de scoring : "fast" (NumPy, sans pandas/sklearn) ou "pipeline"
+SCORER = os.getenv("SCORER", "fast")
+# Écart maximal toléré entre scorer rapide et pipeline au démarrage
+FAST_SCORER_TOL = 1e-6
+# Micro-batching de /predict : regroupe jusqu'à N lignes ou T millisecondes
+MICRO_BATCH = os.getenv("MICRO_BATCH", "0") == "1"
+MICRO_BATCH_MAX_SIZE = int(os.getenv("MICRO_BATCH_MAX_SIZE", "64"))
+MICRO_BATCH_MAX_WAIT_MS = float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "2"))
+# Cache des prédictions (taille 0 = désactivé, TTL en secondes)
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "4096"))
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "3600"))
+# Arrondi des features avant hachage (nb de décimales, vide = valeurs exactes)
+PREDICTION_CACHE_ROUND = os.getenv("PREDICTION_CACHE_ROUND") or None
+# Cache des explications /explain (mêmes TTL et arrondi, 0 = désactivé)
+EXPLAIN_CACHE_SIZE = int(os.getenv("EXPLAIN_CACHE_SIZE", "1024"))
+# TreeSHAP coûte ~5 ms par ligne : lots d'explications plus petits
+EXPLAIN_MAX_BATCH_SIZE = int(os.getenv("EXPLAIN_MAX_BATCH_SIZE", "1000"))
+# Résumé global des explications (vide = <modèle>.explain.npz, cf. global_explain.py)
+GLOBAL_EXPLAIN_PATH = os.getenv("GLOBAL_EXPLAIN_PATH", "")
+# Intervalle (s) entre deux contrôles du fichier de résumé global
+GLOBAL_EXPLAIN_CHECK_S = float(os.getenv("GLOBAL_EXPLAIN_CHECK_S", "5"))
+# Monitoring du drift sur le trafic (référence : fichier, sinon premières lignes reçues)
+DRIFT_MONITOR = os.getenv("DRIFT_MONITOR", "1") == "1"
+DRIFT_REFERENCE_PATH = os.getenv("DRIFT_REFERENCE_PATH", "") or reference_path(MODEL_PATH)
+DRIFT_REFERENCE_ROWS = int(os.getenv("DRIFT_REFERENCE_ROWS", "5000"))
+DRIFT_WINDOW_ROWS = int(os.getenv("DRIFT_WINDOW_ROWS", "10000"))
+DRIFT_QUEUE_SIZE = int(os.getenv("DRIFT_QUEUE_SIZE", "1024"))
+# Journal d'audit des décisions (vide = désactivé) ; file pleine :
+# "block" (la requête attend, au plus AUDIT_BLOCK_TIMEOUT s) ou "drop"
+AUDIT_LOG_DIR = os.getenv("AUDIT_LOG_DIR", "")
+AUDIT_BACKPRESSURE = os.getenv("AUDIT_BACKPRESSURE", "block")
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "1024"))
+AUDIT_BLOCK_TIMEOUT = float(os.getenv("AUDIT_BLOCK_TIMEOUT", "5"))
+AUDIT_ROTATE_MB = float(os.getenv("AUDIT_ROTATE_MB", "64"))
+# Taille des blocs lus par /predict/stream (borne la mémoire)
+STREAM_CHUNK_ROWS = int(os.getenv("STREAM_CHUNK_ROWS", "50000"))
+ID_COL = "SK_ID_CURR"
+# Jeton des endpoints /admin/* (vide = administration désactivée)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+# Surveillance de l'artefact du modèle, en secondes (0 = désactivée)
+MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", "0"))
+# Profilage échantillonné : part des requêtes profilées (0 = désactivé,
+# modifiable à chaud via POST /admin/profile), intervalle des relevés
+# de piles et part maximale du temps consacrée aux relevés
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+PROFILE_MAX_OVERHEAD = float(os.getenv("PROFILE_MAX_OVERHEAD", "0.02"))
+PROFILE_MAX_STACKS = int(os.getenv("PROFILE_MAX_STACKS", "10000"))
 
 
 # ============================================================
@@ -21,57 +116,893 @@ SEUIL_METIER = 0.29
 # ============================================================
 
 
+@asynccontextmanager
+async def lifespan(app):
+    # Chargement du modèle en arrière-plan : le serveur répond
+    # immédiatement (/health/live) pendant la désérialisation
+    start_model_loading()
+    if MODEL_WATCH_INTERVAL > 0:
+        threading.Thread(target=_watch_model_file, name="model-watcher", daemon=True).start()
+    yield
+    # Arrêt : les décisions en file sont écrites avant de quitter
+    if audit_log is not None:
+        audit_log.flush()
+
+
 app = FastAPI(
     title="API Scoring Crédit — Projet 7",
     description="API de prédiction du risque de défaut (20 variables)",
-    version="1.0"
+    version="1.0",
+    lifespan=lifespan
 )
 
 
 # ============================================================
-# 📦 CHARGEMENT DU MODÈLE (ROBUSTE)
+# 📏 MÉTRIQUES (FORMAT PROMETHEUS, /metrics)
 # ============================================================
+# Durées mesurées par perf_counter (monotone) et agrégées en
+# histogrammes en mémoire : aucun log sur le chemin des requêtes.
+#
+# Étapes d'une requête de scoring :
+#   validation    : arrivée de la requête -> entrée dans l'endpoint
+#                   (lecture du corps, JSON, validation pydantic)
+#   build         : construction de la matrice des features
+#   predict       : appel au modèle (predict_proba / scorer rapide)
+#   serialization : sortie de l'endpoint -> début de la réponse
+#                   (encodage JSON par FastAPI)
+# ------------------------------------------------------------
 
 
-model = None
-try:
-    if os.path.exists(MODEL_PATH):
-        # Le chargement peut échouer ici si les versions de sklearn divergent
-        model = joblib.load(MODEL_PATH)
-        print("✅ Modèle chargé avec succès")
+registry = metrics.Registry()
+REQUESTS = registry.counter(
+    "http_requests_total", "Requêtes HTTP traitées", ("endpoint", "method", "status")
+)
+REQUEST_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "Durée des requêtes HTTP (jusqu'au début de la réponse)", ("endpoint",)
+)
+STAGE_LATENCY = registry.histogram(
+    "predict_stage_duration_seconds", "Durée des étapes des requêtes de scoring", ("endpoint", "stage")
+)
+DECISIONS = registry.counter(
+    "predict_decisions_total", "Décisions rendues au seuil métier (1 = refus, 0 = accord)", ("decision",)
+)
+INVALID_ROWS = registry.counter(
+    "predict_invalid_rows_total", "Lignes de lot rejetées à la validation", ("endpoint",)
+)
+MODEL_LOADS = registry.counter(
+    "model_loads_total", "Chargements de modèle (initial et rechargements)", ("result",)
+)
+
+# Contexte de chaque requête, renseigné par MetricsMiddleware
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+# Requête tirée au sort par le profileur (hérité par le threadpool)
+_profiling = contextvars.ContextVar("profiling", default=False)
+
+profiler = SamplingProfiler(
+    rate=PROFILE_SAMPLE_RATE,
+    interval_ms=PROFILE_INTERVAL_MS,
+    max_overhead=PROFILE_MAX_OVERHEAD,
+    max_stacks=PROFILE_MAX_STACKS,
+)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI « pur » (sans BaseHTTPMiddleware) : compte les
+    requêtes, mesure leur durée jusqu'au début de la réponse et publie
+    les étapes notées par l'endpoint.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timings = {"t0": time.perf_counter(), "stages": {}}
+        token = _request_timings.set(timings)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timings["t_response"] = time.perf_counter()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_timings.reset(token)
+            # Gabarit de route (/explain/global/{feature}) : cardinalité bornée
+            endpoint = getattr(scope.get("route"), "path", "other")
+            t_response = timings.get("t_response", time.perf_counter())
+            REQUESTS.inc(endpoint=endpoint, method=scope["method"], status=status)
+            REQUEST_LATENCY.observe(t_response - timings["t0"], endpoint=endpoint)
+
+            stages = timings["stages"]
+            if "t_exit" in timings:
+                stages["serialization"] = t_response - timings["t_exit"]
+            for stage, seconds in stages.items():
+                STAGE_LATENCY.observe(seconds, endpoint=endpoint, stage=stage)
+
+
+app.add_middleware(MetricsMiddleware)
+
+
+def _instrumented(fn):
+    """
+    Note l'entrée (fin de la validation) et la sortie (début de la
+    sérialisation) d'un endpoint de scoring ; tire au sort les requêtes
+    profilées (PROFILE_SAMPLE_RATE).
+    """
+    def enter():
+        timings = _request_timings.get()
+        if timings is not None:
+            timings["stages"]["validation"] = time.perf_counter() - timings["t0"]
+        sampled = profiler.rate > 0 and random.random() < profiler.rate
+        if sampled:
+            profiler.requests += 1
+        return timings, sampled, _profiling.set(sampled)
+
+    def leave(timings, token):
+        _profiling.reset(token)
+        if timings is not None:
+            timings["t_exit"] = time.perf_counter()
+
+    if asyncio.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            timings, sampled, token = enter()
+            try:
+                if sampled:
+                    return await profiler.drive(fn(*args, **kwargs))
+                return await fn(*args, **kwargs)
+            finally:
+                leave(timings, token)
     else:
-        print(f"❌ Erreur : Fichier introuvable à {MODEL_PATH}")
-except Exception as e:
-    # Apparaîtra dans tes logs Render en cas de crash
-    print(f"💥 Erreur fatale lors du chargement du modèle : {str(e)}")
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            timings, sampled, token = enter()
+            try:
+                if sampled:
+                    return profiler.call(fn, *args, **kwargs)
+                return fn(*args, **kwargs)
+            finally:
+                leave(timings, token)
+    return wrapper
+
+
+def _profiled_call(fn, *args):
+    """Appel dans le threadpool, échantillonné si la requête est profilée."""
+    if _profiling.get():
+        return profiler.call(fn, *args)
+    return fn(*args)
+
+
+@contextmanager
+def _stage(name):
+    """Durée d'une étape de l'endpoint (cumulée si répétée)."""
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = _request_timings.get()
+        if timings is not None:
+            stages = timings["stages"]
+            stages[name] = stages.get(name, 0.0) + time.perf_counter() - t
+
+
+def _record_decisions(probas, threshold):
+    n_refus = int(np.count_nonzero(np.asarray(probas) >= threshold))
+    n_accord = int(np.size(probas)) - n_refus
+    if n_refus:
+        DECISIONS.inc(n_refus, decision="1")
+    if n_accord:
+        DECISIONS.inc(n_accord, decision="0")
+
+
+# ============================================================
+# 📦 CHARGEMENT DU MODÈLE (ROBUSTE)
+# ============================================================
+
+
+class ModelBundle:
+    """
+    Pipeline chargé et artefacts dérivés (scorer rapide, empreinte).
+    Jamais modifié une fois publié : un rechargement construit un
+    nouveau bundle puis remplace la référence globale `bundle` en une
+    seule affectation. Une requête lit `bundle` une fois et garde
+    cette référence jusqu'à sa réponse.
+    """
+
+    def __init__(self, pipe, scorer, signature, path, stamp, threshold=None, version=None):
+        self.pipe = pipe
+        self.scorer = scorer
+        # Seuil propre à la version ; None : SEUIL_METIER (modèle par défaut)
+        self._threshold = threshold
+        # Version du registre (None si l'artefact n'y figure pas)
+        self.version = version
+        # Empreinte du contenu de l'artefact (invalide le cache des prédictions)
+        self.signature = signature
+        self.path = path
+        # (mtime, taille) du fichier au chargement, pour la surveillance
+        self.stamp = stamp
+        self.loaded_at = time.time()
+        self.warmup_latency_ms = None
+
+    @property
+    def threshold(self):
+        return SEUIL_METIER if self._threshold is None else self._threshold
+
+
+# Renseigné par load_model() (voir plus bas), pas à l'import du module
+bundle = None
+
+# État du chargement : "not_started" -> "loading" -> "ready" | "failed"
+MODEL_STATUS = {
+    "state": "not_started",
+    "error": None,
+    "load_time_s": None,
+    "warmup_latency_ms": None
+}
+_load_lock = threading.Lock()
+
+
+# ============================================================
+# ⚡ SCORER RAPIDE (ÉTAPE DE DÉMARRAGE)
+# ============================================================
+
+
+def _build_fast_scorer(pipe) -> FastScorer:
+    """
+    Extrait imputer, scaler et arbres du pipeline, puis vérifie
+    la parité avec pipe.predict_proba sur des lignes synthétiques.
+    """
+    scorer = FastScorer.from_pipeline(pipe, FEATURE_NAMES)
+
+    # Lignes de contrôle : médianes ± k écarts-types, plus des valeurs manquantes
+    rng = np.random.default_rng(0)
+    X = np.empty((64, len(FEATURE_NAMES)))
+    X[:, scorer.col_idx] = scorer.statistics + scorer.scale * rng.normal(0, 2, (64, len(FEATURE_NAMES)))
+    X[rng.random(X.shape) < 0.05] = np.nan
+
+    expected = pipe.predict_proba(pd.DataFrame(X, columns=FEATURE_NAMES))[:, 1]
+    ecart = float(np.max(np.abs(scorer.predict_proba(X) - expected)))
+    if ecart > FAST_SCORER_TOL:
+        raise ValueError(f"écart de parité {ecart:.2e} > {FAST_SCORER_TOL:.0e}")
+    return scorer
+
+
+# ============================================================
+# 🧮 SCORING VECTORISÉ
+# ============================================================
+
+
+def _features_matrix(rows: List[InputFeatures]) -> np.ndarray:
+    """
+    Construit la matrice (n, 20) des features, colonnes dans l'ordre
+    de FEATURE_NAMES.
+    """
+    return np.array(
+        [[getattr(row, col) for col in FEATURE_NAMES] for row in rows],
+        dtype=np.float64
+    )
+
+
+def _predict_matrix(X: np.ndarray, b: Optional[ModelBundle] = None) -> np.ndarray:
+    """
+    Probabilités de défaut pour toutes les lignes de X,
+    en un seul appel à predict_proba (bundle courant par défaut).
+    """
+    b = b or bundle
+    if b.scorer is not None:
+        return b.scorer.predict_proba(X)
+
+    # Le ColumnTransformer sélectionne les colonnes par nom
+    return b.pipe.predict_proba(pd.DataFrame(X, columns=FEATURE_NAMES))[:, 1]
+
+
+# ============================================================
+# 🔄 CHARGEMENT EN ARRIÈRE-PLAN + WARM-UP
+# ============================================================
+
+
+# Profil "Client_1" du front Streamlit, utilisé pour le warm-up
+WARMUP_CLIENT = sample_clients["Client_1 — Profil très faible risque"]
+
+
+def _file_stamp(path: str):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _load_bundle(path: str, threshold: Optional[float] = None, version: Optional[str] = None,
+                 registry_threshold: bool = False) -> ModelBundle:
+    """
+    Charge un artefact, construit son scorer rapide, le valide sur le
+    client canari (WARMUP_CLIENT) et mesure la latence après warm-up.
+    registry_threshold : si l'artefact est une version du registre
+    (même SHA-256), le seuil de cette version remplace `threshold`.
+    Lève une exception si le modèle n'est pas utilisable.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Fichier introuvable à {path}")
+
+    stamp = _file_stamp(path)
+    # Le chargement peut échouer ici si les versions de sklearn divergent
+    pipe = joblib.load(path)
+    signature = file_sha256(path)
+
+    names = getattr(pipe, "feature_names_in_", None)
+    if names is not None and sorted(names) != sorted(FEATURE_NAMES):
+        raise ValueError("les features du modèle ne correspondent pas au contrat API")
+
+    scorer = None
+    if SCORER == "fast":
+        try:
+            scorer = _build_fast_scorer(pipe)
+        except Exception as e:
+            # Repli silencieux sur le pipeline sklearn
+            print(f"⚠️ Scorer rapide indisponible, utilisation du pipeline : {str(e)}")
+
+    if version is None:
+        version = _get_registry().find(signature)
+        if version is not None and registry_threshold:
+            threshold = _get_registry().versions[version]["threshold"]
+    b = ModelBundle(pipe, scorer, signature, path, stamp, threshold, version)
+
+    # Canari + warm-up : la première inférence paie les initialisations paresseuses
+    X = _features_matrix([InputFeatures(**WARMUP_CLIENT)])
+    proba = _predict_matrix(X, b)
+    if not (np.all(np.isfinite(proba)) and np.all((proba >= 0) & (proba <= 1))):
+        raise ValueError(f"prédiction canari invalide : {proba}")
+    t1 = time.perf_counter()
+    _predict_matrix(X, b)
+    b.warmup_latency_ms = (time.perf_counter() - t1) * 1000
+    return b
+
+
+def load_model():
+    """
+    Charge le pipeline, construit le scorer rapide puis exécute une
+    prédiction de warm-up. L'état ne passe à "ready" qu'une fois la
+    latence de cette première prédiction mesurée.
+    """
+    global bundle
+
+    t0 = time.perf_counter()
+    MODEL_STATUS.update(state="loading", error=None)
+    try:
+        bundle = _load_bundle(MODEL_PATH)
+        print("✅ Modèle chargé avec succès"
+              + (" (⚡ scorer rapide)" if bundle.scorer is not None else ""))
+
+        MODEL_STATUS.update(
+            state="ready",
+            load_time_s=time.perf_counter() - t0,
+            warmup_latency_ms=bundle.warmup_latency_ms
+        )
+        print(f"🔥 Warm-up terminé : {bundle.warmup_latency_ms:.2f} ms / prédiction")
+        MODEL_LOADS.inc(result="success")
+    except Exception as e:
+        MODEL_LOADS.inc(result="failure")
+        MODEL_STATUS.update(state="failed", error=str(e))
+        # Apparaîtra dans tes logs Render en cas de crash
+        print(f"💥 Erreur fatale lors du chargement du modèle : {str(e)}")
+
+
+def start_model_loading():
+    """Lance load_model() dans un thread, une seule fois."""
+    with _load_lock:
+        if MODEL_STATUS["state"] != "not_started":
+            return
+        MODEL_STATUS["state"] = "loading"
+    threading.Thread(target=load_model, name="model-loader", daemon=True).start()
+
+
+def _require_model():
+    # 503 tant que le chargement est en cours, 500 s'il a échoué
+    if bundle is not None:
+        return
+    if MODEL_STATUS["state"] == "failed":
+        raise HTTPException(
+            status_code=500, 
+            detail="Le modèle n'est pas disponible sur le serveur."
+        )
+    start_model_loading()
+    raise HTTPException(
+        status_code=503,
+        detail="Modèle en cours de chargement, réessayez dans quelques secondes."
+    )
+
+
+# ============================================================
+# 🔁 RECHARGEMENT À CHAUD (SWAP ATOMIQUE)
+# ============================================================
+
+
+RELOAD_STATUS = {
+    "state": "idle",
+    "error": None,
+    "path": None,
+    "signature": None,
+    "duration_s": None,
+    "reloads": 0
+}
+_reload_lock = threading.Lock()
+
+
+def reload_model(path: Optional[str] = None) -> bool:
+    """
+    Charge et valide un nouveau pipeline hors du chemin des requêtes,
+    puis publie le nouveau bundle. En cas d'échec, l'ancien modèle
+    reste actif. Renvoie False si un rechargement est déjà en cours.
+    """
+    global bundle
+
+    if not _reload_lock.acquire(blocking=False):
+        return False
+    try:
+        path = path or (bundle.path if bundle is not None else MODEL_PATH)
+        RELOAD_STATUS.update(state="reloading", error=None, path=path)
+        t0 = time.perf_counter()
+
+        # Artefact enregistré : servi avec le seuil de sa version (sinon
+        # /predict annoncerait la nouvelle version avec l'ancien seuil)
+        new_bundle = _load_bundle(path, registry_threshold=True)
+        # Swap atomique : les requêtes en cours terminent sur l'ancien bundle
+        bundle = new_bundle
+
+        MODEL_STATUS.update(state="ready", error=None, warmup_latency_ms=new_bundle.warmup_latency_ms)
+        RELOAD_STATUS.update(
+            state="succeeded",
+            signature=new_bundle.signature,
+            duration_s=time.perf_counter() - t0,
+            reloads=RELOAD_STATUS["reloads"] + 1
+        )
+        print(f"🔁 Modèle rechargé : {os.path.basename(path)} ({new_bundle.signature[:12]})")
+        MODEL_LOADS.inc(result="success")
+    except Exception as e:
+        MODEL_LOADS.inc(result="failure")
+        RELOAD_STATUS.update(state="failed", error=str(e))
+        print(f"⚠️ Rechargement refusé, l'ancien modèle reste actif : {str(e)}")
+    finally:
+        _reload_lock.release()
+    return True
+
+
+def _watch_model_file():
+    """Recharge le modèle quand le contenu de son artefact change."""
+    refused_stamp = None
+    while True:
+        time.sleep(MODEL_WATCH_INTERVAL)
+        b = bundle
+        if b is None:
+            continue
+        try:
+            stamp = _file_stamp(b.path)
+            if stamp in (b.stamp, refused_stamp) or file_sha256(b.path) == b.signature:
+                continue
+        except OSError:
+            continue
+        reload_model(b.path)
+        if RELOAD_STATUS["state"] == "failed":
+            # Fichier invalide (ou en cours d'écriture) : on attend la prochaine modification
+            refused_stamp = stamp
+
+
+# ============================================================
+# 🗂️ REGISTRE DES VERSIONS (/predict?model=...)
+# ============================================================
+
+
+def _get_registry() -> ModelRegistry:
+    """Manifeste courant, relu seulement si le fichier a changé."""
+    global _registry
+    try:
+        st = os.stat(MODEL_REGISTRY_PATH)
+        stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stamp = None
+    if stamp != _registry.stamp:
+        _registry = ModelRegistry.load(MODEL_REGISTRY_PATH)
+    return _registry
+
+
+class ModelPool:
+    """
+    Versions du registre chargées à la demande, au plus `size`
+    résidentes : au-delà, la moins récemment utilisée est libérée (la
+    mémoire reste bornée à size + 1 modèles, défaut compris). Un verrou
+    par version : deux requêtes simultanées ne la chargent qu'une fois.
+    """
+
+    def __init__(self, size, loader):
+        self.size = size
+        self.loader = loader
+        self._bundles = OrderedDict()
+        self._loading = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def peek(self, version):
+        """Bundle résident (None sinon), sans jamais charger."""
+        with self._lock:
+            b = self._bundles.get(version)
+            if b is not None:
+                self._bundles.move_to_end(version)
+                self.hits += 1
+            return b
+
+    def get(self, version):
+        """Bundle de `version`, chargé si besoin (bloquant : hors boucle asyncio)."""
+        b = self.peek(version)
+        if b is not None:
+            return b
+        with self._lock:
+            lock = self._loading.setdefault(version, threading.Lock())
+        with lock:
+            b = self.peek(version)
+            if b is not None:
+                return b
+            b = self.loader(version)
+            with self._lock:
+                self._bundles[version] = b
+                self.loads += 1
+                while len(self._bundles) > self.size:
+                    self._bundles.popitem(last=False)
+                    self.evictions += 1
+        return b
+
+    def stats(self):
+        with self._lock:
+            resident = list(self._bundles)
+        return {"size": self.size, "resident": resident, "hits": self.hits,
+                "loads": self.loads, "evictions": self.evictions}
+
+
+def _load_version(version: str) -> ModelBundle:
+    registry = _get_registry()
+    entry = registry.get(version)
+    if sorted(entry["features"]) != sorted(FEATURE_NAMES):
+        raise HTTPException(
+            status_code=422,
+            detail=f"La version {version} attend {len(entry['features'])} features, hors du contrat de l'API."
+        )
+    try:
+        path = registry.verify(version)
+    except ArtifactMismatch as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    try:
+        b = _load_bundle(path, threshold=entry["threshold"], version=version)
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Version {version} inutilisable : {str(e)}")
+    print(f"🗂️ Version chargée : {version} ({b.signature[:12]})")
+    return b
+
+
+model_pool = ModelPool(MODEL_POOL_SIZE, _load_version)
+
+
+def _model_bundle(model: Optional[str], load: bool = True) -> Optional[ModelBundle]:
+    """
+    Bundle servant une requête : le modèle par défaut sans `model`, ou
+    si la version demandée est ce modèle (même artefact, même seuil) ;
+    sinon la version résidente, chargée si `load` (None sinon).
+    """
+    if not model:
+        _require_model()
+        return bundle
+    entry = _get_registry().versions.get(model)
+    if entry is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Version inconnue : {model} (versions : {sorted(_get_registry().versions)})"
+        )
+    b = bundle
+    if b is not None and b.signature == entry["sha256"] and b.threshold == entry["threshold"]:
+        return b
+    return model_pool.get(model) if load else model_pool.peek(model)
+
+
+async def _model_bundle_async(model: Optional[str]) -> ModelBundle:
+    # Chargement éventuel dans le threadpool : la boucle continue de servir
+    return _model_bundle(model, load=False) or await run_in_threadpool(_model_bundle, model)
+
+
+# ============================================================
+# 🧺 MICRO-BATCHING ASYNCIO
+# ============================================================
+
+
+# Bornes des histogrammes exposés dans /stats
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+QUEUE_DELAY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100)
+
+
+def _bucket(value, buckets):
+    for b in buckets:
+        if value <= b:
+            return str(b)
+    return "+Inf"
+
+
+class MicroBatcher:
+    """
+    Regroupe les requêtes /predict concurrentes : une ligne est mise en
+    attente, puis le lot part dès qu'il atteint `max_size` lignes ou que
+    `max_wait_ms` est écoulé depuis l'arrivée de la première.
+    Un seul lot est scoré à la fois, dans le threadpool, en un appel
+    vectorisé par bundle : chaque ligne garde le modèle qui servait sa
+    requête (rechargement à chaud, version routée) et récupère sa
+    probabilité via son future.
+    """
+
+    def __init__(self, score_fn, max_size=64, max_wait_ms=2.0):
+        self.score_fn = score_fn
+        self.max_size = max_size
+        self.max_wait = max_wait_ms / 1000
+        self._loop = None
+        self._task = None
+        self._pending = []
+        self._full = None
+
+        # Métriques
+        self.n_batches = 0
+        self.n_rows = 0
+        self.batch_sizes = {_bucket(b, BATCH_SIZE_BUCKETS): 0 for b in BATCH_SIZE_BUCKETS}
+        self.batch_sizes["+Inf"] = 0
+        self.queue_delays = {_bucket(b, QUEUE_DELAY_BUCKETS_MS): 0 for b in QUEUE_DELAY_BUCKETS_MS}
+        self.queue_delays["+Inf"] = 0
+        self.queue_delay_sum_ms = 0.0
+        self.queue_delay_max_ms = 0.0
+
+    async def submit(self, x: np.ndarray, b: Optional[ModelBundle] = None) -> float:
+        """Met une ligne (1, 20) en attente et renvoie sa probabilité selon `b` (bundle courant par défaut)."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Nouvelle boucle (ex. TestClient) : on repart d'un état vierge
+            self._loop, self._task, self._pending = loop, None, []
+            self._full = asyncio.Event()
+
+        future = loop.create_future()
+        self._pending.append((x, b or bundle, future, time.perf_counter()))
+        if len(self._pending) >= self.max_size:
+            self._full.set()
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._drain())
+        return await future
+
+    async def _drain(self):
+        # La tâche vit tant qu'il reste des lignes en attente
+        while self._pending:
+            if len(self._pending) < self.max_size:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_wait)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = self._pending[:self.max_size]
+            del self._pending[:self.max_size]
+            if len(self._pending) < self.max_size:
+                self._full.clear()
+
+            self._record(batch)
+            groups = {}
+            for x, b, f, _ in batch:
+                groups.setdefault(id(b), (b, [], []))
+                groups[id(b)][1].append(x)
+                groups[id(b)][2].append(f)
+            for b, rows, futures in groups.values():
+                try:
+                    probas = await run_in_threadpool(self.score_fn, np.vstack(rows), b)
+                except Exception as e:
+                    for f in futures:
+                        if not f.done():
+                            f.set_exception(e)
+                else:
+                    for f, proba in zip(futures, probas):
+                        if not f.done():
+                            f.set_result(float(proba))
+
+    def _record(self, batch):
+        now = time.perf_counter()
+        self.n_batches += 1
+        self.n_rows += len(batch)
+        self.batch_sizes[_bucket(len(batch), BATCH_SIZE_BUCKETS)] += 1
+        for _, _, _, t0 in batch:
+            delay_ms = (now - t0) * 1000
+            self.queue_delays[_bucket(delay_ms, QUEUE_DELAY_BUCKETS_MS)] += 1
+            self.queue_delay_sum_ms += delay_ms
+            self.queue_delay_max_ms = max(self.queue_delay_max_ms, delay_ms)
+
+    def stats(self) -> dict:
+        return {
+            "max_size": self.max_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "n_batches": self.n_batches,
+            "n_rows": self.n_rows,
+            "mean_batch_size": self.n_rows / self.n_batches if self.n_batches else 0.0,
+            "batch_size_histogram": self.batch_sizes,
+            "queue_delay_ms_histogram": self.queue_delays,
+            "queue_delay_ms_mean": self.queue_delay_sum_ms / self.n_rows if self.n_rows else 0.0,
+            "queue_delay_ms_max": self.queue_delay_max_ms
+        }
+
+
+batcher = None
+if MICRO_BATCH:
+    batcher = MicroBatcher(_predict_matrix, MICRO_BATCH_MAX_SIZE, MICRO_BATCH_MAX_WAIT_MS)
+    print(f"🧺 Micro-batching activé ({MICRO_BATCH_MAX_SIZE} lignes / {MICRO_BATCH_MAX_WAIT_MS} ms)")
+
+
+# ============================================================
+# 🗃️ CACHE DES PRÉDICTIONS (LRU + TTL)
+# ============================================================
+
+
+class PredictionCache:
+    """
+    Cache LRU/TTL des probabilités, indexé par un hash stable des
+    20 features (dans l'ordre de FEATURE_NAMES, en float64).
+
+    Le cache est vidé dès que la « génération » change, c'est-à-dire
+    l'empreinte du modèle chargé ou le seuil métier.
+    """
+
+    def __init__(self, maxsize, ttl, round_decimals=None, generation=lambda: None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.round_decimals = None if round_decimals is None else int(round_decimals)
+        self.generation = generation
+        self._data = OrderedDict()
+        self._gen = generation()
+        self._lock = threading.Lock()
+
+        # Compteurs
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def key(self, x: np.ndarray) -> bytes:
+        """Hash d'une ligne de features canonisée."""
+        x = np.asarray(x, dtype=np.float64).ravel()
+        if self.round_decimals is not None:
+            x = np.round(x, self.round_decimals)
+        # + 0.0 : -0.0 et 0.0 donnent la même clé
+        return hashlib.blake2b((x + 0.0).tobytes(), digest_size=16).digest()
+
+    def _check_generation(self):
+        gen = self.generation()
+        if gen != self._gen:
+            self._data.clear()
+            self._gen = gen
+            self.invalidations += 1
+
+    def get(self, key):
+        with self._lock:
+            self._check_generation()
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            value, expires = item
+            if time.monotonic() >= expires:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._check_generation()
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_s": self.ttl,
+            "round_decimals": self.round_decimals,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations
+        }
+
+
+def _cache_generation():
+    b = bundle
+    return (b.signature, b.threshold) if b is not None else (None, SEUIL_METIER)
+
+
+prediction_cache = None
+if PREDICTION_CACHE_SIZE > 0:
+    prediction_cache = PredictionCache(
+        PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL,
+        PREDICTION_CACHE_ROUND, _cache_generation
+    )
+
+# Explications : mêmes clés et même génération que les prédictions
+explanation_cache = None
+if EXPLAIN_CACHE_SIZE > 0:
+    explanation_cache = PredictionCache(
+        EXPLAIN_CACHE_SIZE, PREDICTION_CACHE_TTL,
+        PREDICTION_CACHE_ROUND, _cache_generation
+    )
+
+
+# ============================================================
+# 🧬 MONITORING DU DRIFT EN LIGNE
+# ============================================================
+
+
+def _build_drift_monitor():
+    reference = None
+    if os.path.exists(DRIFT_REFERENCE_PATH):
+        try:
+            reference = DriftProfile.load(DRIFT_REFERENCE_PATH)
+        except Exception as e:
+            print(f"⚠️ Référence de drift illisible, référence prise sur le trafic : {str(e)}")
+    return OnlineDriftMonitor(
+        FEATURE_NAMES, reference, reference_rows=DRIFT_REFERENCE_ROWS,
+        window_rows=DRIFT_WINDOW_ROWS, queue_size=DRIFT_QUEUE_SIZE
+    )
+
+
+drift_monitor = _build_drift_monitor() if DRIFT_MONITOR else None
+
+
+def _monitor(X: np.ndarray, probas):
+    # File non bloquante : aucun calcul d'histogramme sur le chemin de la requête
+    if drift_monitor is not None:
+        drift_monitor.submit(X, np.atleast_1d(probas))
 
 
 # ============================================================
-# 🔐 SCHÉMA OFFICIEL — CONTRAT API
+# 🧾 JOURNAL D'AUDIT DES DÉCISIONS
 # ============================================================
 
 
-class InputFeatures(BaseModel):
-    AMT_ANNUITY: float
-    AMT_CREDIT: float
-    AMT_GOODS_PRICE: float
-    AMT_INCOME_TOTAL: float
-    AMT_REQ_CREDIT_BUREAU_QRT: float
-    AMT_REQ_CREDIT_BUREAU_YEAR: float
-    CODE_GENDER_F: int
-    DAYS_BIRTH: float
-    DAYS_EMPLOYED: float
-    DAYS_ID_PUBLISH: float
-    DAYS_LAST_PHONE_CHANGE: float
-    DAYS_REGISTRATION: float
-    EXT_SOURCE_1: float
-    EXT_SOURCE_2: float
-    EXT_SOURCE_3: float
-    HOUR_APPR_PROCESS_START: int
-    NAME_CONTRACT_TYPE: int
-    OWN_CAR_AGE: float
-    REGION_POPULATION_RELATIVE: float
-    TOTALAREA_MODE: float
+audit_log = AuditLog(
+    AUDIT_LOG_DIR, FEATURE_NAMES, backpressure=AUDIT_BACKPRESSURE, queue_size=AUDIT_QUEUE_SIZE,
+    block_timeout=AUDIT_BLOCK_TIMEOUT, rotate_bytes=int(AUDIT_ROTATE_MB * 2**20)
+) if AUDIT_LOG_DIR else None
+
+
+def _audit(X: np.ndarray, probas, b, threshold, endpoint):
+    # Simple dépôt en file : sérialisation, compression et écriture
+    # sont faites par le thread du journal (appel bloquant si la file
+    # est pleine en mode "block" : endpoints synchrones seulement)
+    if audit_log is not None:
+        audit_log.submit(X, np.atleast_1d(probas), threshold, b.signature, endpoint)
+
+
+async def _audit_async(X: np.ndarray, probas, b, threshold, endpoint):
+    # File pleine en mode "block" : l'attente a lieu dans le threadpool,
+    # la boucle continue de servir les autres requêtes (et les sondes)
+    if audit_log is not None:
+        args = (X, np.atleast_1d(probas), threshold, b.signature, endpoint)
+        if not audit_log.submit(*args, wait=False):
+            await run_in_threadpool(audit_log.submit, *args)
 
 
 # ============================================================
@@ -85,42 +1016,739 @@ def home():
     return {
         "message": "API opérationnelle",
         "nb_features": 20,
-        "seuil_metier": SEUIL_METIER,
-        "model_loaded": model is not None
+        "seuil_metier": bundle.threshold if bundle is not None else SEUIL_METIER,
+        "model_loaded": bundle is not None,
+        "model_status": MODEL_STATUS["state"],
+        "scorer": "fast" if bundle is not None and bundle.scorer is not None else "pipeline"
     }
 
 
+# ============================================================
+# ❤️ SONDES LIVENESS / READINESS
+# ============================================================
+
+
+@app.get("/health/live")
+def health_live():
+    # Le processus répond : vivant, même si le modèle charge encore
+    return {"status": "alive", "model_status": MODEL_STATUS["state"]}
+
+
+@app.get("/health/ready")
+def health_ready():
+    # Prêt uniquement après le warm-up (latence de première prédiction connue)
+    if MODEL_STATUS["state"] != "ready":
+        start_model_loading()
+        return JSONResponse(status_code=503, content={"status": "not_ready", **MODEL_STATUS})
+    return {"status": "ready", **MODEL_STATUS}
+
+
 # ============================================================
 # 🔮 ENDPOINT DE PRÉDICTION
 # ============================================================
 
 
 @app.post("/predict")
-def predict(features: InputFeatures):
+@_instrumented
+async def predict(features: InputFeatures, model: Optional[str] = None):
 
 
-    if model is None:
-        raise HTTPException(
-            status_code=500, 
-            detail="Le modèle n'est pas disponible sur le serveur."
-        )
+    # Référence figée : un rechargement concurrent n'affecte pas cette requête
+    b = await _model_bundle_async(model)
 
 
     try:
-        # Conversion des données reçues en DataFrame pour le pipeline
-        X = pd.DataFrame([features.dict()])
+        # Conversion des données reçues en matrice ordonnée pour le pipeline
+        with _stage("build"):
+            X = _features_matrix([features])
         
-        # Prédiction de probabilité
-        proba = model.predict_proba(X)[0, 1]
-        decision = int(proba >= SEUIL_METIER)
+        # Payload déjà scoré : réponse directe depuis le cache (modèle par défaut)
+        key = proba = None
+        if prediction_cache is not None and b is bundle:
+            key = prediction_cache.key(X[0])
+            proba = prediction_cache.get(key)
+
+        # Prédiction de probabilité (regroupée avec d'autres requêtes si micro-batching)
+        if proba is None:
+            with _stage("predict"):
+                if batcher is not None:
+                    proba = await batcher.submit(X, b)
+                else:
+                    proba = (await run_in_threadpool(_profiled_call, _predict_matrix, X, b))[0]
+            # Pas de mise en cache d'un résultat issu d'un modèle remplacé entre-temps
+            if key is not None and b is bundle:
+                prediction_cache.put(key, float(proba))
+        decision = int(proba >= b.threshold)
+        DECISIONS.inc(decision=str(decision))
+        # Drift : trafic du modèle par défaut seulement
+        if not model:
+            _monitor(X, proba)
+        await _audit_async(X, proba, b, b.threshold, "/predict")
 
 
         return {
             "probability": float(proba),
             "decision": decision,   # 1 = refus, 0 = accord
-            "threshold": SEUIL_METIER
+            "threshold": b.threshold,
+            "model_version": b.version
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur lors de la prédiction : {str(e)}")
 
 
+# ============================================================
+# 📚 ENDPOINT DE PRÉDICTION PAR LOT
+# ============================================================
+
+
+def _validation_errors(e: ValidationError) -> list:
+    # Format compact et sérialisable des erreurs pydantic
+    return [
+        {"loc": list(err["loc"]), "msg": err["msg"], "type": err["type"]}
+        for err in e.errors()
+    ]
+
+
+def _validate_rows(rows: List[Any]):
+    """
+    Validation ligne par ligne d'un lot : renvoie (results, valid_rows,
+    valid_idx), les lignes invalides ayant déjà leur champ "error".
+    """
+    results: List[dict] = [{} for _ in rows]
+    valid_rows, valid_idx = [], []
+    for i, row in enumerate(rows):
+        try:
+            if not isinstance(row, dict):
+                raise TypeError("chaque élément doit être un objet JSON")
+            valid_rows.append(InputFeatures(**row))
+            valid_idx.append(i)
+        except ValidationError as e:
+            results[i] = {"error": _validation_errors(e)}
+        except TypeError as e:
+            results[i] = {"error": [{"loc": [], "msg": str(e), "type": "type_error"}]}
+    return results, valid_rows, valid_idx
+
+
+@app.post("/predict/batch")
+@_instrumented
+def predict_batch(rows: List[Any], model: Optional[str] = None):
+    """
+    Score une liste de clients en un seul appel vectorisé.
+    Les lignes invalides sont signalées individuellement
+    (champ "error") sans faire échouer le reste du lot.
+    """
+
+
+    b = _model_bundle(model)
+
+
+    if len(rows) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Lot trop volumineux : {len(rows)} lignes (max {MAX_BATCH_SIZE})."
+        )
+
+
+    with _stage("validation"):
+        results, valid_rows, valid_idx = _validate_rows(rows)
+    if len(valid_rows) < len(rows):
+        INVALID_ROWS.inc(len(rows) - len(valid_rows), endpoint="/predict/batch")
+
+
+    try:
+        if valid_rows:
+            with _stage("build"):
+                X = _features_matrix(valid_rows)
+            probas = np.full(len(valid_rows), np.nan)
+
+            # Seules les lignes absentes du cache sont scorées
+            keys = None
+            if prediction_cache is not None and b is bundle:
+                keys = [prediction_cache.key(x) for x in X]
+                for j, key in enumerate(keys):
+                    cached = prediction_cache.get(key)
+                    if cached is not None:
+                        probas[j] = cached
+            todo = np.flatnonzero(np.isnan(probas))
+            if todo.size:
+                with _stage("predict"):
+                    probas[todo] = _predict_matrix(X[todo], b)
+                if keys is not None and b is bundle:
+                    for j in todo:
+                        prediction_cache.put(keys[j], float(probas[j]))
+
+            for i, proba in zip(valid_idx, probas):
+                results[i] = {
+                    "probability": float(proba),
+                    "decision": int(proba >= b.threshold)
+                }
+            _record_decisions(probas, b.threshold)
+            if not model:
+                _monitor(X, probas)
+            _audit(X, probas, b, b.threshold, "/predict/batch")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur lors de la prédiction : {str(e)}")
+
+
+    return {
+        "threshold": b.threshold,
+        "model_version": b.version,
+        "n_rows": len(rows),
+        "n_errors": len(rows) - len(valid_rows),
+        "results": results
+    }
+
+
+# ============================================================
+# 🌊 SCORING EN FLUX DE FICHIERS (CSV / PARQUET)
+# ============================================================
+
+
+class _ClosingStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse qui appelle `close()` à la fin de l'envoi, y compris
+    si le client se déconnecte en cours de route (les tâches de fond de
+    Starlette ne sont alors pas exécutées).
+    """
+
+    def __init__(self, content, close, **kwargs):
+        super().__init__(content, **kwargs)
+        self._close = close
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self._close()
+
+
+def _iter_file_chunks(f, filename: str, chunk_rows: int):
+    """
+    Lit un fichier app_train.csv-like par blocs de `chunk_rows` lignes,
+    en ne gardant que SK_ID_CURR et les 20 features du contrat.
+    """
+    wanted = [ID_COL] + FEATURE_NAMES
+    name = (filename or "").lower()
+
+    if name.endswith((".parquet", ".pq")):
+        if not HAS_PYARROW:
+            raise HTTPException(status_code=415, detail="Parquet non supporté : pyarrow n'est pas installé.")
+        with pq.ParquetFile(f) as pf:
+            columns = [c for c in wanted if c in pf.schema_arrow.names]
+            for batch in pf.iter_batches(batch_size=chunk_rows, columns=columns):
+                yield batch.to_pandas()
+    else:
+        compression = "gzip" if name.endswith(".gz") else None
+        # Lecteur fermé dès la fin de la lecture ou la fermeture du générateur
+        # (sinon fermé par le ramasse-miettes, après le fichier d'upload)
+        with pd.read_csv(
+            f, usecols=lambda c: c in wanted, chunksize=chunk_rows, compression=compression
+        ) as reader:
+            yield from reader
+
+
+def _score_chunk(chunk: pd.DataFrame, b: ModelBundle, threshold: float, offset: int,
+                 on_scored=None) -> str:
+    # Valeurs non numériques -> NaN, imputées comme des valeurs manquantes
+    X = np.column_stack([
+        pd.to_numeric(chunk[col], errors="coerce").to_numpy(dtype=np.float64)
+        for col in FEATURE_NAMES
+    ])
+    proba = _predict_matrix(X, b)
+    if on_scored is not None:
+        on_scored(X, proba)
+    ids = chunk[ID_COL] if ID_COL in chunk else pd.RangeIndex(offset, offset + len(chunk))
+    out = pd.DataFrame({ID_COL: np.asarray(ids), "probability": proba, "decision": (proba >= threshold).astype(int)})
+    return out.to_csv(index=False, header=False)
+
+
+@app.post("/predict/stream")
+def predict_stream(file: UploadFile = File(...), model: Optional[str] = None):
+    """
+    Score un fichier CSV (éventuellement .gz) ou Parquet bloc par bloc
+    et renvoie, au fil de l'eau, les lignes SK_ID_CURR,probability,decision.
+    La mémoire reste bornée par STREAM_CHUNK_ROWS, quelle que soit
+    la taille du fichier (l'upload est lui-même mis en fichier temporaire).
+    """
+    b = _model_bundle(model)
+    threshold = b.threshold
+
+    chunks = _iter_file_chunks(file.file, file.filename, STREAM_CHUNK_ROWS)
+    # Lecture du premier bloc avant de répondre : une erreur de format
+    # donne encore un vrai code HTTP
+    try:
+        first = next(chunks, None)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Fichier illisible : {str(e)}")
+    if first is not None:
+        missing = [c for c in FEATURE_NAMES if c not in first.columns]
+        if missing:
+            chunks.close()
+            raise HTTPException(status_code=422, detail=f"Colonnes manquantes : {missing}")
+
+    def on_scored(X, proba):
+        _record_decisions(proba, threshold)
+        if not model:
+            _monitor(X, proba)
+        _audit(X, proba, b, threshold, "/predict/stream")
+
+    def generate():
+        yield f"{ID_COL},probability,decision\n"
+        if first is None:
+            return
+        offset = 0
+        for chunk in itertools.chain([first], chunks):
+            yield _score_chunk(chunk, b, threshold, offset, on_scored=on_scored)
+            offset += len(chunk)
+
+    gen = generate()
+
+    def close():
+        gen.close()
+        chunks.close()
+
+    headers = {"Content-Disposition": "attachment; filename=scores.csv"}
+    if b.version is not None:
+        headers["X-Model-Version"] = b.version
+    return _ClosingStreamingResponse(gen, close, media_type="text/csv", headers=headers)
+
+
+# ============================================================
+# 🔍 EXPLICATIONS LOCALES (TREESHAP NATIF)
+# ============================================================
+
+
+def _explain_matrix(X: np.ndarray, b: Optional[ModelBundle] = None):
+    """
+    Contributions TreeSHAP de LightGBM (pred_contrib=True) après
+    prétraitement, sans dépendance à shap ni jeu de fond : le booster
+    utilise les effectifs de ses propres nœuds.
+    Renvoie (probas (n,), contributions (n, 21)) ; contributions en
+    log-odds, colonnes dans l'ordre de FEATURE_NAMES puis valeur de
+    base. La somme d'une ligne est le score brut du modèle.
+    """
+    b = b or bundle
+    if b.scorer is not None and b.scorer.booster is not None:
+        Xp = b.scorer.transform(X)
+        contrib = b.scorer.booster.predict(Xp, pred_contrib=True)
+        cols = b.scorer.col_idx
+        probas = 1.0 / (1.0 + np.exp(-b.scorer.sigmoid * contrib.sum(axis=1)))
+    else:
+        preprocess, clf = b.pipe[:-1], b.pipe[-1]
+        if type(clf).__module__.split(".")[0] != "lightgbm":
+            raise TypeError(f"explication non supportée pour {type(clf).__name__}")
+        Xp = preprocess.transform(pd.DataFrame(X, columns=FEATURE_NAMES))
+        contrib = clf.predict(Xp, pred_contrib=True)
+        # "num__EXT_SOURCE_2" -> "EXT_SOURCE_2"
+        names = [str(n).split("__", 1)[-1] for n in preprocess.get_feature_names_out()]
+        cols = [FEATURE_NAMES.index(n) for n in names]
+        probas = clf.predict_proba(Xp)[:, 1]
+
+    # Features non utilisées par le prétraitement : contribution nulle
+    out = np.zeros((X.shape[0], len(FEATURE_NAMES) + 1))
+    out[:, cols] = contrib[:, :-1]
+    out[:, -1] = contrib[:, -1]
+    return probas, out
+
+
+def _explain_cached(X: np.ndarray, b: ModelBundle):
+    """
+    _explain_matrix avec cache : seules les lignes absentes de
+    explanation_cache sont expliquées, et leurs probabilités
+    alimentent aussi prediction_cache. Les caches ne servent que le
+    modèle par défaut.
+    """
+    probas = np.full(X.shape[0], np.nan)
+    contribs = np.empty((X.shape[0], len(FEATURE_NAMES) + 1))
+
+    keys = None
+    if explanation_cache is not None and b is bundle:
+        keys = [explanation_cache.key(x) for x in X]
+        for j, key in enumerate(keys):
+            cached = explanation_cache.get(key)
+            if cached is not None:
+                probas[j], contribs[j] = cached
+    todo = np.flatnonzero(np.isnan(probas))
+    if todo.size:
+        probas[todo], contribs[todo] = _explain_matrix(X[todo], b)
+        if b is bundle:
+            for j in todo:
+                if keys is not None:
+                    explanation_cache.put(keys[j], (float(probas[j]), contribs[j].copy()))
+                if prediction_cache is not None:
+                    prediction_cache.put(prediction_cache.key(X[j]), float(probas[j]))
+    return probas, contribs
+
+
+def _explanation(proba: float, contrib: np.ndarray, threshold: float) -> dict:
+    return {
+        "probability": float(proba),
+        "decision": int(proba >= threshold),
+        "base_value": float(contrib[-1]),
+        "contributions": dict(zip(FEATURE_NAMES, map(float, contrib[:-1])))
+    }
+
+
+@app.post("/explain")
+@_instrumented
+def explain(features: InputFeatures, model: Optional[str] = None):
+    """
+    Contribution de chaque feature au score du client (log-odds,
+    TreeSHAP natif) : base_value + somme des contributions = score brut,
+    probabilité = sigmoïde du score brut.
+    """
+    b = _model_bundle(model)
+
+    try:
+        with _stage("build"):
+            X = _features_matrix([features])
+        with _stage("predict"):
+            probas, contribs = _explain_cached(X, b)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur lors de l'explication : {str(e)}")
+
+    return {
+        "threshold": b.threshold,
+        "model_version": b.version,
+        "unit": "log-odds",
+        **_explanation(probas[0], contribs[0], b.threshold)
+    }
+
+
+@app.post("/explain/batch")
+@_instrumented
+def explain_batch(rows: List[Any], model: Optional[str] = None):
+    """Explications d'un lot, lignes invalides signalées comme pour /predict/batch."""
+    b = _model_bundle(model)
+
+    if len(rows) > EXPLAIN_MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Lot trop volumineux : {len(rows)} lignes (max {EXPLAIN_MAX_BATCH_SIZE})."
+        )
+
+    with _stage("validation"):
+        results, valid_rows, valid_idx = _validate_rows(rows)
+    if len(valid_rows) < len(rows):
+        INVALID_ROWS.inc(len(rows) - len(valid_rows), endpoint="/explain/batch")
+    try:
+        if valid_rows:
+            with _stage("build"):
+                X = _features_matrix(valid_rows)
+            with _stage("predict"):
+                probas, contribs = _explain_cached(X, b)
+            for i, proba, contrib in zip(valid_idx, probas, contribs):
+                results[i] = _explanation(proba, contrib, b.threshold)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur lors de l'explication : {str(e)}")
+
+    return {
+        "threshold": b.threshold,
+        "model_version": b.version,
+        "unit": "log-odds",
+        "n_rows": len(rows),
+        "n_errors": len(rows) - len(valid_rows),
+        "results": results
+    }
+
+
+# ============================================================
+# 🌍 EXPLICATIONS GLOBALES (RÉSUMÉ PRÉCALCULÉ)
+# ============================================================
+
+
+# Résumés chargés, par fichier : chemin -> (résumé, instant du dernier contrôle)
+_global_summaries = {}
+_global_summary_lock = threading.Lock()
+
+
+def _get_global_summary(b: ModelBundle) -> GlobalSummary:
+    """
+    Résumé global du modèle `b` (fichier <artefact>.explain.npz ;
+    GLOBAL_EXPLAIN_PATH pour le modèle par défaut), chargé une fois.
+    Le fichier n'est contrôlé (os.stat) qu'une fois par
+    GLOBAL_EXPLAIN_CHECK_S secondes, ou tout de suite si le modèle a
+    changé, et relu s'il a été modifié. 503 s'il n'a pas été construit,
+    409 s'il a été construit pour un autre artefact.
+    """
+    path = (GLOBAL_EXPLAIN_PATH if b is bundle else "") or summary_path(b.path)
+    cached = _global_summaries.get(path)
+    if (cached is None or cached[0].meta.get("model_signature") != b.signature
+            or time.monotonic() - cached[1] >= GLOBAL_EXPLAIN_CHECK_S):
+        with _global_summary_lock:
+            cached = _global_summaries.get(path)
+            try:
+                stamp = _file_stamp(path)
+            except OSError:
+                _global_summaries.pop(path, None)
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"Résumé global absent ({os.path.basename(path)}) : lancer python -m global_explain."
+                )
+            summary = cached[0] if cached is not None and cached[0].stamp == stamp else GlobalSummary.load(path)
+            cached = _global_summaries[path] = (summary, time.monotonic())
+    summary = cached[0]
+    if summary.meta.get("model_signature") != b.signature:
+        raise HTTPException(status_code=409, detail="Résumé global construit pour un autre modèle.")
+    return summary
+
+
+@app.get("/explain/global")
+def explain_global(model: Optional[str] = None):
+    """
+    Importances globales (|contribution| moyenne, gain, splits), triées.
+    `model` : version du registre (résumé construit par
+    python -m global_explain --model models/<version>.joblib).
+    """
+    summary = _get_global_summary(_model_bundle(model))
+    return {
+        "unit": "log-odds",
+        "base_value": summary.base_value,
+        "n_rows": summary.meta["n_rows"],
+        "features": summary.importance()
+    }
+
+
+@app.get("/explain/global/{feature}")
+def explain_global_feature(feature: str, levels: Optional[List[float]] = Query(None),
+                           model: Optional[str] = None):
+    """
+    Distribution des contributions d'une feature sur la population
+    d'entraînement : quantiles stockés (tous, ou les plus proches de
+    `levels`, ex. ?levels=0.05&levels=0.5&levels=0.95).
+    """
+    summary = _get_global_summary(_model_bundle(model))
+    if feature not in summary.index:
+        raise HTTPException(status_code=404, detail=f"Feature inconnue : {feature}")
+    if levels is not None and not all(0 <= q <= 1 for q in levels):
+        raise HTTPException(status_code=422, detail="Les niveaux de quantile doivent être dans [0, 1].")
+
+    qs, values = summary.feature(feature, levels)
+    i = summary.index[feature]
+    return {
+        "feature": feature,
+        "unit": "log-odds",
+        "rank": int(summary.rank[i]),
+        "mean_abs_shap": float(summary.mean_abs_shap[i]),
+        "mean_shap": float(summary.mean_shap[i]),
+        "levels": qs.tolist(),
+        "quantiles": values.astype(float).tolist()
+    }
+
+
+# ============================================================
+# 📈 STATISTIQUES DE SERVICE
+# ============================================================
+
+
+@app.get("/stats")
+def stats():
+    return {
+        "batcher": batcher.stats() if batcher is not None else None,
+        "cache": prediction_cache.stats() if prediction_cache is not None else None,
+        "explain_cache": explanation_cache.stats() if explanation_cache is not None else None,
+        "drift_monitor": drift_monitor.stats() if drift_monitor is not None else None,
+        "audit_log": audit_log.stats() if audit_log is not None else None,
+        "models": model_pool.stats()
+    }
+
+
+# ============================================================
+# 🗂️ ENDPOINT DU REGISTRE DES VERSIONS
+# ============================================================
+
+
+@app.get("/models")
+def models():
+    """Versions du registre (manifeste), version par défaut et versions résidentes."""
+    registry = _get_registry()
+    b = bundle
+    resident = set(model_pool.stats()["resident"])
+    return {
+        "default": b.version if b is not None else MODEL_VERSION or None,
+        "pool_size": MODEL_POOL_SIZE,
+        "versions": [
+            {
+                "version": version,
+                "artifact": entry["artifact"],
+                "sha256": entry["sha256"],
+                "n_features": len(entry["features"]),
+                "threshold": entry["threshold"],
+                "metrics": entry["metrics"],
+                "registered_at": entry.get("registered_at"),
+                "compatible": sorted(entry["features"]) == sorted(FEATURE_NAMES),
+                "resident": version in resident or (b is not None and b.version == version),
+            }
+            for version, entry in registry.versions.items()
+        ],
+    }
+
+
+# ============================================================
+# 🧬 ENDPOINT DE MONITORING DU DRIFT
+# ============================================================
+
+
+@app.get("/monitoring/drift")
+def monitoring_drift():
+    """
+    PSI / KS par feature du contrat API (et du score) entre la
+    référence et la fenêtre live, calculés sur les histogrammes.
+    """
+    if drift_monitor is None:
+        raise HTTPException(status_code=404, detail="Monitoring du drift désactivé (DRIFT_MONITOR=0).")
+    report = drift_monitor.report()
+    return {**drift_monitor.stats(), "report": to_json(report) if report is not None else None}
+
+
+# ============================================================
+# 🛠️ ADMINISTRATION — RECHARGEMENT DU MODÈLE
+# ============================================================
+
+
+def _check_admin(token: Optional[str]):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Administration désactivée (ADMIN_TOKEN non défini).")
+    if not token or not hmac.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Jeton d'administration invalide.")
+
+
+@app.post("/admin/reload", status_code=202)
+def admin_reload(file: Optional[str] = None, x_admin_token: Optional[str] = Header(None)):
+    """
+    Recharge le modèle courant (ou `file`, un artefact du dossier models/)
+    en arrière-plan ; le swap n'a lieu que si le canari est valide.
+    Avec plusieurs workers, seul le worker qui reçoit l'appel recharge :
+    préférer alors MODEL_WATCH_INTERVAL.
+    """
+    _check_admin(x_admin_token)
+
+    path = None
+    if file:
+        path = os.path.join(MODELS_DIR, os.path.basename(file))
+        if os.path.basename(file) != file or not os.path.isfile(path):
+            raise HTTPException(status_code=404, detail=f"Artefact introuvable dans models/ : {file}")
+
+    if _reload_lock.locked():
+        raise HTTPException(status_code=409, detail="Un rechargement est déjà en cours.")
+    threading.Thread(target=reload_model, args=(path,), name="model-reload", daemon=True).start()
+
+    return {"status": "reloading", "path": path or (bundle.path if bundle is not None else MODEL_PATH)}
+
+
+@app.get("/admin/reload")
+def admin_reload_status(x_admin_token: Optional[str] = Header(None)):
+    _check_admin(x_admin_token)
+    return RELOAD_STATUS
+
+
+# ============================================================
+# 🔥 ADMINISTRATION — PROFILAGE ÉCHANTILLONNÉ
+# ============================================================
+
+
+@app.post("/admin/profile")
+def admin_profile(
+    rate: float = Query(..., ge=0, le=1),
+    reset: bool = False,
+    x_admin_token: Optional[str] = Header(None),
+):
+    """
+    Active (rate > 0) ou coupe (rate = 0) le profilage d'une part des
+    requêtes de scoring ; `reset` efface les piles déjà relevées.
+    Propre au worker qui reçoit l'appel.
+    """
+    _check_admin(x_admin_token)
+    profiler.rate = rate
+    if reset:
+        profiler.reset()
+    return profiler.overhead()
+
+
+@app.get("/admin/profile")
+def admin_profile_dump(
+    format: str = Query("collapsed", pattern="^(collapsed|speedscope|stats)$"),
+    reset: bool = False,
+    x_admin_token: Optional[str] = Header(None),
+):
+    """
+    Piles relevées : `collapsed` (flamegraph.pl, speedscope), `speedscope`
+    (JSON) ou `stats` (surcoût seul). Le surcoût mesuré est aussi renvoyé
+    dans les en-têtes X-Profile-*.
+    """
+    _check_admin(x_admin_token)
+    overhead = profiler.overhead()
+    if format == "stats":
+        return overhead
+
+    headers = {
+        "X-Profile-Samples": str(overhead["samples"]),
+        "X-Profile-Requests": str(overhead["requests"]),
+        "X-Profile-Interval-Ms": str(overhead["interval_ms"]),
+        "X-Profile-Overhead-Ratio": f"{overhead['overhead_ratio']:.6f}",
+    }
+    if format == "speedscope":
+        response = JSONResponse(
+            profiler.speedscope(name=f"app_api (rate={profiler.rate})"),
+            headers={**headers, "Content-Disposition": 'attachment; filename="profile.speedscope.json"'},
+        )
+    else:
+        response = Response(
+            profiler.collapsed(), media_type="text/plain",
+            headers={**headers, "Content-Disposition": 'attachment; filename="profile.collapsed.txt"'},
+        )
+    if reset:
+        profiler.reset()
+    return response
+
+
+# ============================================================
+# 📏 ENDPOINT DES MÉTRIQUES
+# ============================================================
+
+
+def _cache_stat(cache, key):
+    return cache.stats()[key] if cache is not None else None
+
+
+registry.gauge("model_ready", "1 si un modèle est chargé et prêt", lambda: float(MODEL_STATUS["state"] == "ready"))
+registry.gauge("model_load_time_seconds", "Durée du chargement initial du modèle", lambda: MODEL_STATUS["load_time_s"])
+registry.gauge(
+    "model_warmup_latency_seconds", "Latence d'une prédiction après warm-up",
+    lambda: MODEL_STATUS["warmup_latency_ms"] / 1000 if MODEL_STATUS["warmup_latency_ms"] is not None else None
+)
+registry.gauge("model_reload_duration_seconds", "Durée du dernier rechargement", lambda: RELOAD_STATUS["duration_s"])
+registry.gauge(
+    "predict_threshold", "Seuil métier du modèle par défaut",
+    lambda: bundle.threshold if bundle is not None else SEUIL_METIER
+)
+registry.gauge(
+    "predict_decision_rate", "Part des décisions de refus depuis le démarrage",
+    lambda: (DECISIONS.value(decision="1") / total
+             if (total := DECISIONS.value(decision="1") + DECISIONS.value(decision="0")) else None)
+)
+registry.gauge("prediction_cache_hits", "Succès du cache des prédictions", lambda: _cache_stat(prediction_cache, "hits"))
+registry.gauge("prediction_cache_misses", "Échecs du cache des prédictions", lambda: _cache_stat(prediction_cache, "misses"))
+registry.gauge(
+    "profiler_overhead_ratio", "Part du temps d'échantillonnage passée à relever les piles",
+    lambda: profiler.overhead()["overhead_ratio"] if profiler.samples else None
+)
+registry.gauge(
+    "drift_monitor_dropped_rows", "Lignes perdues par le monitoring du drift (file pleine)",
+    lambda: drift_monitor.dropped if drift_monitor is not None else None
+)
+registry.gauge(
+    "audit_log_records", "Décisions écrites dans le journal d'audit",
+    lambda: audit_log.records if audit_log is not None else None
+)
+registry.gauge(
+    "audit_log_dropped_records", "Décisions non journalisées (file pleine ou erreur d'écriture)",
+    lambda: audit_log.dropped if audit_log is not None else None
+)
+
+
+@app.get("/metrics")
+def metrics_endpoint():
+    return Response(registry.render(), media_type=metrics.CONTENT_TYPE)
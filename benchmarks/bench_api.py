@@ -0,0 +1,279 @@
+"""
+Benchmark latence / débit de l'API de scoring.
+
+Trois scénarios, sur les 12 profils `sample_clients` + des lignes
+aléatoires dérivées de ces profils :
+  - single     : requêtes /predict séquentielles
+  - batch      : requêtes /predict/batch séquentielles (--batch-size lignes)
+  - concurrent : --concurrency clients /predict en parallèle
+
+Deux cibles :
+  - inprocess : app_api.app appelée directement (httpx ASGITransport)
+  - uvicorn   : serveur uvicorn local lancé en sous-processus
+
+Le cache des prédictions est désactivé sauf avec --with-cache.
+Chaque scénario rapporte p50/p95/p99 (ms) et req/s. Avec --baseline,
+le script sort en erreur (code 1) si p95 augmente ou req/s baisse de
+plus de --max-regression % par rapport à la référence enregistrée.
+La machine de mesure (nombre de CPU, plateforme) est enregistrée avec
+les résultats : une référence n'est comparable que sur une machine
+équivalente (benchmarks/baseline.json : 1 CPU).
+
+Usage :
+    python benchmarks/bench_api.py --target inprocess --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_api.py --target both --baseline benchmarks/baseline.json --max-regression 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from sample_clients import sample_clients  # noqa: E402
+
+
+# ============================================================
+# 🎲 JEU DE PAYLOADS
+# ============================================================
+
+
+def build_payloads(n_random, seed=0):
+    """12 profils de démonstration + `n_random` variantes bruitées (±30 %)."""
+    rng = np.random.default_rng(seed)
+    profiles = list(sample_clients.values())
+    payloads = [dict(p) for p in profiles]
+    for _ in range(n_random):
+        base = profiles[rng.integers(len(profiles))]
+        row = {}
+        for k, v in base.items():
+            if isinstance(v, int) and k in ("CODE_GENDER_F", "NAME_CONTRACT_TYPE", "HOUR_APPR_PROCESS_START"):
+                row[k] = v
+            else:
+                row[k] = float(v * rng.uniform(0.7, 1.3))
+        payloads.append(row)
+    return payloads
+
+
+# ============================================================
+# ⏱️ SCÉNARIOS
+# ============================================================
+
+
+def _summary(latencies, elapsed, rows_per_request=1):
+    lat_ms = np.asarray(latencies) * 1000
+    return {
+        "requests": int(lat_ms.size),
+        "p50_ms": float(np.percentile(lat_ms, 50)),
+        "p95_ms": float(np.percentile(lat_ms, 95)),
+        "p99_ms": float(np.percentile(lat_ms, 99)),
+        "rps": lat_ms.size / elapsed,
+        "rows_per_s": lat_ms.size * rows_per_request / elapsed,
+    }
+
+
+async def _post(client, url, json_body):
+    t0 = time.perf_counter()
+    r = await client.post(url, json=json_body)
+    r.raise_for_status()
+    return time.perf_counter() - t0
+
+
+async def run_single(client, payloads, n):
+    latencies = []
+    t0 = time.perf_counter()
+    for i in range(n):
+        latencies.append(await _post(client, "/predict", payloads[i % len(payloads)]))
+    return _summary(latencies, time.perf_counter() - t0)
+
+
+async def run_batch(client, payloads, n, batch_size):
+    latencies = []
+    t0 = time.perf_counter()
+    for i in range(n):
+        start = (i * batch_size) % len(payloads)
+        rows = (payloads[start:] + payloads)[:batch_size]
+        latencies.append(await _post(client, "/predict/batch", rows))
+    return _summary(latencies, time.perf_counter() - t0, batch_size)
+
+
+async def run_concurrent(client, payloads, n, concurrency):
+    latencies = []
+
+    async def worker(w):
+        for i in range(w, n, concurrency):
+            latencies.append(await _post(client, "/predict", payloads[i % len(payloads)]))
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in range(concurrency)))
+    return _summary(latencies, time.perf_counter() - t0)
+
+
+async def run_scenarios(client, args, payloads):
+    # Échauffement (hors mesure)
+    for p in payloads[:20]:
+        await client.post("/predict", json=p)
+
+    return {
+        "single": await run_single(client, payloads, args.requests),
+        "batch": await run_batch(client, payloads, max(1, args.requests // 10), args.batch_size),
+        "concurrent": await run_concurrent(client, payloads, args.requests, args.concurrency),
+    }
+
+
+# ============================================================
+# 🎯 CIBLES
+# ============================================================
+
+
+async def bench_inprocess(args, payloads):
+    import app_api
+
+    # ASGITransport ne déclenche pas le lifespan : chargement synchrone
+    app_api.load_model()
+    if not args.with_cache:
+        app_api.prediction_cache = None
+
+    transport = httpx.ASGITransport(app=app_api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        return await run_scenarios(client, args, payloads)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def bench_uvicorn(args, payloads):
+    port = _free_port()
+    env = dict(os.environ)
+    if not args.with_cache:
+        env["PREDICTION_CACHE_SIZE"] = "0"
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app_api:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+            deadline = time.time() + 60
+            while True:
+                try:
+                    if (await client.get("/health/ready")).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                if time.time() > deadline:
+                    raise RuntimeError("uvicorn non prêt après 60 s")
+                await asyncio.sleep(0.2)
+            return await run_scenarios(client, args, payloads)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+# ============================================================
+# 📏 COMPARAISON À LA RÉFÉRENCE
+# ============================================================
+
+
+def compare_to_baseline(results, baseline, max_regression_pct):
+    """
+    Liste des régressions : p95 plus lent ou req/s plus bas que la
+    référence de plus de `max_regression_pct` %.
+    """
+    tol = max_regression_pct / 100
+    regressions = []
+    for target, scenarios in results.items():
+        for scenario, cur in scenarios.items():
+            ref = baseline.get(target, {}).get(scenario)
+            if ref is None:
+                continue
+            if cur["p95_ms"] > ref["p95_ms"] * (1 + tol):
+                regressions.append(
+                    f"{target}/{scenario} : p95 {cur['p95_ms']:.2f} ms > {ref['p95_ms']:.2f} ms (+{max_regression_pct}%)"
+                )
+            if cur["rps"] < ref["rps"] * (1 - tol):
+                regressions.append(
+                    f"{target}/{scenario} : {cur['rps']:.0f} req/s < {ref['rps']:.0f} req/s (-{max_regression_pct}%)"
+                )
+    return regressions
+
+
+def machine_info():
+    return {
+        "cpu_count": os.cpu_count(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+    }
+
+
+def print_table(results):
+    print("| cible | scénario | requêtes | p50 (ms) | p95 (ms) | p99 (ms) | req/s | lignes/s |")
+    print("|---|---|---|---|---|---|---|---|")
+    for target, scenarios in results.items():
+        for scenario, r in scenarios.items():
+            print(
+                f"| {target} | {scenario} | {r['requests']} | {r['p50_ms']:.2f} | {r['p95_ms']:.2f} "
+                f"| {r['p99_ms']:.2f} | {r['rps']:.0f} | {r['rows_per_s']:.0f} |"
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark latence / débit de l'API de scoring.")
+    parser.add_argument("--target", choices=["inprocess", "uvicorn", "both"], default="inprocess")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--random-rows", type=int, default=500, help="lignes aléatoires en plus des 12 profils")
+    parser.add_argument("--with-cache", action="store_true",
+                        help="garde le cache des prédictions (désactivé par défaut : les scénarios réutilisent les mêmes payloads)")
+    parser.add_argument("--output", help="écrit les résultats en JSON")
+    parser.add_argument("--baseline", help="référence JSON à comparer")
+    parser.add_argument("--save-baseline", help="enregistre les résultats comme référence")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="en %%")
+    args = parser.parse_args(argv)
+
+    payloads = build_payloads(args.random_rows)
+    targets = ["inprocess", "uvicorn"] if args.target == "both" else [args.target]
+    runners = {"inprocess": bench_inprocess, "uvicorn": bench_uvicorn}
+
+    results = {t: asyncio.run(runners[t](args, payloads)) for t in targets}
+    print_table(results)
+
+    machine = machine_info()
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w") as f:
+            json.dump(dict(results, machine=machine), f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        ref_cpus = baseline.get("machine", {}).get("cpu_count")
+        if ref_cpus != machine["cpu_count"]:
+            print(f"\n⚠️ Référence mesurée sur {ref_cpus or '?'} CPU, machine actuelle : "
+                  f"{machine['cpu_count']} CPU — comparaison indicative seulement")
+        regressions = compare_to_baseline(results, baseline, args.max_regression)
+        if regressions:
+            print("\n❌ Régressions détectées :")
+            for r in regressions:
+                print("  -", r)
+            return 1
+        print(f"\n✅ Pas de régression > {args.max_regression}% par rapport à {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
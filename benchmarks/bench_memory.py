@@ -0,0 +1,150 @@
+"""
+Profil mémoire de l'entraînement : chemin historique float64 contre
+chemin float32 de bout en bout.
+
+  - float64 : pd.read_csv -> ColumnTransformer(SimpleImputer -> StandardScaler)
+              -> LGBMClassifier.fit
+  - float32 : dataset_cache.load_dataset (Feather memory-mappé)
+              -> Float32Preprocessor (transform sur place)
+              -> lgb.Dataset direct -> lgb.train
+
+Chaque chemin tourne dans un processus neuf ; on relève le pic de RSS
+(VmHWM) après chaque étape. Sans `--data`, un jeu synthétique de la
+taille d'app_train (307 511 lignes × 120 colonnes, 20 % de manquants)
+est généré.
+
+Usage :
+    python benchmarks/bench_memory.py --data Data/app_train.csv
+    python benchmarks/bench_memory.py --rows 307511 --cols 120 --rounds 100
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+TARGET_COL = "TARGET"
+ID_COL = "SK_ID_CURR"
+
+
+def _peak_rss_mb():
+    """Pic de RSS du processus (Linux : VmHWM)."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def make_synthetic(path, rows, cols, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, cols))
+    X[rng.random(X.shape) < 0.2] = np.nan
+    df = pd.DataFrame(X, columns=[f"F{i:03d}" for i in range(cols)])
+    df.insert(0, ID_COL, np.arange(100000, 100000 + rows))
+    df[TARGET_COL] = (np.nan_to_num(X[:, 0]) + rng.normal(size=rows) > 1.8).astype(int)
+    df.to_csv(path, index=False)
+
+
+# ============================================================
+# 🧪 CHEMINS MESURÉS (exécutés dans un processus neuf)
+# ============================================================
+
+
+def run_float64(data, rounds):
+    from lightgbm import LGBMClassifier
+    from training import make_preprocess
+
+    steps, t0 = [], time.perf_counter()
+    df = pd.read_csv(data)
+    y = df[TARGET_COL].to_numpy()
+    X = df.drop(columns=[TARGET_COL, ID_COL])
+    del df
+    steps.append(("load", _peak_rss_mb(), time.perf_counter() - t0))
+
+    Xt = make_preprocess(X.columns).fit_transform(X)
+    steps.append(("preprocess", _peak_rss_mb(), time.perf_counter() - t0))
+
+    LGBMClassifier(n_estimators=rounds, n_jobs=1, verbose=-1).fit(Xt, y)
+    steps.append(("train", _peak_rss_mb(), time.perf_counter() - t0))
+    return steps
+
+
+def run_float32(data, rounds):
+    import lightgbm as lgb
+    from dataset_cache import load_dataset
+    from float32_preprocess import Float32Preprocessor, lgb_dataset
+
+    steps, t0 = [], time.perf_counter()
+    df = load_dataset(data, memory_map=True)
+    y = df[TARGET_COL].to_numpy()
+    X = df.drop(columns=[TARGET_COL, ID_COL])
+    del df
+    steps.append(("load", _peak_rss_mb(), time.perf_counter() - t0))
+
+    Xt = Float32Preprocessor(copy=False).fit(X).transform(X)
+    del X
+    steps.append(("preprocess", _peak_rss_mb(), time.perf_counter() - t0))
+
+    params = {"objective": "binary", "num_threads": 1, "verbose": -1}
+    lgb.train(params, lgb_dataset(Xt, y), num_boost_round=rounds)
+    steps.append(("train", _peak_rss_mb(), time.perf_counter() - t0))
+    return steps
+
+
+RUNNERS = {"float64": run_float64, "float32": run_float32}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--data", help="CSV avec TARGET (défaut : jeu synthétique)")
+    parser.add_argument("--rows", type=int, default=307_511)
+    parser.add_argument("--cols", type=int, default=120)
+    parser.add_argument("--rounds", type=int, default=100, help="rounds de boosting")
+    parser.add_argument("--run", choices=list(RUNNERS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        # Processus enfant : un seul chemin, résultat en JSON sur stdout
+        print(json.dumps(RUNNERS[args.run](args.data, args.rounds)))
+        return
+
+    tmp = None
+    data = args.data
+    if data is None:
+        tmp = tempfile.TemporaryDirectory()
+        data = os.path.join(tmp.name, "app_train_synthetic.csv")
+        make_synthetic(data, args.rows, args.cols)
+        # Cache Feather du jeu synthétique jetable lui aussi (hérité par les enfants)
+        os.environ["DATASET_CACHE_DIR"] = os.path.join(tmp.name, "cache")
+
+    # Conversion unique en cache Feather, hors mesure (faite une fois par jeu)
+    from dataset_cache import load_dataset
+    load_dataset(data, columns=[TARGET_COL])
+
+    print(f"Données : {data} ({os.path.getsize(data) / 1e6:.0f} Mo) | rounds : {args.rounds}\n")
+    print("| chemin | étape | pic RSS (Mo) | temps cumulé (s) |")
+    print("|---|---|---|---|")
+    for mode in RUNNERS:
+        out = subprocess.run(
+            [sys.executable, __file__, "--run", mode, "--data", data, "--rounds", str(args.rounds)],
+            cwd=ROOT, check=True, capture_output=True, text=True
+        ).stdout
+        for step, rss, elapsed in json.loads(out.strip().splitlines()[-1]):
+            print(f"| {mode} | {step} | {rss:.0f} | {elapsed:.1f} |", flush=True)
+
+    if tmp is not None:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
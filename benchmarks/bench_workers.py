@@ -0,0 +1,160 @@
+"""
+Benchmark débit / nombre de workers (gunicorn pre-fork, modèle top-20).
+
+Pour chaque nombre de workers, lance `gunicorn -c gunicorn.conf.py app_api:app`,
+envoie des requêtes /predict concurrentes pendant `--duration` secondes
+puis relève le débit, les latences et la mémoire (RSS / PSS) des workers.
+La PSS répartit les pages partagées entre processus : elle montre
+ce que coûte réellement chaque worker une fois le modèle partagé.
+
+Usage :
+    python benchmarks/bench_workers.py --workers 1 2 4 --duration 15
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+import numpy as np
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Profil "Client_1" du front Streamlit
+PAYLOAD = {
+    "AMT_ANNUITY": 280, "AMT_CREDIT": 7000, "AMT_GOODS_PRICE": 7000,
+    "AMT_INCOME_TOTAL": 2600 * 12, "AMT_REQ_CREDIT_BUREAU_QRT": 0,
+    "AMT_REQ_CREDIT_BUREAU_YEAR": 0, "CODE_GENDER_F": 1,
+    "DAYS_BIRTH": -38 * 365, "DAYS_EMPLOYED": -12 * 365,
+    "DAYS_ID_PUBLISH": -3000, "DAYS_LAST_PHONE_CHANGE": -800,
+    "DAYS_REGISTRATION": -7000, "EXT_SOURCE_1": 0.80, "EXT_SOURCE_2": 0.82,
+    "EXT_SOURCE_3": 0.78, "HOUR_APPR_PROCESS_START": 9, "NAME_CONTRACT_TYPE": 1,
+    "OWN_CAR_AGE": 8, "REGION_POPULATION_RELATIVE": 0.012, "TOTALAREA_MODE": 0.09
+}
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _children(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(p) for p in f.read().split()]
+    except OSError:
+        return []
+
+
+def _memory_kb(pid):
+    """(RSS, PSS) en kB depuis /proc (Linux uniquement)."""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            values = dict(
+                (line.split(":")[0], int(line.split()[1]))
+                for line in f if line.split(":")[0] in ("Rss", "Pss")
+            )
+        return values.get("Rss", 0), values.get("Pss", 0)
+    except OSError:
+        return 0, 0
+
+
+def _wait_ready(url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"serveur non disponible : {url}")
+
+
+def run_load(url, duration, concurrency):
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    stop = time.perf_counter() + duration
+
+    def client_loop():
+        local = []
+        with httpx.Client(timeout=10) as client:
+            while time.perf_counter() < stop:
+                t0 = time.perf_counter()
+                r = client.post(url, json=PAYLOAD)
+                local.append(time.perf_counter() - t0)
+                if r.status_code != 200:
+                    with lock:
+                        errors[0] += 1
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client_loop) for _ in range(concurrency)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    lat_ms = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(lat_ms, 50)),
+        "p99_ms": float(np.percentile(lat_ms, 99)),
+    }
+
+
+def bench(n_workers, duration, concurrency):
+    port = _free_port()
+    env = dict(os.environ, WEB_CONCURRENCY=str(n_workers), PORT=str(port))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app_api:app"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        base = f"http://127.0.0.1:{port}"
+        _wait_ready(base + "/")
+        # Laisse tous les workers démarrer
+        time.sleep(1)
+        result = run_load(base + "/predict", duration, concurrency)
+
+        workers_mem = [_memory_kb(pid) for pid in _children(proc.pid)]
+        result["workers"] = n_workers
+        result["rss_mb_per_worker"] = np.mean([m[0] for m in workers_mem]) / 1024
+        result["pss_mb_per_worker"] = np.mean([m[1] for m in workers_mem]) / 1024
+        return result
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    print(f"CPU : {os.cpu_count()} | concurrence : {args.concurrency} | durée : {args.duration}s\n")
+    print("| workers | req/s | p50 (ms) | p99 (ms) | RSS/worker (MB) | PSS/worker (MB) | erreurs |")
+    print("|---|---|---|---|---|---|---|")
+    for n in args.workers:
+        r = bench(n, args.duration, args.concurrency)
+        print(
+            f"| {r['workers']} | {r['rps']:.0f} | {r['p50_ms']:.1f} | {r['p99_ms']:.1f} "
+            f"| {r['rss_mb_per_worker']:.0f} | {r['pss_mb_per_worker']:.0f} | {r['errors']} |",
+            flush=True
+        )
+
+
+if __name__ == "__main__":
+    main()
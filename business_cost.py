@@ -0,0 +1,149 @@
+import numpy as np
+from sklearn.metrics import make_scorer, roc_auc_score
+
+
+# ============================================================
+# 💰 COÛT MÉTIER — RECHERCHE DU SEUIL OPTIMAL
+# ============================================================
+# Un client est refusé (prédit "défaut") si proba >= seuil.
+#   - FN : mauvais client accepté  -> coût cost_fn (10 par défaut)
+#   - FP : bon client refusé       -> coût cost_fp (1 par défaut)
+#
+# Au lieu d'un passage complet sur les données par seuil, les
+# probabilités sont triées une fois : pour un seuil t, les clients
+# acceptés sont le préfixe des probabilités < t, et FN / FP se lisent
+# dans les sommes cumulées des positifs / négatifs.
+# Coût : O(n log n) pour le tri + O(k log n) pour k seuils.
+# ------------------------------------------------------------
+
+
+FN_COST = 10   # Mauvais client accepté
+FP_COST = 1    # Bon client refusé
+
+# Grille historique du notebook de modélisation : pas de 0.01, 0.29
+# (seuil métier retenu) en fait partie
+DEFAULT_THRESHOLDS = np.linspace(0.01, 0.99, 99)
+
+
+def cost_curve(y_true, y_proba, thresholds=None, cost_fp=FP_COST, cost_fn=FN_COST):
+    """
+    Coût métier pour chaque seuil, sans boucle Python.
+
+    thresholds : None (grille du notebook), tableau de seuils, ou
+                 "exact" (toutes les probabilités distinctes + un seuil
+                 au-dessus du maximum : optimum exact).
+    Renvoie (thresholds, fp, fn, cost), tableaux de même longueur.
+    """
+    y_true = np.asarray(y_true).ravel()
+    y_proba = np.asarray(y_proba, dtype=np.float64).ravel()
+    if y_true.shape != y_proba.shape:
+        raise ValueError("y_true et y_proba doivent avoir la même taille")
+
+    order = np.argsort(y_proba, kind="mergesort")
+    p_sorted = y_proba[order]
+    pos_sorted = (y_true[order] == 1)
+
+    # cum_pos[k] / cum_neg[k] : positifs / négatifs parmi les k plus petites probas
+    cum_pos = np.concatenate(([0], np.cumsum(pos_sorted)))
+    cum_neg = np.arange(p_sorted.size + 1) - cum_pos
+
+    if thresholds is None:
+        thresholds = DEFAULT_THRESHOLDS
+    elif isinstance(thresholds, str):
+        if thresholds != "exact":
+            raise ValueError(f"thresholds inconnu : {thresholds!r}")
+        thresholds = _exact_thresholds(p_sorted)
+    thresholds = np.asarray(thresholds, dtype=np.float64).ravel()
+
+    # Nombre de clients acceptés (proba < t) pour chaque seuil
+    n_accepted = np.searchsorted(p_sorted, thresholds, side="left")
+    fn = cum_pos[n_accepted]
+    fp = cum_neg[-1] - cum_neg[n_accepted]
+    cost = cost_fp * fp + cost_fn * fn
+    return thresholds, fp, fn, cost
+
+
+def business_cost_with_best_threshold(y_true, y_proba, cost_fp=FP_COST, cost_fn=FN_COST,
+                                      thresholds=None):
+    """
+    Coût métier minimal et seuil associé (même contrat que la version
+    du notebook). En cas d'égalité, le plus petit seuil est retenu.
+    Retourne :
+        - best_cost : coût minimal
+        - best_threshold : seuil optimal
+        - best_cm : matrice de confusion associée [[TN, FP], [FN, TP]]
+    """
+    thresholds, fp, fn, cost = cost_curve(
+        y_true, y_proba, thresholds=thresholds, cost_fp=cost_fp, cost_fn=cost_fn
+    )
+    if thresholds.size == 0:
+        raise ValueError("aucun seuil à évaluer")
+
+    best = int(np.argmin(cost))
+    y_true = np.asarray(y_true).ravel()
+    n_pos = int(np.sum(y_true == 1))
+    n_neg = y_true.size - n_pos
+
+    best_cm = np.array([
+        [n_neg - fp[best], fp[best]],
+        [fn[best], n_pos - fn[best]]
+    ], dtype=np.int64)
+    return cost[best], float(thresholds[best]), best_cm
+
+
+# ============================================================
+# 🎯 SCORERS SKLEARN (GridSearchCV / RandomizedSearchCV)
+# ============================================================
+# response_method="predict_proba" : le scorer reçoit directement la
+# probabilité de la classe 1. En scoring multi-métriques, sklearn ne
+# calcule predict_proba qu'une fois par fold pour tous les scorers.
+# ------------------------------------------------------------
+
+
+def min_business_cost(y_true, y_proba, cost_fp=FP_COST, cost_fn=FN_COST, thresholds=None):
+    """Coût métier au meilleur seuil (une passe vectorisée)."""
+    return float(np.min(cost_curve(y_true, y_proba, thresholds, cost_fp, cost_fn)[3]))
+
+
+def best_business_threshold(y_true, y_proba, cost_fp=FP_COST, cost_fn=FN_COST, thresholds=None):
+    """Seuil qui minimise le coût métier."""
+    return business_cost_with_best_threshold(y_true, y_proba, cost_fp, cost_fn, thresholds)[1]
+
+
+def make_business_scorer(cost_fp=FP_COST, cost_fn=FN_COST, thresholds=None):
+    """
+    Scorer sklearn du coût métier minimal. greater_is_better=False :
+    le score est l'opposé du coût (best_score_ = -coût minimal).
+    """
+    return make_scorer(
+        min_business_cost, greater_is_better=False, response_method="predict_proba",
+        cost_fp=cost_fp, cost_fn=cost_fn, thresholds=thresholds
+    )
+
+
+def business_scoring(cost_fp=FP_COST, cost_fn=FN_COST, thresholds=None):
+    """
+    Scoring multi-métriques pour les recherches d'hyperparamètres,
+    à utiliser avec refit="business_cost" :
+    coût métier (à minimiser), seuil associé et ROC-AUC par fold.
+    """
+    kwargs = dict(cost_fp=cost_fp, cost_fn=cost_fn, thresholds=thresholds)
+    return {
+        "business_cost": make_business_scorer(**kwargs),
+        "business_threshold": make_scorer(
+            best_business_threshold, response_method="predict_proba", **kwargs
+        ),
+        # Et non "roc_auc" : même méthode de réponse, donc même cache
+        "roc_auc": make_scorer(roc_auc_score, response_method="predict_proba"),
+    }
+
+
+business_cost_scorer = make_business_scorer()
+
+
+def _exact_thresholds(p_sorted):
+    """Probabilités distinctes + un seuil juste au-dessus du maximum (tout accepter)."""
+    if p_sorted.size == 0:
+        return np.empty(0)
+    unique = np.unique(p_sorted)
+    return np.append(unique, np.nextafter(unique[-1], np.inf))
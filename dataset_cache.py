@@ -0,0 +1,179 @@
+"""
+Cache colonnaire typé des jeux de données CSV (Data/app_train.csv…).
+
+Le CSV est converti une seule fois en Feather (Arrow IPC, non
+compressé) avec des types compacts :
+  - flottants en float32, valeurs manquantes stockées comme NaN
+    (pas de masque de nullité : lecture sans copie côté pandas) ;
+  - entiers réduits au plus petit type signé qui contient leurs
+    valeurs (float32 s'ils ont des manquants) ;
+  - chaînes en catégories.
+
+Les lectures suivantes peuvent se limiter à un sous-ensemble de
+colonnes, par exemple les 20 features de l'API :
+
+    from dataset_cache import load_dataset
+    df = load_dataset("Data/app_train.csv")                     # tout
+    X = load_dataset("Data/app_train.csv", columns="api")       # 20 features API
+    df = load_dataset("Data/app_train.csv", columns=["TARGET", "EXT_SOURCE_2"])
+
+Le cache est reconstruit automatiquement si le CSV change (taille ou
+date de modification).
+
+Les DataFrames renvoyés sont modifiables (copie en mémoire).
+`memory_map=True` évite cette copie (colonnes adossées au fichier, lecture
+seule : toute modification en place lève « assignment destination is
+read-only ») ; à réserver aux lectures pures (benchmarks, agrégats).
+"""
+
+import argparse
+import hashlib
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.feather as feather
+
+from api_schema import FEATURE_NAMES
+
+
+CACHE_DIR = os.getenv("DATASET_CACHE_DIR", os.path.join(".cache", "datasets"))
+
+# À incrémenter si le format du cache change
+CACHE_VERSION = "1"
+
+_INT_TYPES = [pa.int8(), pa.int16(), pa.int32(), pa.int64()]
+
+
+def cache_path(source, cache_dir=CACHE_DIR):
+    name = os.path.splitext(os.path.basename(source))[0]
+    if name.endswith(".csv"):  # fichier.csv.gz
+        name = name[:-4]
+    # Deux sources de même nom (dossiers différents) ne partagent pas de cache
+    digest = hashlib.sha256(os.path.abspath(source).encode()).hexdigest()[:8]
+    return os.path.join(cache_dir, f"{name}-{digest}.feather")
+
+
+def _stamp(source):
+    st = os.stat(source)
+    return {
+        b"source": os.path.abspath(source).encode(),
+        b"source_size": str(st.st_size).encode(),
+        b"source_mtime_ns": str(st.st_mtime_ns).encode(),
+        b"cache_version": CACHE_VERSION.encode(),
+    }
+
+
+def is_fresh(source, path):
+    """Vrai si le cache `path` a été construit depuis la version actuelle de `source`."""
+    if not os.path.exists(path):
+        return False
+    metadata = feather.read_table(path, columns=[], memory_map=True).schema.metadata or {}
+    return all(metadata.get(k) == v for k, v in _stamp(source).items())
+
+
+# ============================================================
+# 🏗️ CONSTRUCTION
+# ============================================================
+
+
+def _compact_column(col):
+    """Type compact d'une colonne Arrow (voir docstring du module)."""
+    col = col.combine_chunks() if isinstance(col, pa.ChunkedArray) else col
+    t = col.type
+
+    if pa.types.is_floating(t):
+        return pc.fill_null(col.cast(pa.float32()), np.float32("nan"))
+
+    if pa.types.is_integer(t) or pa.types.is_boolean(t):
+        if col.null_count:
+            return pc.fill_null(col.cast(pa.float32()), np.float32("nan"))
+        if pa.types.is_boolean(t):
+            return col.cast(pa.int8())
+        bounds = pc.min_max(col).as_py()
+        lo, hi = bounds["min"] or 0, bounds["max"] or 0
+        for int_type in _INT_TYPES:
+            info = np.iinfo(int_type.to_pandas_dtype())
+            if info.min <= lo and hi <= info.max:
+                return col.cast(int_type)
+        return col
+
+    if pa.types.is_string(t) or pa.types.is_large_string(t):
+        return col.dictionary_encode()
+
+    return col
+
+
+def build_cache(source, cache_dir=CACHE_DIR):
+    """Convertit `source` (CSV / CSV.gz) en Feather compact ; renvoie le chemin du cache."""
+    t0 = time.perf_counter()
+    table = pa_csv.read_csv(source)
+    table = pa.table(
+        {name: _compact_column(table.column(name)) for name in table.column_names}
+    ).replace_schema_metadata(_stamp(source))
+
+    path = cache_path(source, cache_dir)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Non compressé : condition pour la lecture memory-mappée sans copie
+    # (fichier temporaire par processus : plusieurs workers peuvent construire en même temps)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    feather.write_feather(table, tmp, compression="uncompressed")
+    os.replace(tmp, path)
+    print(
+        f"🗜️ Cache {path} : {table.num_rows:,} lignes × {table.num_columns} colonnes, "
+        f"{os.path.getsize(path) / 1e6:.0f} Mo ({time.perf_counter() - t0:.1f}s)"
+    )
+    return path
+
+
+# ============================================================
+# 📥 LECTURE
+# ============================================================
+
+
+def load_dataset(source, columns=None, cache_dir=CACHE_DIR, memory_map=False):
+    """
+    DataFrame depuis le cache Feather de `source` (construit ou
+    reconstruit si besoin). `columns` : None (tout), "api" (features
+    de l'API) ou liste de colonnes. Les fichiers .parquet / .feather
+    sont lus directement (sans cache intermédiaire).
+    memory_map=True : lecture sans copie, DataFrame en lecture seule.
+    """
+    if columns == "api":
+        columns = list(FEATURE_NAMES)
+    elif columns is not None:
+        columns = list(columns)
+
+    if source.endswith(".parquet"):
+        return pd.read_parquet(source, columns=columns)
+
+    if source.endswith(".feather"):
+        path = source
+    else:
+        path = cache_path(source, cache_dir)
+        if not is_fresh(source, path):
+            build_cache(source, cache_dir)
+
+    table = feather.read_table(path, columns=columns, memory_map=memory_map)
+    if memory_map:
+        # split_blocks : une colonne par bloc pandas, sans consolidation
+        # ni copie ; les tableaux numpy pointent dans le fichier (lecture seule)
+        return table.to_pandas(split_blocks=True)
+    # Consolidation en blocs pandas : copie, tableaux modifiables
+    return table.to_pandas()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Construit le cache Feather typé d'un CSV.")
+    parser.add_argument("source", help="fichier CSV ou CSV.gz")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    args = parser.parse_args(argv)
+    return build_cache(args.source, args.cache_dir)
+
+
+if __name__ == "__main__":
+    main()
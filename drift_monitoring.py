@@ -0,0 +1,757 @@
+"""
+Monitoring du data drift à partir d'histogrammes fusionnables.
+
+Chaque feature (et le score du modèle, et la cible si elle est connue)
+est résumée par un histogramme à bornes fixes, calées une fois sur les
+quantiles de la population de référence. Une fenêtre « live » partage
+ces bornes : elle se met à jour par blocs (mémoire bornée, O(bins) par
+feature), et deux fenêtres se fusionnent en sommant leurs compteurs
+(plusieurs workers, plusieurs jours…).
+
+Les statistiques de dérive sont calculées sur les histogrammes seuls :
+  - KS : écart maximal entre les deux fonctions de répartition, lu aux
+    bornes des classes (approximation par défaut du KS exact, d'autant
+    plus fine que les classes sont nombreuses), p-value asymptotique ;
+  - PSI : Σ (p_live - p_ref) · ln(p_live / p_ref), valeurs manquantes
+    comptées comme une classe à part.
+
+Rapport HTML (même présentation que le notebook) et rapport JSON.
+
+Usage :
+    python -m drift_monitoring Data/app_train.csv Data/app_test.csv
+    python -m drift_monitoring ref.csv live.csv --html reports/drift.html --json reports/drift.json
+    python -m drift_monitoring Data/app_train.csv Data/app_test.csv \
+        --save-reference models/pipeline_best_model_top20.drift.json   # référence de l'API
+"""
+
+import argparse
+import html
+import json
+import os
+import pathlib
+import queue
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+
+# Classes par feature (bornes = quantiles de la référence)
+DEFAULT_BINS = 20
+# Lignes lues / transformées à la fois
+CHUNK_ROWS = 50_000
+ALPHA = 0.05
+# Repères usuels : < 0.1 stable, 0.1–0.25 modéré, > 0.25 fort
+PSI_ALERT = 0.25
+# Plancher des proportions dans le PSI (classes vides)
+_PSI_EPS = 1e-4
+# Variance jugée trop faible pour le test KS, relative à celle de la
+# référence (le notebook testait np.var < 1e-9 sur des features
+# standardisées sur le train)
+LOW_VARIANCE = 1e-9
+
+
+def reference_path(model_path):
+    """Profil de référence associé à un artefact : models/x.joblib -> models/x.drift.json."""
+    return os.path.splitext(model_path)[0] + ".drift.json"
+
+
+# ============================================================
+# 📊 HISTOGRAMME FUSIONNABLE
+# ============================================================
+
+
+class HistogramSketch:
+    """
+    Histogramme d'une variable numérique : `edges` (k bornes
+    intérieures croissantes) définissent k + 1 classes, la classe i
+    contenant edges[i-1] <= x < edges[i]. Les NaN sont comptés à part ;
+    minimum et maximum (fusionnables eux aussi) repèrent les variables
+    constantes, que les classes seules ne distinguent pas. Moyenne et
+    somme des carrés des écarts (`m2`, fusion de Chan et al.) donnent la
+    variance ; NaN si inconnues (profil enregistré sans elles).
+    """
+
+    def __init__(self, edges, counts=None, n_missing=0, vmin=np.inf, vmax=-np.inf,
+                 mean=0.0, m2=0.0):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = (np.zeros(len(self.edges) + 1, dtype=np.int64) if counts is None
+                       else np.asarray(counts, dtype=np.int64).copy())
+        self.n_missing = int(n_missing)
+        self.vmin = float(vmin)
+        self.vmax = float(vmax)
+        self.mean = float(mean)
+        self.m2 = float(m2)
+
+    @classmethod
+    def from_quantiles(cls, values, bins=DEFAULT_BINS):
+        """Bornes = quantiles de `values` (doublons retirés : variables discrètes)."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return cls([])
+        return cls(np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1])))
+
+    @property
+    def n(self):
+        """Nombre de valeurs non manquantes."""
+        return int(self.counts.sum())
+
+    @property
+    def variance(self):
+        return self.m2 / self.n if self.n else float("nan")
+
+    def empty_like(self):
+        return HistogramSketch(self.edges)
+
+    @staticmethod
+    def _moments(n_a, mean_a, m2_a, n_b, mean_b, m2_b):
+        """Moyenne et m2 de deux échantillons réunis (sans perte de précision)."""
+        n = n_a + n_b
+        if n == 0:
+            return 0.0, 0.0
+        delta = mean_b - mean_a
+        return mean_a + delta * n_b / n, m2_a + m2_b + delta * delta * n_a * n_b / n
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        nan = np.isnan(values)
+        self.n_missing += int(nan.sum())
+        values = values[~nan]
+        if values.size:
+            self.vmin = min(self.vmin, float(values.min()))
+            self.vmax = max(self.vmax, float(values.max()))
+            mean = float(values.mean())
+            self.mean, self.m2 = self._moments(
+                self.n, self.mean, self.m2, values.size, mean, float(np.sum((values - mean) ** 2))
+            )
+        idx = np.searchsorted(self.edges, values, side="right")
+        self.counts += np.bincount(idx, minlength=self.counts.size)
+        return self
+
+    def merge(self, other):
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("histogrammes de bornes différentes : fusion impossible")
+        mean, m2 = self._moments(self.n, self.mean, self.m2, other.n, other.mean, other.m2)
+        return HistogramSketch(
+            self.edges, self.counts + other.counts, self.n_missing + other.n_missing,
+            min(self.vmin, other.vmin), max(self.vmax, other.vmax), mean, m2
+        )
+
+    def to_dict(self):
+        known = self.n and np.isfinite(self.m2)
+        return {
+            "edges": self.edges.tolist(), "counts": self.counts.tolist(), "n_missing": self.n_missing,
+            # ±inf (histogramme vide) -> null en JSON strict
+            "min": self.vmin if self.n else None, "max": self.vmax if self.n else None,
+            "mean": self.mean if known else None, "m2": self.m2 if known else None,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        vmin, vmax = d.get("min"), d.get("max")
+        # Profils antérieurs sans moments : variance inconnue (NaN) s'il y a des valeurs
+        unknown = float("nan") if sum(d["counts"]) else 0.0
+        mean, m2 = d.get("mean"), d.get("m2")
+        return cls(d["edges"], d["counts"], d["n_missing"],
+                   np.inf if vmin is None else vmin, -np.inf if vmax is None else vmax,
+                   unknown if mean is None else mean, unknown if m2 is None else m2)
+
+
+# ============================================================
+# 📐 STATISTIQUES SUR HISTOGRAMMES
+# ============================================================
+
+
+def ks_pvalue(d, n, m):
+    """
+    p-value asymptotique du KS à deux échantillons (distribution de
+    Kolmogorov, correction de Stephens pour les effectifs finis).
+    """
+    if n == 0 or m == 0:
+        return float("nan")
+    en = np.sqrt(n * m / (n + m))
+    lam = (en + 0.12 + 0.11 / en) * d
+    if lam < 0.2:
+        return 1.0
+    k = np.arange(1, 101)
+    q = 2 * np.sum((-1.0) ** (k - 1) * np.exp(-2 * k ** 2 * lam ** 2))
+    return float(np.clip(q, 0.0, 1.0))
+
+
+def ks_statistic(ref, live):
+    """KS approché : écart maximal des fonctions de répartition aux bornes des classes."""
+    if ref.n == 0 or live.n == 0:
+        return float("nan")
+    cdf_ref = np.cumsum(ref.counts) / ref.n
+    cdf_live = np.cumsum(live.counts) / live.n
+    return float(np.max(np.abs(cdf_ref - cdf_live)))
+
+
+def psi(ref, live):
+    """Population Stability Index, classe des valeurs manquantes incluse."""
+    p = np.append(ref.counts, ref.n_missing).astype(np.float64)
+    q = np.append(live.counts, live.n_missing).astype(np.float64)
+    if p.sum() == 0 or q.sum() == 0:
+        return float("nan")
+    p = np.maximum(p / p.sum(), _PSI_EPS)
+    q = np.maximum(q / q.sum(), _PSI_EPS)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def reason_code(ref, live):
+    """
+    Cas où le test KS n'est pas interprétable, codes du notebook (la
+    référence y est le train, la fenêtre live le test).
+    """
+    if ref.n == 0 or live.n == 0:
+        return "empty_sample"
+    constant_ref, constant_live = ref.vmin == ref.vmax, live.vmin == live.vmax
+    if constant_ref and constant_live:
+        return "constant_both"
+    if constant_ref:
+        return "constant_train"
+    if constant_live:
+        return "constant_test"
+    # Comparaison fausse si une variance est inconnue (NaN) : test KS
+    if min(ref.variance, live.variance) < LOW_VARIANCE * ref.variance:
+        return "low_variance"
+    return "ks_test"
+
+
+def compare_sketches(ref, live, alpha=ALPHA):
+    ks = ks_statistic(ref, live)
+    reason = reason_code(ref, live)
+    p_value = ks_pvalue(ks, ref.n, live.n) if reason != "empty_sample" else float("nan")
+    n_ref, n_live = ref.n + ref.n_missing, live.n + live.n_missing
+    value = psi(ref, live)
+    return {
+        "p_value": p_value,
+        "statistic": ks,
+        "psi": value,
+        "drift": bool(reason == "ks_test" and p_value < alpha),
+        "psi_alert": bool(value >= PSI_ALERT),
+        "reason": reason,
+        "n_reference": n_ref,
+        "n_live": n_live,
+        "missing_reference": ref.n_missing / n_ref if n_ref else float("nan"),
+        "missing_live": live.n_missing / n_live if n_live else float("nan"),
+    }
+
+
+# ============================================================
+# 🧬 PROFIL : FEATURES + SCORE + CIBLE
+# ============================================================
+
+
+# Bornes fixes de la cible binaire : {0} | {1}
+_TARGET_EDGES = [0.5]
+
+
+class DriftProfile:
+    """
+    Ensemble d'histogrammes d'une population : une entrée par feature,
+    plus le score du modèle (`prediction`) et la cible (`target`),
+    optionnels. Un profil live se crée par `empty_like()` depuis la
+    référence, puis s'alimente par `update()`.
+    """
+
+    def __init__(self, features, prediction=None, target=None):
+        self.features = dict(features)
+        self.prediction = prediction
+        self.target = target
+
+    @classmethod
+    def with_edges(cls, X, scores=None, target=None, bins=DEFAULT_BINS):
+        """Profil vide dont les bornes sont les quantiles de X (DataFrame) et de `scores`."""
+        return cls(
+            {col: HistogramSketch.from_quantiles(X[col].to_numpy(dtype=np.float64), bins) for col in X.columns},
+            HistogramSketch.from_quantiles(scores, bins) if scores is not None else None,
+            HistogramSketch(_TARGET_EDGES) if target is not None else None,
+        )
+
+    @classmethod
+    def fit(cls, X, scores=None, target=None, bins=DEFAULT_BINS):
+        """Bornes calées sur X, puis comptage de X (population tenant en mémoire)."""
+        X = pd.DataFrame(X)
+        return cls.with_edges(X, scores, target, bins).update(X, scores, target)
+
+    def empty_like(self):
+        return DriftProfile(
+            {col: s.empty_like() for col, s in self.features.items()},
+            self.prediction.empty_like() if self.prediction is not None else None,
+            self.target.empty_like() if self.target is not None else None,
+        )
+
+    def update(self, X, scores=None, target=None):
+        """
+        X : DataFrame (colonnes par nom) ou tableau 2D dont les colonnes
+        suivent l'ordre de `features`.
+        """
+        if isinstance(X, pd.DataFrame):
+            for col, sketch in self.features.items():
+                sketch.update(X[col].to_numpy(dtype=np.float64))
+        else:
+            X = np.asarray(X, dtype=np.float64)
+            for j, sketch in enumerate(self.features.values()):
+                sketch.update(X[:, j])
+        if scores is not None and self.prediction is not None:
+            self.prediction.update(scores)
+        if target is not None and self.target is not None:
+            self.target.update(target)
+        return self
+
+    def merge(self, other):
+        def _merge(a, b):
+            return a.merge(b) if a is not None and b is not None else a or b
+
+        return DriftProfile(
+            {col: s.merge(other.features[col]) for col, s in self.features.items()},
+            _merge(self.prediction, other.prediction),
+            _merge(self.target, other.target),
+        )
+
+    def to_dict(self):
+        return {
+            "features": {col: s.to_dict() for col, s in self.features.items()},
+            "prediction": self.prediction.to_dict() if self.prediction is not None else None,
+            "target": self.target.to_dict() if self.target is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            {col: HistogramSketch.from_dict(s) for col, s in d["features"].items()},
+            HistogramSketch.from_dict(d["prediction"]) if d.get("prediction") else None,
+            HistogramSketch.from_dict(d["target"]) if d.get("target") else None,
+        )
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(path + ".tmp", path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def drift_report(reference, live, alpha=ALPHA):
+    """Rapport JSON-sérialisable : dérive par feature (triée par p-value), score et cible."""
+    rows = [
+        {"feature": col, **compare_sketches(sketch, live.features[col], alpha)}
+        for col, sketch in reference.features.items()
+    ]
+    rows.sort(key=lambda r: (np.nan_to_num(r["p_value"], nan=2.0), -np.nan_to_num(r["psi"])))
+
+    prediction = target = None
+    if reference.prediction is not None and live.prediction is not None:
+        prediction = compare_sketches(reference.prediction, live.prediction, alpha)
+    if reference.target is not None and live.target is not None:
+        target = compare_sketches(reference.target, live.target, alpha)
+        target["rate_reference"] = reference.target.counts[1] / max(reference.target.n, 1)
+        target["rate_live"] = live.target.counts[1] / max(live.target.n, 1)
+
+    n_drift = sum(r["drift"] for r in rows)
+    return {
+        "alpha": alpha,
+        "n_features": len(rows),
+        "n_drift": n_drift,
+        "drift_share": n_drift / len(rows) if rows else 0.0,
+        "features": rows,
+        "prediction": prediction,
+        "target": target,
+    }
+
+
+def to_json(report):
+    # NaN -> null : JSON strict, lisible par tous les clients
+    def clean(v):
+        if isinstance(v, dict):
+            return {k: clean(x) for k, x in v.items()}
+        if isinstance(v, list):
+            return [clean(x) for x in v]
+        if isinstance(v, (float, np.floating)):
+            return None if np.isnan(v) else float(v)
+        if isinstance(v, np.integer):
+            return int(v)
+        return v
+
+    return clean(report)
+
+
+# ============================================================
+# 📡 MONITORING EN LIGNE (TRAFIC DE L'API)
+# ============================================================
+
+
+class OnlineDriftMonitor:
+    """
+    Dérive du trafic live, calculée hors du chemin des requêtes.
+
+    `submit()` dépose (X, scores) dans une file bornée, sans jamais
+    bloquer : si la file est pleine, les lignes sont perdues et
+    comptées dans `dropped`. Un thread de fond met à jour les
+    histogrammes par paquets (au plus `flush_interval` secondes ou
+    `max_batch_rows` lignes). Sans profil de référence, les `reference_rows`
+    premières lignes reçues en tiennent lieu.
+
+    Fenêtre live : fenêtre courante + fenêtre précédente, pivotées
+    toutes les `window_rows` lignes (entre window_rows et
+    2 × window_rows lignes récentes). `report()` coûte O(bins) par feature.
+    """
+
+    def __init__(self, features, reference=None, reference_rows=5000, window_rows=10_000,
+                 queue_size=1024, bins=DEFAULT_BINS, alpha=ALPHA, flush_interval=0.5,
+                 max_batch_rows=4096):
+        self.features = list(features)
+        self.flush_interval = flush_interval
+        self.max_batch_rows = max_batch_rows
+        self.reference_rows = reference_rows
+        self.window_rows = window_rows
+        self.bins = bins
+        self.alpha = alpha
+        self.reference = None
+        self.reference_source = "traffic"
+        self._warmup, self._warmup_rows = [], 0
+        self._previous = self._current = None
+        self._current_rows = 0
+        if reference is not None:
+            self._set_reference(reference, "file")
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread = None
+
+        # Compteurs
+        self.n_rows = 0
+        self.dropped = 0
+        self.errors = 0
+        self.windows = 0
+
+    def _set_reference(self, reference, source):
+        missing = [f for f in self.features if f not in reference.features]
+        if missing:
+            raise ValueError(f"profil de référence sans les features {missing}")
+        # Ordre des colonnes de X = ordre de self.features
+        self.reference = DriftProfile(
+            {f: reference.features[f] for f in self.features}, reference.prediction, reference.target
+        )
+        self.reference_source = source
+        self._current = self.reference.empty_like()
+
+    def submit(self, X, scores):
+        """Enregistre des lignes scorées (X : (n, features), scores : (n,))."""
+        if self._thread is None or not self._thread.is_alive():
+            self._start()
+        try:
+            self._queue.put_nowait((X, scores))
+        except queue.Full:
+            self.dropped += len(X)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="drift-monitor", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            # Regroupe les dépôts pendant `flush_interval` : une mise à jour
+            # des histogrammes par paquet, et non par requête (le thread
+            # ne dispute presque plus le GIL aux requêtes)
+            items = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            n = len(items[0][0])
+            while n < self.max_batch_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                n += len(items[-1][0])
+            try:
+                X = np.vstack([np.asarray(x, dtype=np.float64).reshape(-1, len(self.features)) for x, _ in items])
+                scores = np.concatenate([np.asarray(s, dtype=np.float64).ravel() for _, s in items])
+                with self._lock:
+                    self._ingest(X, scores)
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️ Monitoring du drift : lot ignoré ({str(e)})")
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+    def _ingest(self, X, scores):
+        self.n_rows += len(X)
+        if self.reference is None:
+            need = self.reference_rows - self._warmup_rows
+            self._warmup.append((X[:need], scores[:need]))
+            self._warmup_rows += len(X[:need])
+            if self._warmup_rows < self.reference_rows:
+                return
+            X_ref = pd.DataFrame(np.vstack([x for x, _ in self._warmup]), columns=self.features)
+            scores_ref = np.concatenate([s for _, s in self._warmup])
+            self._set_reference(DriftProfile.fit(X_ref, scores_ref, bins=self.bins), "traffic")
+            self._warmup, self._warmup_rows = [], 0
+            # Le reste du paquet appartient déjà à la fenêtre live
+            X, scores = X[need:], scores[need:]
+            if not len(X):
+                return
+
+        self._current.update(X, scores)
+        self._current_rows += len(X)
+        if self._current_rows >= self.window_rows:
+            self._previous, self._current = self._current, self.reference.empty_like()
+            self._current_rows = 0
+            self.windows += 1
+
+    def flush(self):
+        """Attend que toutes les lignes déposées soient comptées."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def report(self):
+        """Rapport de dérive de la fenêtre live (None tant que la référence n'existe pas)."""
+        with self._lock:
+            if self.reference is None:
+                return None
+            live = self._current if self._previous is None else self._previous.merge(self._current)
+            return drift_report(self.reference, live, self.alpha)
+
+    def stats(self):
+        return {
+            "state": "ready" if self.reference is not None else "warming",
+            "reference_source": self.reference_source,
+            "reference_rows_needed": 0 if self.reference is not None else self.reference_rows - self._warmup_rows,
+            "window_rows": self.window_rows,
+            "windows": self.windows,
+            "n_rows": self.n_rows,
+            "queued": self._queue.qsize(),
+            "queue_size": self._queue.maxsize,
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
+
+
+# ============================================================
+# 🖨️ RAPPORT HTML
+# ============================================================
+
+
+def _badge(flag):
+    return "✔️" if flag else "❌"
+
+
+def _fmt(v, spec=".6f"):
+    return "—" if v is None or (isinstance(v, float) and np.isnan(v)) else format(v, spec)
+
+
+def _summary_html(title, d, alpha, extra=""):
+    if d is None:
+        return f"<h2>{title}</h2>\n<p><i>Non calculé.</i></p>"
+    return f"""
+    <h2>{title}</h2>
+    <ul>
+        <li><b>p-value</b> : {_fmt(d['p_value'])}</li>
+        <li><b>KS statistic</b> : {_fmt(d['statistic'])}</li>
+        <li><b>PSI</b> : {_fmt(d['psi'], '.4f')}</li>
+        <li><b>Drift</b> : {_badge(d['drift'])} (alpha={alpha})</li>
+        <li><b>Reason</b> : {d['reason']}</li>
+        <li><b>N (référence/live)</b> : {d['n_reference']} / {d['n_live']}</li>
+        {extra}
+    </ul>
+    """
+
+
+def build_html_report(report, out_path, top_n=200):
+    out_path = pathlib.Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    alpha = report["alpha"]
+
+    rows_html = "".join(
+        f"""
+        <tr>
+            <td>{html.escape(str(r['feature']))}</td>
+            <td>{_fmt(r['p_value'])}</td>
+            <td>{_fmt(r['statistic'])}</td>
+            <td>{_fmt(r['psi'], '.4f')}</td>
+            <td>{_fmt(r['missing_reference'], '.1%')} / {_fmt(r['missing_live'], '.1%')}</td>
+            <td>{_badge(r['drift'])}</td>
+            <td>{r['reason']}</td>
+        </tr>"""
+        for r in report["features"][:top_n]
+    )
+    target_extra = ""
+    if report["target"] is not None:
+        t = report["target"]
+        target_extra = f"<li><b>Rate (référence/live)</b> : {t['rate_reference']:.4f} / {t['rate_live']:.4f}</li>"
+
+    page = f"""<html>
+    <head>
+    <meta charset="utf-8">
+    <title>Drift Report</title>
+    <style>
+        body {{ font-family: Arial; margin: 35px; }}
+        .kpi {{ display: flex; gap: 20px; margin: 15px 0 25px 0; }}
+        .card {{ border: 1px solid #ddd; padding: 12px 16px; border-radius: 8px; min-width: 180px; }}
+        .card h3 {{ margin: 0 0 8px 0; font-size: 1.0em; }}
+        table {{ border-collapse: collapse; width: 100%; }}
+        th, td {{ border: 1px solid #ccc; padding: 8px; font-size: 0.85em; }}
+        th {{ background: #eee; }}
+        .small {{ color: #666; font-size: 0.9em; }}
+    </style>
+    </head>
+    <body>
+
+    <h1>📊 Drift Report</h1>
+    <p class="small">
+        Statistiques calculées sur histogrammes ({DEFAULT_BINS} classes max. par feature, bornes = quantiles
+        de la référence) : <b>KS</b> approché aux bornes des classes, <b>PSI</b> valeurs manquantes incluses.
+    </p>
+
+    <div class="kpi">
+        <div class="card"><h3>Features testées</h3><div><b>{report['n_features']}</b></div></div>
+        <div class="card"><h3>Features en drift</h3><div><b>{report['n_drift']}</b> ({report['drift_share'] * 100:.1f}%)</div></div>
+        <div class="card"><h3>Alpha</h3><div><b>{alpha}</b></div></div>
+    </div>
+
+    {_summary_html("📈 Prediction Drift (score distribution)", report["prediction"], alpha)}
+    {_summary_html("🎯 Target Drift (label distribution)", report["target"], alpha, target_extra)}
+
+    <h2>🧬 Feature Drift (Top {top_n} par p-value)</h2>
+    <table>
+        <tr>
+            <th>Feature</th><th>p-value</th><th>KS statistic</th><th>PSI</th>
+            <th>Manquants (réf./live)</th><th>Drift</th><th>Reason</th>
+        </tr>
+        {rows_html}
+    </table>
+
+    </body>
+    </html>
+    """
+    out_path.write_text(page, encoding="utf-8")
+    return out_path
+
+
+# ============================================================
+# 🚀 RUNNERS
+# ============================================================
+
+
+def profile_chunks(chunks, reference=None, score_fn=None, bins=DEFAULT_BINS):
+    """
+    Profil d'une population lue par blocs `(X, y)` (DataFrame, cible
+    ou None) : mémoire bornée par la taille d'un bloc. Sans
+    `reference`, les bornes sont calées sur le premier bloc.
+    """
+    profile = None
+    for X, y in chunks:
+        scores = score_fn(X) if score_fn is not None else None
+        if profile is None:
+            profile = (reference.empty_like() if reference is not None
+                       else DriftProfile.with_edges(X, scores, y, bins))
+        profile.update(X, scores, y)
+    return profile
+
+
+def _save_outputs(report, html_path=None, json_path=None, top_n=200):
+    if html_path:
+        build_html_report(report, html_path, top_n=top_n)
+    if json_path:
+        os.makedirs(os.path.dirname(os.path.abspath(json_path)), exist_ok=True)
+        with open(json_path + ".tmp", "w") as f:
+            json.dump(to_json(report), f, indent=2, ensure_ascii=False)
+        os.replace(json_path + ".tmp", json_path)
+
+
+def run_drift_monitoring_with_html(pipe, X_train, X_test, y_train=None, y_test=None, alpha=ALPHA,
+                                   out_path="reports/drift_report_equivalent_evidently.html",
+                                   top_n=200, bins=DEFAULT_BINS, json_path=None):
+    """
+    Remplaçant du runner du notebook (mêmes arguments et mêmes clés de
+    sortie) : features après preprocess, score et cible, comparés via
+    les histogrammes. Les données sont transformées par blocs.
+    """
+    preprocess, clf = pipe.named_steps["preprocess"], pipe.named_steps["clf"]
+    names = [str(n) for n in preprocess.get_feature_names_out()]
+
+    def chunks(X, y):
+        for start in range(0, len(X), CHUNK_ROWS):
+            Xt = np.asarray(preprocess.transform(X.iloc[start:start + CHUNK_ROWS]), dtype=np.float64)
+            yield (pd.DataFrame(Xt, columns=names),
+                   None if y is None else np.asarray(y)[start:start + CHUNK_ROWS])
+
+    def score_fn(Xt):
+        return clf.predict_proba(Xt.to_numpy())[:, 1]
+
+    reference = profile_chunks(chunks(X_train, y_train), score_fn=score_fn, bins=bins)
+    live = profile_chunks(chunks(X_test, y_test), reference=reference, score_fn=score_fn)
+    report = drift_report(reference, live, alpha)
+    _save_outputs(report, out_path, json_path, top_n)
+
+    return {
+        "feature_drift": pd.DataFrame(report["features"]),
+        "prediction_drift": report["prediction"],
+        "target_drift": report["target"],
+        "report_path": pathlib.Path(out_path),
+        "report": report,
+    }
+
+
+def _read_csv_chunks(path, columns, target_col, chunk_rows=CHUNK_ROWS):
+    wanted = set(columns) | {target_col}
+    for chunk in pd.read_csv(path, usecols=lambda c: c in wanted, chunksize=chunk_rows):
+        missing = [c for c in columns if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"{path} : colonnes manquantes {missing}")
+        X = chunk[columns].apply(pd.to_numeric, errors="coerce")
+        yield X, chunk[target_col].to_numpy() if target_col in chunk.columns else None
+
+
+def main(argv=None):
+    import app_api
+
+    parser = argparse.ArgumentParser(description="Dérive entre deux fichiers (20 features de l'API, score, cible).")
+    parser.add_argument("reference", help="population de référence (CSV, CSV.gz)")
+    parser.add_argument("live", help="population à surveiller (CSV, CSV.gz)")
+    parser.add_argument("--bins", type=int, default=DEFAULT_BINS)
+    parser.add_argument("--alpha", type=float, default=ALPHA)
+    parser.add_argument("--html", default="reports/drift_report.html")
+    parser.add_argument("--json", default="reports/drift_report.json")
+    parser.add_argument("--save-reference", default=None, help="profil de référence à écrire (JSON, cf. reference_path pour l'API)")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    app_api.load_model()
+    if app_api.bundle is None:
+        raise SystemExit(f"Modèle indisponible : {app_api.MODEL_STATUS['error']}")
+    b = app_api.bundle
+
+    def score_fn(X):
+        return app_api._predict_matrix(X.to_numpy(dtype=np.float64), b)
+
+    features, target_col = app_api.FEATURE_NAMES, "TARGET"
+    reference = profile_chunks(_read_csv_chunks(args.reference, features, target_col),
+                               score_fn=score_fn, bins=args.bins)
+    live = profile_chunks(_read_csv_chunks(args.live, features, target_col),
+                          reference=reference, score_fn=score_fn)
+    if args.save_reference:
+        reference.save(args.save_reference)
+
+    report = drift_report(reference, live, args.alpha)
+    _save_outputs(report, args.html, args.json)
+    print(f"✅ {report['n_drift']}/{report['n_features']} features en drift "
+          f"({time.perf_counter() - t0:.1f}s) — {args.html}, {args.json}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
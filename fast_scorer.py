@@ -0,0 +1,240 @@
+import numpy as np
+
+
+# ============================================================
+# ⚡ SCORER RAPIDE — NUMPY UNIQUEMENT
+# ============================================================
+# Reproduit pipeline.predict_proba(X)[:, 1] pour le pipeline
+#   ColumnTransformer(SimpleImputer -> StandardScaler) -> LGBMClassifier
+# (ou Float32Preprocessor -> LGBMClassifier, calcul alors fait en float32)
+# sans DataFrame ni validation sklearn : imputation, standardisation
+# et parcours des arbres sont faits sur des tableaux NumPy "à plat".
+# ------------------------------------------------------------
+
+
+# Codes de gestion des valeurs manquantes (cf. LightGBM tree.h)
+_MISSING_CODES = {"None": 0, "Zero": 1, "NaN": 2}
+_ZERO_THRESHOLD = 1e-35
+
+# Nombre de lignes parcourues simultanément (borne la mémoire)
+CHUNK_ROWS = 2048
+
+# Au-delà, le parcours NumPy devient plus lent que le booster natif :
+# les gros lots sont confiés directement au booster LightGBM
+# (toujours sans DataFrame ni validation sklearn)
+NUMPY_MAX_ROWS = 16
+
+
+class FastScorer:
+    """
+    Prédicteur NumPy équivalent au pipeline top-20.
+
+    Les arbres sont concaténés dans des tableaux globaux de nœuds ;
+    les feuilles pointent sur elles-mêmes, ce qui permet de descendre
+    tous les arbres en parallèle pendant `max_depth` itérations.
+    """
+
+    def __init__(self, col_idx, statistics, mean, scale,
+                 feature, threshold, left, right, default_left, missing,
+                 value, roots, max_depth, sigmoid=1.0, average_output=False,
+                 booster=None, dtype=np.float64):
+        self.col_idx = col_idx
+        self.statistics = statistics
+        self.mean = mean
+        self.scale = scale
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.missing = missing
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.sigmoid = sigmoid
+        self.average_output = average_output
+        self.booster = booster
+        self.dtype = dtype
+
+    # --------------------------------------------------------
+    # 🏗️ Construction depuis le pipeline sklearn
+    # --------------------------------------------------------
+    @classmethod
+    def from_pipeline(cls, pipe, feature_names):
+        """
+        Extrait imputer, scaler et ensemble d'arbres du pipeline.
+        Lève ValueError si le pipeline n'a pas la forme attendue.
+        """
+        steps = dict(pipe.steps)
+        if "preprocess" not in steps or "clf" not in steps:
+            raise ValueError("pipeline attendu : ('preprocess', ...) -> ('clf', ...)")
+
+        col_idx, statistics, mean, scale, dtype = _extract_preprocess(
+            steps["preprocess"], feature_names
+        )
+        booster = _lightgbm_booster(steps["clf"])
+        trees = _flatten_trees(booster.dump_model())
+
+        return cls(col_idx, statistics, mean, scale, booster=booster, dtype=dtype, **trees)
+
+    # --------------------------------------------------------
+    # 🔮 Prédiction
+    # --------------------------------------------------------
+    def transform(self, X):
+        """Imputation médiane + standardisation (équivalent du preprocess)."""
+        Xp = np.array(X, dtype=self.dtype)[:, self.col_idx]
+        nan = np.isnan(Xp)
+        if nan.any():
+            Xp[nan] = np.broadcast_to(self.statistics.astype(self.dtype, copy=False), Xp.shape)[nan]
+        Xp -= self.mean.astype(self.dtype, copy=False)
+        Xp /= self.scale.astype(self.dtype, copy=False)
+        return Xp
+
+    def raw_score(self, Xp):
+        """Somme des feuilles atteintes (score brut LightGBM)."""
+        out = np.empty(Xp.shape[0], dtype=np.float64)
+        for start in range(0, Xp.shape[0], CHUNK_ROWS):
+            out[start:start + CHUNK_ROWS] = self._raw_score_chunk(
+                Xp[start:start + CHUNK_ROWS]
+            )
+        return out
+
+    def _raw_score_chunk(self, Xp):
+        n = Xp.shape[0]
+        rows = np.arange(n)[:, None]
+        node = np.broadcast_to(self.roots, (n, self.roots.size)).copy()
+
+        for _ in range(self.max_depth):
+            v = Xp[rows, self.feature[node]]
+            missing = self.missing[node]
+            nan = np.isnan(v)
+            if nan.any():
+                v = np.where(nan & (missing != 2), 0.0, v)
+            use_default = (
+                ((missing == 1) & (np.abs(v) <= _ZERO_THRESHOLD))
+                | ((missing == 2) & nan)
+            )
+            go_left = np.where(use_default, self.default_left[node], v <= self.threshold[node])
+            node = np.where(go_left, self.left[node], self.right[node])
+
+        score = self.value[node].sum(axis=1)
+        if self.average_output:
+            score /= self.roots.size
+        return score
+
+    def predict_proba(self, X):
+        """Probabilité de la classe positive, shape (n,)."""
+        Xp = self.transform(X)
+        if self.booster is not None and Xp.shape[0] > NUMPY_MAX_ROWS:
+            return self.booster.predict(Xp)
+        raw = self.raw_score(Xp)
+        return 1.0 / (1.0 + np.exp(-self.sigmoid * raw))
+
+
+# ============================================================
+# 🔧 EXTRACTION
+# ============================================================
+
+
+def _extract_preprocess(preprocess, feature_names):
+    feature_names = list(feature_names)
+    if type(preprocess).__name__ == "Float32Preprocessor":
+        cols = list(preprocess.get_feature_names_out())
+        col_idx = np.array([feature_names.index(c) for c in cols], dtype=np.intp)
+        return (col_idx, np.asarray(preprocess.statistics_, dtype=np.float64),
+                np.asarray(preprocess.mean_, dtype=np.float64),
+                np.asarray(preprocess.scale_, dtype=np.float64), np.float32)
+
+    transformers = [
+        (name, trans, cols) for name, trans, cols in preprocess.transformers_
+        if name != "remainder" and trans != "drop"
+    ]
+    if len(transformers) != 1:
+        raise ValueError("un seul bloc numérique attendu dans le ColumnTransformer")
+
+    _, num_pipe, cols = transformers[0]
+    num_steps = dict(num_pipe.steps)
+    imputer, scaler = num_steps.get("imputer"), num_steps.get("scaler")
+    if imputer is None or scaler is None:
+        raise ValueError("bloc numérique attendu : imputer -> scaler")
+    if len(num_pipe.steps) != 2:
+        raise ValueError("étapes de prétraitement non supportées")
+    if getattr(imputer, "add_indicator", False):
+        raise ValueError("SimpleImputer(add_indicator=True) non supporté")
+
+    col_idx = np.array([feature_names.index(c) for c in cols], dtype=np.intp)
+
+    statistics = np.asarray(imputer.statistics_, dtype=np.float64)
+    mean = (np.asarray(scaler.mean_, dtype=np.float64)
+            if scaler.with_mean else np.zeros(len(cols)))
+    scale = (np.asarray(scaler.scale_, dtype=np.float64)
+             if scaler.with_std else np.ones(len(cols)))
+    return col_idx, statistics, mean, scale, np.float64
+
+
+def _lightgbm_booster(clf):
+    booster = getattr(clf, "booster_", None)
+    if booster is None or type(clf).__module__.split(".")[0] != "lightgbm":
+        raise ValueError(f"classifieur non supporté : {type(clf).__name__}")
+    return booster
+
+
+def _flatten_trees(dump):
+    objective = dump.get("objective", "").split()
+    if not objective or objective[0] != "binary":
+        raise ValueError(f"objectif non supporté : {dump.get('objective')}")
+    if dump.get("num_tree_per_iteration", 1) != 1:
+        raise ValueError("un arbre par itération attendu")
+
+    sigmoid = 1.0
+    for param in objective[1:]:
+        if param.startswith("sigmoid:"):
+            sigmoid = float(param.split(":", 1)[1])
+
+    feature, threshold, left, right = [], [], [], []
+    default_left, missing, value, roots = [], [], [], []
+    max_depth = 0
+
+    def add_node(node, depth):
+        nonlocal max_depth
+        idx = len(feature)
+        feature.append(0)
+        threshold.append(0.0)
+        left.append(idx)
+        right.append(idx)
+        default_left.append(True)
+        missing.append(0)
+        value.append(0.0)
+
+        if "split_index" not in node:
+            # Feuille : pointe sur elle-même
+            value[idx] = float(node["leaf_value"])
+            max_depth = max(max_depth, depth)
+            return idx
+
+        if node["decision_type"] != "<=":
+            raise ValueError("splits catégoriels non supportés")
+        feature[idx] = int(node["split_feature"])
+        threshold[idx] = float(node["threshold"])
+        default_left[idx] = bool(node["default_left"])
+        missing[idx] = _MISSING_CODES[node["missing_type"]]
+        left[idx] = add_node(node["left_child"], depth + 1)
+        right[idx] = add_node(node["right_child"], depth + 1)
+        return idx
+
+    for tree in dump["tree_info"]:
+        roots.append(add_node(tree["tree_structure"], 0))
+
+    return {
+        "feature": np.array(feature, dtype=np.intp),
+        "threshold": np.array(threshold, dtype=np.float64),
+        "left": np.array(left, dtype=np.intp),
+        "right": np.array(right, dtype=np.intp),
+        "default_left": np.array(default_left, dtype=bool),
+        "missing": np.array(missing, dtype=np.int8),
+        "value": np.array(value, dtype=np.float64),
+        "roots": np.array(roots, dtype=np.intp),
+        "max_depth": max_depth,
+        "sigmoid": sigmoid,
+        "average_output": bool(dump.get("average_output", False)),
+    }
@@ -0,0 +1,110 @@
+import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.utils.validation import check_is_fitted
+
+
+# ============================================================
+# 🪶 PRÉTRAITEMENT FLOAT32 (ENTRAÎNEMENT ET SERVICE)
+# ============================================================
+# Équivalent de
+#   ColumnTransformer([("num", SimpleImputer(median) -> StandardScaler, columns)])
+# mais sans copie float64 intermédiaire : une seule matrice float32
+# (C-contiguë) est produite, puis imputée et standardisée sur place,
+# par blocs de lignes. Les estimateurs LGBMClassifier / XGBClassifier
+# la gardent en float32 pour construire leur Dataset / QuantileDMatrix
+# (pas de conversion float64) ; lgb_dataset() sert à lgb.train.
+# ------------------------------------------------------------
+
+
+# Lignes traitées à la fois pendant le transform
+BLOCK_ROWS = 8192
+
+
+class Float32Preprocessor(TransformerMixin, BaseEstimator):
+    """
+    Imputation médiane + standardisation en float32.
+
+    columns : colonnes à utiliser (None : toutes, dans l'ordre d'entrée).
+    copy    : False pour transformer sur place un tableau float32 déjà
+              C-contigu (aucune allocation supplémentaire).
+    Statistiques (médianes, moyennes, écarts-types) calculées en
+    float64, colonne par colonne, comme SimpleImputer / StandardScaler.
+    """
+
+    def __init__(self, columns=None, copy=True):
+        self.columns = columns
+        self.copy = copy
+
+    def _as_float32(self, X, copy):
+        if hasattr(X, "columns"):
+            cols = list(self.columns) if self.columns is not None else list(X.columns)
+            # to_numpy alloue la seule matrice du transform
+            return np.ascontiguousarray(X[cols].to_numpy(dtype=np.float32))
+        X = np.asarray(X)
+        if self.columns is not None:
+            # L'indexation crée déjà une nouvelle matrice
+            X, copy = X[:, self.col_idx_], False
+        if copy or X.dtype != np.float32 or not X.flags.c_contiguous:
+            return np.array(X, dtype=np.float32, order="C")
+        return X
+
+    def fit(self, X, y=None):
+        self.n_features_in_ = X.shape[1]
+        if hasattr(X, "columns"):
+            self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+            cols = list(self.columns) if self.columns is not None else list(X.columns)
+            self.col_idx_ = np.array([list(X.columns).index(c) for c in cols], dtype=np.intp)
+        else:
+            self.col_idx_ = (np.asarray(self.columns, dtype=np.intp)
+                             if self.columns is not None else np.arange(X.shape[1]))
+            cols = [f"x{i}" for i in self.col_idx_]
+        self.feature_names_out_ = np.asarray([str(c) for c in cols], dtype=object)
+
+        Xf = self._as_float32(X, copy=False)
+        n_cols = Xf.shape[1]
+        self.statistics_ = np.empty(n_cols)
+        self.mean_ = np.empty(n_cols)
+        self.scale_ = np.empty(n_cols)
+        for j in range(n_cols):
+            # Une seule colonne float64 temporaire à la fois
+            col = Xf[:, j].astype(np.float64)
+            nan = np.isnan(col)
+            median = np.median(col[~nan]) if (~nan).any() else np.nan
+            col[nan] = median
+            self.statistics_[j] = median
+            self.mean_[j] = col.mean()
+            self.scale_[j] = col.std()
+        self.scale_[self.scale_ == 0] = 1.0
+        return self
+
+    def transform(self, X):
+        check_is_fitted(self, "statistics_")
+        Xf = self._as_float32(X, copy=self.copy)
+        statistics = self.statistics_.astype(np.float32)
+        mean = self.mean_.astype(np.float32)
+        scale = self.scale_.astype(np.float32)
+        # Par blocs de lignes : temporaires (masque NaN) bornés à un bloc
+        for start in range(0, Xf.shape[0], BLOCK_ROWS):
+            block = Xf[start:start + BLOCK_ROWS]
+            nan = np.isnan(block)
+            if nan.any():
+                np.copyto(block, statistics, where=nan)
+            block -= mean
+            block /= scale
+        return Xf
+
+    def get_feature_names_out(self, input_features=None):
+        check_is_fitted(self, "feature_names_out_")
+        return self.feature_names_out_.copy()
+
+
+# ============================================================
+# 🔌 PASSAGE DIRECT AUX BOOSTERS
+# ============================================================
+
+
+def lgb_dataset(X, y, reference=None, **kwargs):
+    """lgb.Dataset sur la matrice float32 telle quelle (pas de conversion float64)."""
+    import lightgbm as lgb
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    return lgb.Dataset(X, label=y, reference=reference, free_raw_data=True, **kwargs)
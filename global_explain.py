@@ -0,0 +1,185 @@
+"""
+Résumé global des explications du modèle servi, précalculé sur la
+population d'entraînement et stocké dans un fichier .npz compact :
+
+  - importances globales : gain et nombre de splits du booster,
+    moyenne des |contributions| TreeSHAP ;
+  - distribution des contributions de chaque feature : quantiles
+    (0 à 100 %) sur un échantillon de la population.
+
+Le fichier est lu une fois par l'API (/explain/global) ; une feature
+est une ligne de la matrice des quantiles, servie par simple indexation.
+
+Usage :
+    python -m global_explain Data/app_train.csv
+    python -m global_explain Data/app_train.csv --sample 50000 --output models/x.explain.npz
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+
+# Niveaux des quantiles stockés (percentiles 0 à 100)
+LEVELS = np.linspace(0, 1, 101)
+# TreeSHAP coûte ~5 ms par ligne : échantillon de la population
+SAMPLE_ROWS = 20_000
+CHUNK_ROWS = 2048
+RANDOM_STATE = 42
+
+
+def summary_path(model_path):
+    """Chemin du résumé associé à un artefact : models/x.joblib -> models/x.explain.npz."""
+    return os.path.splitext(model_path)[0] + ".explain.npz"
+
+
+# ============================================================
+# 🏗️ CONSTRUCTION
+# ============================================================
+
+
+def _booster_importances(b, n_features):
+    """Gain et splits du booster LightGBM, colonnes dans l'ordre du contrat API."""
+    gain, split = np.zeros(n_features), np.zeros(n_features)
+    if b.scorer is not None and b.scorer.booster is not None:
+        booster, cols = b.scorer.booster, b.scorer.col_idx
+        gain[cols] = booster.feature_importance(importance_type="gain")
+        split[cols] = booster.feature_importance(importance_type="split")
+    return gain, split
+
+
+def build_summary(model_path, data_path, sample=SAMPLE_ROWS, random_state=RANDOM_STATE):
+    """Calcule le résumé global (dict de tableaux) du modèle `model_path` sur `data_path`."""
+    # Import tardif : mêmes chargement, prétraitement et contributions que l'API
+    import app_api
+    from dataset_cache import load_dataset
+
+    t0 = time.perf_counter()
+    b = app_api._load_bundle(model_path)
+    X = load_dataset(data_path, columns="api")[app_api.FEATURE_NAMES].to_numpy(dtype=np.float64)
+    n_population = len(X)
+    if sample and len(X) > sample:
+        rng = np.random.default_rng(random_state)
+        X = X[np.sort(rng.choice(len(X), sample, replace=False))]
+
+    contribs = np.empty((len(X), len(app_api.FEATURE_NAMES) + 1))
+    for start in range(0, len(X), CHUNK_ROWS):
+        _, contribs[start:start + CHUNK_ROWS] = app_api._explain_matrix(X[start:start + CHUNK_ROWS], b)
+        print(f"  {min(start + CHUNK_ROWS, len(X)):,}/{len(X):,} lignes expliquées", flush=True)
+
+    shap = contribs[:, :-1]
+    gain, split = _booster_importances(b, shap.shape[1])
+    summary = {
+        "features": np.array(app_api.FEATURE_NAMES),
+        "importance_gain": gain,
+        "importance_split": split,
+        "mean_abs_shap": np.abs(shap).mean(axis=0),
+        "mean_shap": shap.mean(axis=0),
+        "levels": LEVELS,
+        # (n_features, n_levels) : une ligne par feature
+        "shap_quantiles": np.quantile(shap, LEVELS, axis=0).T.astype(np.float32),
+        "base_value": np.float64(contribs[0, -1]) if len(contribs) else np.float64(np.nan),
+        "meta": np.array(json.dumps({
+            "model_path": os.path.abspath(model_path),
+            "model_signature": b.signature,
+            "data_path": os.path.abspath(data_path),
+            "n_population": n_population,
+            "n_rows": len(X),
+            "built_at": time.time(),
+        })),
+    }
+    print(f"✅ Résumé global : {len(X):,} lignes en {time.perf_counter() - t0:.1f}s")
+    return summary
+
+
+def save_summary(summary, path):
+    # Écriture atomique : l'API ne lit jamais un fichier partiel
+    # (np.savez ajoute .npz à un nom qui n'en a pas)
+    tmp = path + ".tmp.npz"
+    np.savez(tmp, **summary)
+    os.replace(tmp, path)
+    return path
+
+
+# ============================================================
+# 📖 LECTURE (API)
+# ============================================================
+
+
+class GlobalSummary:
+    """
+    Résumé chargé en mémoire (quelques Ko) et indexé par nom de
+    feature : chaque accès est une indexation de tableau.
+    """
+
+    def __init__(self, arrays, stamp=None):
+        self.features = [str(f) for f in arrays["features"]]
+        self.index = {name: i for i, name in enumerate(self.features)}
+        self.importance_gain = arrays["importance_gain"]
+        self.importance_split = arrays["importance_split"]
+        self.mean_abs_shap = arrays["mean_abs_shap"]
+        self.mean_shap = arrays["mean_shap"]
+        self.levels = arrays["levels"]
+        self.shap_quantiles = arrays["shap_quantiles"]
+        self.base_value = float(arrays["base_value"])
+        self.meta = json.loads(str(arrays["meta"]))
+        # Rang de chaque feature par |contribution| moyenne décroissante
+        order = np.argsort(-self.mean_abs_shap, kind="mergesort")
+        self.rank = np.empty(len(order), dtype=int)
+        self.rank[order] = np.arange(1, len(order) + 1)
+        self.order = order
+        self.stamp = stamp
+
+    @classmethod
+    def load(cls, path):
+        st = os.stat(path)
+        with np.load(path, allow_pickle=False) as f:
+            arrays = {k: f[k] for k in f.files}
+        return cls(arrays, stamp=(st.st_mtime_ns, st.st_size))
+
+    def importance(self):
+        """Importances globales, triées par |contribution| moyenne décroissante."""
+        return [
+            {
+                "feature": self.features[i],
+                "rank": int(self.rank[i]),
+                "mean_abs_shap": float(self.mean_abs_shap[i]),
+                "mean_shap": float(self.mean_shap[i]),
+                "gain": float(self.importance_gain[i]),
+                "split": int(self.importance_split[i]),
+            }
+            for i in self.order
+        ]
+
+    def feature(self, name, levels=None):
+        """Quantiles des contributions d'une feature (KeyError si inconnue)."""
+        i = self.index[name]
+        q = self.shap_quantiles[i]
+        if levels is not None:
+            # Niveaux demandés -> plus proches niveaux stockés
+            idx = np.clip(np.rint(np.asarray(levels) * (len(self.levels) - 1)).astype(int), 0, len(self.levels) - 1)
+            return self.levels[idx], q[idx]
+        return self.levels, q
+
+
+def main(argv=None):
+    import app_api
+
+    parser = argparse.ArgumentParser(description="Précalcule le résumé global des explications du modèle.")
+    parser.add_argument("data", help="population d'entraînement (CSV, CSV.gz, Parquet)")
+    parser.add_argument("--model", default=app_api.MODEL_PATH)
+    parser.add_argument("--sample", type=int, default=SAMPLE_ROWS, help="lignes expliquées (0 = toutes)")
+    parser.add_argument("--output", default=None, help="défaut : <modèle>.explain.npz")
+    args = parser.parse_args(argv)
+
+    output = args.output or summary_path(args.model)
+    save_summary(build_summary(args.model, args.data, sample=args.sample), output)
+    print(f"📦 Résumé écrit : {output} ({os.path.getsize(output) / 1e3:.0f} Ko)")
+    return output
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import gc
+import multiprocessing
+import os
+
+
+# ============================================================
+# 🏭 SERVICE MULTI-WORKERS (PRE-FORK)
+# ============================================================
+# Lancement : gunicorn -c gunicorn.conf.py app_api:app
+#
+# preload_app = True : app_api est importé, et le modèle joblib + le
+# scorer rapide chargés, UNE SEULE FOIS dans le processus maître, avant
+# l'ouverture du port et le fork. Les workers partagent alors les tableaux en lecture seule
+# (copy-on-write) au lieu de recharger chacun le pipeline.
+# ------------------------------------------------------------
+
+
+# Un seul thread OpenMP par worker : évite la sur-souscription des cœurs
+# et les blocages de libgomp après un fork. À définir avant l'import
+# de LightGBM / XGBoost (donc avant le préchargement de l'application).
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = 120
+
+
+def on_starting(server):
+    # En pre-fork, le modèle est chargé de façon synchrone dans le maître
+    # (un thread de chargement ne survivrait pas au fork) ; les workers le
+    # trouvent déjà "ready" et ne relancent pas le chargement.
+    # on_starting s'exécute AVANT l'ouverture du port (when_ready, lui,
+    # s'exécute après le bind mais avant le fork : le port accepterait
+    # des connexions que personne ne sert pendant la désérialisation).
+    # Ici, tant que le modèle charge, les connexions sont refusées et non
+    # suspendues ; dès l'écoute, /health/live et /health/ready répondent.
+    import app_api
+    app_api.load_model()
+
+    # Modèle chargé dans le maître : on « gèle » les objets existants pour
+    # que le ramasse-miettes des workers ne touche plus leurs pages
+    # (sinon chaque collecte les recopierait dans chaque worker).
+    gc.freeze()
+    server.log.info(
+        f"Modèle préchargé — {workers} worker(s) sur {multiprocessing.cpu_count()} CPU, "
+        f"{gc.get_freeze_count()} objets gelés"
+    )
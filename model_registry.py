@@ -0,0 +1,202 @@
+"""
+Registre local des versions de modèle, décrit par un manifeste JSON
+(models/registry.json) :
+
+    {
+      "default": "top20-v1",
+      "versions": {
+        "top20-v1": {
+          "artifact": "pipeline_best_model_top20.joblib",   # relatif à models/
+          "sha256": "...",                                  # empreinte du contenu
+          "features": [...],
+          "threshold": 0.29,
+          "metrics": {"auc": ..., "business_cost": ...},
+          "registered_at": "..."
+        }
+      }
+    }
+
+Une version est immuable : son artefact est vérifié par son SHA-256
+avant chargement, un fichier réécrit depuis l'enregistrement est
+refusé. Un artefact situé hors de models/ est copié sous
+models/<version>.joblib à l'enregistrement.
+
+Usage :
+    python -m model_registry list
+    python -m model_registry register models/pipeline_best_model_top20.joblib --version top20-v1 \\
+        --threshold 0.29 --metrics '{"auc": 0.78}' --default
+    python -m model_registry verify
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import shutil
+
+import joblib
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(BASE_DIR, "models")
+MANIFEST_NAME = "registry.json"
+
+
+def manifest_path(models_dir=MODELS_DIR):
+    return os.path.join(models_dir, MANIFEST_NAME)
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ArtifactMismatch(ValueError):
+    """Le contenu de l'artefact ne correspond plus au SHA-256 du manifeste."""
+
+
+class ModelRegistry:
+    """Manifeste chargé en mémoire ; `save()` le réécrit de façon atomique."""
+
+    def __init__(self, path, versions=None, default=None, stamp=None):
+        self.path = path
+        self.models_dir = os.path.dirname(os.path.abspath(path))
+        self.versions = versions or {}
+        self.default = default
+        # (mtime, taille) du manifeste lu, pour détecter une mise à jour
+        self.stamp = stamp
+
+    @classmethod
+    def load(cls, path):
+        """Registre décrit par `path` (vide si le manifeste n'existe pas)."""
+        if not os.path.exists(path):
+            return cls(path)
+        st = os.stat(path)
+        with open(path) as f:
+            manifest = json.load(f)
+        return cls(path, manifest.get("versions", {}), manifest.get("default"), (st.st_mtime_ns, st.st_size))
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"default": self.default, "versions": self.versions}, f, indent=2)
+        os.replace(tmp, self.path)
+        st = os.stat(self.path)
+        self.stamp = (st.st_mtime_ns, st.st_size)
+
+    # --------------------------------------------------------
+    # Lecture
+    # --------------------------------------------------------
+    def get(self, version):
+        """Entrée du manifeste (KeyError si la version est inconnue)."""
+        return dict(self.versions[version], version=version)
+
+    def artifact_path(self, version):
+        return os.path.join(self.models_dir, self.versions[version]["artifact"])
+
+    def find(self, sha256):
+        """Version dont l'artefact a cette empreinte (None si aucune)."""
+        for version, entry in self.versions.items():
+            if entry["sha256"] == sha256:
+                return version
+        return None
+
+    def verify(self, version):
+        """Chemin de l'artefact, après contrôle de son empreinte (ArtifactMismatch sinon)."""
+        path = self.artifact_path(version)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"artefact de {version} introuvable : {path}")
+        if file_sha256(path) != self.versions[version]["sha256"]:
+            raise ArtifactMismatch(f"artefact de {version} modifié depuis son enregistrement : {path}")
+        return path
+
+    # --------------------------------------------------------
+    # Enregistrement
+    # --------------------------------------------------------
+    def register(self, artifact, version, threshold, metrics=None, features=None, default=False):
+        """
+        Ajoute `version`. Les features sont lues dans le pipeline
+        (feature_names_in_) si elles ne sont pas fournies.
+        """
+        if version in self.versions:
+            raise ValueError(f"version déjà enregistrée : {version}")
+
+        artifact = os.path.abspath(artifact)
+        if os.path.dirname(artifact) != self.models_dir:
+            target = os.path.join(self.models_dir, f"{version}.joblib")
+            shutil.copyfile(artifact, target + ".tmp")
+            os.replace(target + ".tmp", target)
+            artifact = target
+
+        if features is None:
+            names = getattr(joblib.load(artifact), "feature_names_in_", None)
+            if names is None:
+                raise ValueError("features non fournies et absentes du pipeline (feature_names_in_)")
+            features = [str(n) for n in names]
+
+        self.versions[version] = {
+            "artifact": os.path.basename(artifact),
+            "sha256": file_sha256(artifact),
+            "features": list(features),
+            "threshold": float(threshold),
+            "metrics": metrics or {},
+            "registered_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        }
+        if default or self.default is None:
+            self.default = version
+        return self.get(version)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Registre local des versions de modèle.")
+    parser.add_argument("--manifest", default=manifest_path())
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="versions enregistrées")
+    reg = sub.add_parser("register", help="enregistre un artefact joblib")
+    reg.add_argument("artifact")
+    reg.add_argument("--version", required=True)
+    reg.add_argument("--threshold", type=float, required=True, help="seuil métier de la version")
+    reg.add_argument("--metrics", default="{}", help="métriques d'entraînement (JSON)")
+    reg.add_argument("--default", action="store_true", help="version servie par défaut")
+    default = sub.add_parser("set-default", help="change la version par défaut")
+    default.add_argument("version")
+    sub.add_parser("verify", help="contrôle les empreintes des artefacts")
+    args = parser.parse_args(argv)
+
+    registry = ModelRegistry.load(args.manifest)
+    if args.command == "register":
+        entry = registry.register(
+            args.artifact, args.version, args.threshold, json.loads(args.metrics), default=args.default
+        )
+        registry.save()
+        print(f"📦 {args.version} enregistrée ({len(entry['features'])} features, sha256 {entry['sha256'][:12]})")
+    elif args.command == "set-default":
+        registry.get(args.version)
+        registry.default = args.version
+        registry.save()
+        print(f"⭐ Version par défaut : {args.version}")
+    elif args.command == "verify":
+        ok = True
+        for version in registry.versions:
+            try:
+                registry.verify(version)
+                print(f"✅ {version}")
+            except (FileNotFoundError, ArtifactMismatch) as e:
+                ok = False
+                print(f"❌ {str(e)}")
+        if not ok:
+            raise SystemExit(1)
+    else:
+        for version, entry in registry.versions.items():
+            star = "⭐" if version == registry.default else "  "
+            print(f"{star} {version:20s} {entry['artifact']:40s} seuil={entry['threshold']:.3f} "
+                  f"{len(entry['features'])} features  {json.dumps(entry['metrics'])}")
+    return registry
+
+
+if __name__ == "__main__":
+    main()
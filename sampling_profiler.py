@@ -0,0 +1,233 @@
+import os
+import sys
+import threading
+import time
+import types
+
+
+# ============================================================
+# 🔥 PROFILEUR ÉCHANTILLONNEUR (FLAME GRAPHS)
+# ============================================================
+# Un thread de fond relève périodiquement la pile des threads
+# « actifs » (sys._current_frames()), c'est-à-dire ceux qui exécutent
+# en ce moment une requête tirée au sort. Les piles identiques sont
+# agrégées (format « collapsed » de flamegraph.pl, ou speedscope).
+#
+# Aucun hook par appel de fonction (pas de sys.setprofile) : le coût
+# est celui d'un relevé de piles par intervalle, mesuré en continu.
+# Si ce coût dépasse `max_overhead` du temps d'échantillonnage,
+# l'intervalle est doublé (jusqu'à MAX_INTERVAL_MS), puis réduit
+# quand la marge redevient large.
+# ------------------------------------------------------------
+
+
+MAX_INTERVAL_MS = 100.0
+MIN_SAMPLES = 20
+MAX_DEPTH = 128
+TRUNCATED = "[piles tronquées]"
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    rate         : part des requêtes profilées (0 = désactivé)
+    interval_ms  : intervalle entre deux relevés de piles
+    max_overhead : part maximale du temps passée à relever les piles
+    max_stacks   : nombre maximal de piles distinctes conservées
+    """
+
+    def __init__(self, rate=0.0, interval_ms=1.0, max_overhead=0.02, max_stacks=10_000):
+        self.rate = rate
+        self.base_interval_ms = interval_ms
+        self.interval_ms = interval_ms
+        self.max_overhead = max_overhead
+        self.max_stacks = max_stacks
+
+        # Threads actifs : id -> nombre d'entrées imbriquées
+        self._active = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+        # Piles agrégées : tuple de frames (racine -> feuille) -> [échantillons, poids en ms]
+        self._stacks = {}
+        self._stacks_lock = threading.Lock()
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.samples = 0
+        self.requests = 0
+        self.sampling_time_s = 0.0
+        self.active_time_s = 0.0
+        self.started_at = time.time()
+
+    # --------------------------------------------------------
+    # Côté requêtes
+    # --------------------------------------------------------
+    def enter(self):
+        tid = threading.get_ident()
+        with self._lock:
+            self._active[tid] = self._active.get(tid, 0) + 1
+        if self._thread is None or not self._thread.is_alive():
+            self._start()
+        self._wake.set()
+
+    def leave(self):
+        tid = threading.get_ident()
+        with self._lock:
+            n = self._active.get(tid, 0) - 1
+            if n > 0:
+                self._active[tid] = n
+            else:
+                self._active.pop(tid, None)
+                if not self._active:
+                    self._wake.clear()
+
+    def call(self, fn, *args, **kwargs):
+        """fn(*args) avec le thread courant échantillonné."""
+        self.enter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.leave()
+
+    @types.coroutine
+    def drive(self, coro):
+        """
+        Exécute une coroutine en n'échantillonnant le thread de la boucle
+        que pendant ses propres étapes (pas pendant ses `await`, où la
+        boucle sert d'autres requêtes).
+        """
+        value, error = None, None
+        while True:
+            self.enter()
+            try:
+                yielded = coro.throw(error) if error is not None else coro.send(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self.leave()
+            try:
+                value, error = (yield yielded), None
+            except BaseException as e:
+                value, error = None, e
+
+    # --------------------------------------------------------
+    # Thread d'échantillonnage
+    # --------------------------------------------------------
+    def _start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        own = threading.get_ident()
+        while True:
+            self._wake.wait()
+            interval = self.interval_ms / 1000
+            time.sleep(interval)
+
+            t0 = time.perf_counter()
+            with self._lock:
+                active = [tid for tid in self._active if tid != own]
+            if not active:
+                continue
+            frames = sys._current_frames()
+            with self._stacks_lock:
+                for tid in active:
+                    frame = frames.get(tid)
+                    if frame is not None:
+                        self._record(frame, self.interval_ms)
+            del frames
+            elapsed = time.perf_counter() - t0
+
+            self.samples += 1
+            self.sampling_time_s += elapsed
+            self.active_time_s += interval + elapsed
+            # Budget dépassé : relevés plus espacés ; large marge : on revient
+            # vers l'intervalle demandé (ratio cumulé, stable après MIN_SAMPLES)
+            if self.samples >= MIN_SAMPLES:
+                ratio = self.sampling_time_s / self.active_time_s
+                if ratio > self.max_overhead and self.interval_ms < MAX_INTERVAL_MS:
+                    self.interval_ms = min(self.interval_ms * 2, MAX_INTERVAL_MS)
+                elif ratio < self.max_overhead / 4 and self.interval_ms > self.base_interval_ms:
+                    self.interval_ms = max(self.interval_ms / 2, self.base_interval_ms)
+
+    def _record(self, frame, weight_ms):
+        labels = []
+        while frame is not None and len(labels) < MAX_DEPTH:
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        stack = tuple(reversed(labels))
+        entry = self._stacks.get(stack)
+        if entry is None:
+            if len(self._stacks) >= self.max_stacks:
+                stack = (TRUNCATED,)
+                entry = self._stacks.get(stack)
+            if entry is None:
+                entry = self._stacks[stack] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += weight_ms
+
+    # --------------------------------------------------------
+    # Exports
+    # --------------------------------------------------------
+    def _snapshot(self):
+        with self._stacks_lock:
+            return sorted((stack, tuple(entry)) for stack, entry in self._stacks.items())
+
+    def reset(self):
+        with self._stacks_lock:
+            self._stacks = {}
+        self.interval_ms = self.base_interval_ms
+        self._reset_counters()
+
+    def overhead(self):
+        return {
+            "rate": self.rate,
+            "requests": self.requests,
+            "samples": self.samples,
+            "distinct_stacks": len(self._stacks),
+            "interval_ms": self.interval_ms,
+            "sampling_time_s": self.sampling_time_s,
+            "active_time_s": self.active_time_s,
+            # Part du temps d'échantillonnage passée à relever les piles
+            "overhead_ratio": self.sampling_time_s / self.active_time_s if self.active_time_s else 0.0,
+            "max_overhead": self.max_overhead,
+        }
+
+    def collapsed(self):
+        """Format de flamegraph.pl / speedscope : « f1;f2;f3 N » par ligne."""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, (count, _) in self._snapshot())
+
+    def speedscope(self, name="app_api"):
+        """Profil « sampled » au format JSON de speedscope (poids en ms)."""
+        index, frames, samples, weights = {}, [], [], []
+        for stack, (_, weight_ms) in self._snapshot():
+            ids = []
+            for label in stack:
+                if label not in index:
+                    index[label] = len(frames)
+                    frames.append({"name": label})
+                ids.append(index[label])
+            samples.append(ids)
+            weights.append(weight_ms)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+            "name": name,
+            "exporter": "sampling_profiler",
+        }
@@ -0,0 +1,308 @@
+"""
+Scoring hors-ligne d'un gros fichier (CSV, CSV.gz ou Parquet) avec le
+même pipeline que l'API (app_api.MODEL_PATH) et le seuil SEUIL_METIER.
+
+Le processus principal ne fait que découper le fichier en blocs de
+`chunk_rows` lignes, sans les parser :
+  - CSV : repérage des fins de ligne, chaque bloc est une plage
+    d'octets que le worker relit lui-même (un enregistrement par ligne :
+    pas de retour à la ligne dans un champ entre guillemets) ;
+  - CSV.gz : pas d'accès direct, le texte décompressé du bloc est
+    transmis tel quel au worker ;
+  - Parquet : plages de lignes, lues par le worker dans les row groups
+    qui les contiennent (métadonnées du fichier).
+Chaque bloc est parsé et scoré par un pool de processus (modèle chargé
+une seule fois par worker) qui écrit son résultat dans `part-XXXXX.csv`.
+Les blocs déjà écrits sont sautés au lancement suivant, sans être lus :
+un run interrompu reprend au dernier bloc terminé.
+
+Usage :
+    python -m score_batch Data/app_train.csv --output scores.csv
+    python -m score_batch clients.parquet --workers 8 --chunk-rows 100000
+"""
+
+import argparse
+import gzip
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+from threadpoolctl import threadpool_limits
+
+import app_api
+from model_registry import file_sha256
+
+
+MANIFEST = "_manifest.json"
+HEADER = f"{app_api.ID_COL},probability,decision\n"
+WANTED = [app_api.ID_COL] + app_api.FEATURE_NAMES
+# Taille des lectures lors du repérage des fins de ligne
+SCAN_BYTES = 16 * 2**20
+
+# Renseignés dans chaque worker par _init_worker()
+_worker = {}
+
+
+def _init_worker(model_path, threshold, input_path, names):
+    # Un thread OpenMP / BLAS par processus : le parallélisme vient du pool
+    # (OMP_NUM_THREADS serait sans effet ici, les bibliothèques natives
+    # sont déjà chargées par l'import d'app_api)
+    threadpool_limits(limits=1)
+    _worker.update(
+        bundle=app_api._load_bundle(model_path), threshold=threshold,
+        input=input_path, names=names, row_groups=None
+    )
+
+
+# ============================================================
+# ✂️ DÉCOUPAGE (PROCESSUS PRINCIPAL, SANS PARSING)
+# ============================================================
+
+
+def _is_parquet(path):
+    return path.lower().endswith((".parquet", ".pq"))
+
+
+def _split_lines(f, chunk_rows):
+    """
+    Blocs de `chunk_rows` lignes d'un flux binaire (positionné après
+    l'en-tête) : (début, fin, morceaux d'octets, lignes) par bloc.
+    Seules les fins de ligne sont cherchées (numpy), rien n'est parsé.
+    """
+    start = pos = f.tell()
+    lines, pieces = 0, []
+    while True:
+        block = f.read(SCAN_BYTES)
+        if not block:
+            break
+        newlines = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == ord("\n"))
+        used = 0
+        # Indice, dans `newlines`, de la fin de ligne qui clôt le bloc courant
+        k = chunk_rows - lines - 1
+        while k < len(newlines):
+            cut = int(newlines[k]) + 1
+            pieces.append(block[used:cut])
+            yield start, pos + cut, pieces, chunk_rows
+            start, used, pieces = pos + cut, cut, []
+            k += chunk_rows
+        lines = int(np.count_nonzero(newlines >= used)) if used else lines + len(newlines)
+        pieces.append(block[used:])
+        pos += len(block)
+        last = block[-1:]
+    if pos > start:
+        # Dernière ligne éventuellement sans fin de ligne
+        yield start, pos, pieces, lines + (last != b"\n")
+
+
+def _plan(f, input_path, chunk_rows):
+    """
+    Colonnes du fichier et itérateur de (spec, lignes) par bloc ; `spec`
+    dit au worker quoi lire (voir _read_part).
+    """
+    if _is_parquet(input_path):
+        if not app_api.HAS_PYARROW:
+            raise SystemExit("❌ Parquet non supporté : pyarrow n'est pas installé.")
+        meta = app_api.pq.ParquetFile(input_path).metadata
+        n_rows = meta.num_rows
+        names = [meta.schema.column(i).name for i in range(meta.num_columns)]
+        parts = (
+            (("parquet", start, min(start + chunk_rows, n_rows)), min(chunk_rows, n_rows - start))
+            for start in range(0, n_rows, chunk_rows)
+        )
+        return names, parts
+
+    compressed = input_path.lower().endswith(".gz")
+    if compressed:
+        f = gzip.open(f, "rb")
+    header = f.readline()
+    names = pd.read_csv(io.BytesIO(header), nrows=0).columns.tolist()
+    if compressed:
+        # Pas d'accès direct dans un flux compressé : le texte du bloc est transmis
+        parts = ((("text", b"".join(pieces)), n) for _, _, pieces, n in _split_lines(f, chunk_rows))
+    else:
+        parts = ((("range", start, end), n) for start, end, _, n in _split_lines(f, chunk_rows))
+    return names, parts
+
+
+# ============================================================
+# 👷 WORKERS
+# ============================================================
+
+
+def _parquet_rows(start, end):
+    """Lignes [start, end) d'un Parquet, lues dans les row groups qui les contiennent."""
+    pf = app_api.pq.ParquetFile(_worker["input"])
+    bounds = np.cumsum([0] + [pf.metadata.row_group(i).num_rows for i in range(pf.num_row_groups)])
+    groups = list(range(np.searchsorted(bounds, start, "right") - 1, np.searchsorted(bounds, end, "left")))
+    # Row groups du bloc précédent gardés : des blocs consécutifs les partagent
+    cached = _worker["row_groups"]
+    if cached is None or cached[0] != groups:
+        columns = [c for c in WANTED if c in pf.schema_arrow.names]
+        cached = _worker["row_groups"] = (groups, pf.read_row_groups(groups, columns=columns))
+    return cached[1].slice(int(start - bounds[groups[0]]), end - start).to_pandas()
+
+
+def _read_part(spec):
+    if spec[0] == "parquet":
+        return _parquet_rows(spec[1], spec[2])
+    if spec[0] == "range":
+        with open(_worker["input"], "rb") as f:
+            f.seek(spec[1])
+            data = f.read(spec[2] - spec[1])
+    else:
+        data = spec[1]
+    return pd.read_csv(
+        io.BytesIO(data), header=None, names=_worker["names"], usecols=lambda c: c in WANTED
+    )
+
+
+def _score_part(idx, spec, offset, out_dir):
+    chunk = _read_part(spec)
+    csv = app_api._score_chunk(chunk, _worker["bundle"], _worker["threshold"], offset)
+    path = _part_path(out_dir, idx)
+    # Écriture atomique : une part présente est toujours complète
+    with open(path + ".tmp", "w") as f:
+        f.write(csv)
+    os.replace(path + ".tmp", path)
+    return idx, len(chunk)
+
+
+def _part_path(out_dir, idx):
+    return os.path.join(out_dir, f"part-{idx:05d}.csv")
+
+
+def _check_manifest(out_dir, manifest):
+    """Refuse de reprendre un run lancé avec d'autres paramètres."""
+    path = os.path.join(out_dir, MANIFEST)
+    if os.path.exists(path):
+        with open(path) as f:
+            previous = json.load(f)
+        if previous != manifest:
+            raise SystemExit(
+                f"❌ {out_dir} contient un run différent ({previous}) — "
+                "changez --output-dir ou supprimez ce dossier."
+            )
+    else:
+        with open(path, "w") as f:
+            json.dump(manifest, f, indent=2)
+
+
+def _merge(out_dir, n_parts, output):
+    with open(output + ".tmp", "w") as out:
+        out.write(HEADER)
+        for idx in range(n_parts):
+            with open(_part_path(out_dir, idx)) as f:
+                out.write(f.read())
+    os.replace(output + ".tmp", output)
+
+
+def run(input_path, output_dir=None, output=None, chunk_rows=100_000,
+        workers=None, model_path=None, threshold=None):
+    """
+    Score `input_path` bloc par bloc sur un pool de processus.
+    Renvoie un résumé (lignes scorées, blocs repris, débit).
+    """
+    model_path = model_path or app_api.MODEL_PATH
+    threshold = app_api.SEUIL_METIER if threshold is None else threshold
+    workers = workers or os.cpu_count() or 1
+    output_dir = output_dir or os.path.splitext(input_path)[0] + "_scores"
+    os.makedirs(output_dir, exist_ok=True)
+
+    st = os.stat(input_path)
+    _check_manifest(output_dir, {
+        "input": os.path.abspath(input_path),
+        "input_size": st.st_size,
+        "input_mtime_ns": st.st_mtime_ns,
+        "model_sha256": file_sha256(model_path),
+        "threshold": threshold,
+        "chunk_rows": chunk_rows
+    })
+
+    t0 = time.perf_counter()
+    scored_rows = skipped_parts = 0
+    n_parts = offset = 0
+    max_in_flight = 2 * workers
+
+    with open(input_path, "rb") as f:
+        names, parts = _plan(f, input_path, chunk_rows)
+        missing = [c for c in app_api.FEATURE_NAMES if c not in names]
+        if missing:
+            raise SystemExit(f"❌ Colonnes manquantes dans {input_path} : {missing}")
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(model_path, threshold, os.path.abspath(input_path), names)
+        ) as pool:
+            pending = set()
+            for idx, (spec, n_rows) in enumerate(parts):
+                n_parts = idx + 1
+                if os.path.exists(_part_path(output_dir, idx)):
+                    # Bloc déjà terminé lors d'un run précédent : ni lu, ni parsé
+                    skipped_parts += 1
+                else:
+                    # Nombre de blocs en vol borné : la mémoire reste bornée
+                    if len(pending) >= max_in_flight:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        scored_rows += _report(done, t0, scored_rows)
+                    pending.add(pool.submit(_score_part, idx, spec, offset, output_dir))
+                offset += n_rows
+
+            done, _ = wait(pending)
+            scored_rows += _report(done, t0, scored_rows)
+
+    elapsed = time.perf_counter() - t0
+    if output:
+        _merge(output_dir, n_parts, output)
+
+    summary = {
+        "rows": offset,
+        "scored_rows": scored_rows,
+        "parts": n_parts,
+        "skipped_parts": skipped_parts,
+        "elapsed_s": elapsed,
+        "rows_per_s": scored_rows / elapsed if elapsed > 0 else 0.0,
+        "workers": workers,
+        "output_dir": output_dir,
+        "output": output
+    }
+    print(
+        f"✅ {scored_rows:,} lignes scorées en {elapsed:.1f}s "
+        f"({summary['rows_per_s']:,.0f} lignes/s, {workers} workers, "
+        f"{skipped_parts}/{n_parts} blocs repris)"
+    )
+    return summary
+
+
+def _report(done, t0, scored_before):
+    rows = sum(fut.result()[1] for fut in done)
+    total = scored_before + rows
+    elapsed = time.perf_counter() - t0
+    print(f"  … {total:,} lignes ({total / elapsed:,.0f} lignes/s)", file=sys.stderr)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scoring hors-ligne par blocs (pool de processus).")
+    parser.add_argument("input", help="fichier CSV, CSV.gz ou Parquet")
+    parser.add_argument("--output", help="fichier CSV final (concaténation des parts)")
+    parser.add_argument("--output-dir", help="dossier des parts (défaut : <input>_scores/)")
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=None, help="défaut : nombre de cœurs")
+    parser.add_argument("--model", default=None, help="défaut : app_api.MODEL_PATH")
+    parser.add_argument("--threshold", type=float, default=None, help="défaut : app_api.SEUIL_METIER")
+    args = parser.parse_args(argv)
+
+    return run(
+        args.input, output_dir=args.output_dir, output=args.output,
+        chunk_rows=args.chunk_rows, workers=args.workers,
+        model_path=args.model, threshold=args.threshold
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+import sys
+import os
+import tempfile
+
+# Caches Feather des CSV de test hors du dépôt (cf. dataset_cache)
+os.environ.setdefault("DATASET_CACHE_DIR", tempfile.mkdtemp(prefix="dataset_cache_"))
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app_api
+
+# Sans `with TestClient(app)`, le lifespan (chargement en arrière-plan)
+# ne tourne pas : on charge le modèle de façon synchrone pour les tests.
+app_api.load_model()
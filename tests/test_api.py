@@ -30,4 +30,533 @@ def test_prediction_endpoint():
     response = client.post("/predict", json=test_data)
     
     # On s'assure que l'API n'envoie pas une erreur 500 (crash serveur)
-    assert response.status_code != 500
\ No newline at end of file
+    assert response.status_code != 500
+
+# Profil "Client_1" du front Streamlit (contrat API — 20 features)
+VALID_PAYLOAD = {
+    "AMT_ANNUITY": 280,
+    "AMT_CREDIT": 7000,
+    "AMT_GOODS_PRICE": 7000,
+    "AMT_INCOME_TOTAL": 2600 * 12,
+    "AMT_REQ_CREDIT_BUREAU_QRT": 0,
+    "AMT_REQ_CREDIT_BUREAU_YEAR": 0,
+    "CODE_GENDER_F": 1,
+    "DAYS_BIRTH": -38 * 365,
+    "DAYS_EMPLOYED": -12 * 365,
+    "DAYS_ID_PUBLISH": -3000,
+    "DAYS_LAST_PHONE_CHANGE": -800,
+    "DAYS_REGISTRATION": -7000,
+    "EXT_SOURCE_1": 0.80,
+    "EXT_SOURCE_2": 0.82,
+    "EXT_SOURCE_3": 0.78,
+    "HOUR_APPR_PROCESS_START": 9,
+    "NAME_CONTRACT_TYPE": 1,
+    "OWN_CAR_AGE": 8,
+    "REGION_POPULATION_RELATIVE": 0.012,
+    "TOTALAREA_MODE": 0.09
+}
+
+
+def test_batch_prediction_matches_single():
+    """
+    Vérifie que /predict/batch renvoie les mêmes probabilités que /predict,
+    dans l'ordre, et signale les lignes invalides individuellement.
+    """
+    risky = dict(VALID_PAYLOAD, EXT_SOURCE_1=0.1, EXT_SOURCE_2=0.1, EXT_SOURCE_3=0.1)
+    response = client.post(
+        "/predict/batch",
+        json=[VALID_PAYLOAD, {"SK_ID_CURR": 100001}, risky]
+    )
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body["n_rows"] == 3
+    assert body["n_errors"] == 1
+    assert "error" in body["results"][1]
+
+    for payload, result in zip([VALID_PAYLOAD, risky], [body["results"][0], body["results"][2]]):
+        single = client.post("/predict", json=payload).json()
+        assert result["probability"] == pytest.approx(single["probability"], abs=1e-12)
+        assert result["decision"] == single["decision"]
+
+
+def test_micro_batcher_coalesces_concurrent_rows():
+    """
+    Le micro-batcher regroupe les requêtes concurrentes en lots
+    d'au plus max_size lignes et renvoie à chacune sa propre probabilité.
+    """
+    import asyncio
+    import numpy as np
+    import app_api
+
+    rows = [
+        dict(VALID_PAYLOAD, EXT_SOURCE_2=v) for v in np.linspace(0.05, 0.95, 10)
+    ]
+    X = np.vstack([app_api._features_matrix([app_api.InputFeatures(**r)]) for r in rows])
+    expected = app_api._predict_matrix(X)
+
+    batcher = app_api.MicroBatcher(app_api._predict_matrix, max_size=4, max_wait_ms=50)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(X[i:i + 1]) for i in range(len(rows))))
+
+    probas = asyncio.run(run())
+
+    assert probas == pytest.approx(list(expected), abs=1e-12)
+    stats = batcher.stats()
+    assert stats["n_rows"] == 10
+    assert stats["n_batches"] == 3
+    assert stats["batch_size_histogram"]["4"] == 2
+
+
+def test_micro_batcher_scores_each_row_with_its_bundle():
+    """
+    Un lot mêlant deux bundles (rechargement à chaud entre deux
+    requêtes, version routée) est scoré par bundle, chaque ligne avec
+    le modèle de sa requête.
+    """
+    import asyncio
+    import numpy as np
+    import app_api
+
+    calls = []
+
+    def score(X, b):
+        calls.append((b, len(X)))
+        return np.full(len(X), b.threshold)
+
+    old, new = app_api.ModelBundle(*[None] * 5, threshold=0.2), app_api.ModelBundle(*[None] * 5, threshold=0.7)
+    batcher = app_api.MicroBatcher(score, max_size=4, max_wait_ms=50)
+
+    async def run():
+        return await asyncio.gather(*(
+            batcher.submit(np.zeros((1, 20)), b) for b in (old, new, old, new)
+        ))
+
+    assert asyncio.run(run()) == [0.2, 0.7, 0.2, 0.7]
+    assert calls == [(old, 2), (new, 2)]
+    assert batcher.stats()["n_batches"] == 1
+
+
+def test_prediction_cache_hits_and_invalidation(monkeypatch):
+    """
+    Un payload identique est servi depuis le cache ; un changement
+    de seuil métier vide le cache.
+    """
+    import app_api
+
+    cache = app_api.PredictionCache(8, 60, generation=app_api._cache_generation)
+    monkeypatch.setattr(app_api, "prediction_cache", cache)
+
+    first = client.post("/predict", json=VALID_PAYLOAD).json()
+    second = client.post("/predict", json=VALID_PAYLOAD).json()
+    assert second == first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Les entiers et leurs équivalents flottants partagent la même clé
+    assert client.post("/predict", json=dict(VALID_PAYLOAD, AMT_CREDIT=7000.0)).status_code == 200
+    assert cache.hits == 2
+
+    monkeypatch.setattr(app_api, "SEUIL_METIER", 0.5)
+    third = client.post("/predict", json=VALID_PAYLOAD).json()
+    assert third["threshold"] == 0.5
+    assert cache.invalidations == 1
+    assert cache.stats()["size"] == 1
+
+
+def test_health_probes(monkeypatch):
+    """
+    /health/live répond toujours ; /health/ready ne passe à 200
+    qu'une fois le warm-up terminé.
+    """
+    import app_api
+
+    ready = client.get("/health/ready")
+    assert ready.status_code == 200
+    assert ready.json()["warmup_latency_ms"] is not None
+
+    monkeypatch.setitem(app_api.MODEL_STATUS, "state", "loading")
+    assert client.get("/health/live").status_code == 200
+    assert client.get("/health/ready").status_code == 503
+
+
+def test_admin_reload_swaps_only_valid_models(monkeypatch):
+    """
+    /admin/reload exige le jeton ; un artefact incompatible avec le
+    contrat API est refusé et l'ancien modèle reste actif, un artefact
+    valide remplace le bundle courant.
+    """
+    import app_api
+
+    assert client.post("/admin/reload").status_code == 403
+    monkeypatch.setattr(app_api, "ADMIN_TOKEN", "secret")
+    assert client.post("/admin/reload", headers={"X-Admin-Token": "faux"}).status_code == 401
+    assert client.post(
+        "/admin/reload", params={"file": "../app_api.py"}, headers={"X-Admin-Token": "secret"}
+    ).status_code == 404
+
+    old = app_api.bundle
+    before = client.post("/predict", json=VALID_PAYLOAD).json()
+
+    # Modèle complet (≈ 180 features) : refusé par le canari
+    app_api.reload_model(os.path.join(app_api.MODELS_DIR, "pipeline_best_model.joblib"))
+    assert app_api.RELOAD_STATUS["state"] == "failed"
+    assert app_api.bundle is old
+
+    app_api.reload_model()
+    assert app_api.RELOAD_STATUS["state"] == "succeeded"
+    assert app_api.bundle is not old
+    assert app_api.bundle.signature == old.signature
+    assert client.post("/predict", json=VALID_PAYLOAD).json() == before
+
+    status = client.get("/admin/reload", headers={"X-Admin-Token": "secret"})
+    assert status.json()["reloads"] >= 1
+
+
+# Lecteur CSV non fermé : « I/O operation on closed file » au ramasse-miettes
+@pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+def test_stream_scoring_csv_and_parquet():
+    """
+    /predict/stream score un fichier par blocs (colonnes superflues
+    ignorées) et renvoie les mêmes probabilités que /predict/batch.
+    """
+    import io
+    import pandas as pd
+    import app_api
+
+    rows = [VALID_PAYLOAD, dict(VALID_PAYLOAD, EXT_SOURCE_3=0.05), dict(VALID_PAYLOAD, OWN_CAR_AGE=None)]
+    df = pd.DataFrame(rows)
+    df.insert(0, "SK_ID_CURR", [100001, 100002, 100003])
+    df["TARGET"] = 0
+
+    batch = client.post(
+        "/predict/batch", json=[{k: v for k, v in r.items() if v is not None} for r in rows[:2]]
+    ).json()["results"]
+
+    files = {"csv": ("clients.csv", df.to_csv(index=False).encode())}
+    if app_api.HAS_PYARROW:
+        buf = io.BytesIO()
+        df.to_parquet(buf, index=False)
+        files["parquet"] = ("clients.parquet", buf.getvalue())
+
+    for name, content in files.values():
+        response = client.post("/predict/stream", files={"file": (name, content)})
+        assert response.status_code == 200
+
+        out = pd.read_csv(io.StringIO(response.text))
+        assert list(out.columns) == ["SK_ID_CURR", "probability", "decision"]
+        assert out["SK_ID_CURR"].tolist() == [100001, 100002, 100003]
+        assert out["probability"].iloc[:2].tolist() == pytest.approx(
+            [r["probability"] for r in batch], abs=1e-12
+        )
+
+    missing = df.drop(columns=["EXT_SOURCE_1"]).to_csv(index=False).encode()
+    response = client.post("/predict/stream", files={"file": ("clients.csv", missing)})
+    assert response.status_code == 422
+
+
+def test_stream_response_closes_source_on_disconnect():
+    """Client déconnecté en cours d'envoi : la source du flux est tout de même fermée."""
+    import asyncio
+    import app_api
+
+    closed = []
+
+    def body():
+        yield "SK_ID_CURR,probability,decision\n"
+        yield "100001,0.1,0\n"
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            raise OSError("connexion fermée")
+
+    response = app_api._ClosingStreamingResponse(body(), lambda: closed.append(True))
+    scope = {"type": "http", "asgi": {"spec_version": "2.4"}}
+    with pytest.raises(Exception):
+        asyncio.run(response(scope, receive, send))
+    assert closed == [True]
+
+
+def test_explain_contributions_sum_to_prediction(monkeypatch):
+    """
+    /explain renvoie une contribution par feature ; base_value + somme
+    des contributions redonne la probabilité de /predict. La seconde
+    demande est servie par le cache, /explain/batch donne les mêmes valeurs.
+    """
+    import numpy as np
+    import app_api
+
+    cache = app_api.PredictionCache(8, 60, generation=app_api._cache_generation)
+    monkeypatch.setattr(app_api, "explanation_cache", cache)
+
+    body = client.post("/explain", json=VALID_PAYLOAD).json()
+    assert list(body["contributions"]) == app_api.FEATURE_NAMES
+    raw = body["base_value"] + sum(body["contributions"].values())
+    assert 1 / (1 + np.exp(-raw)) == pytest.approx(body["probability"], abs=1e-9)
+
+    single = client.post("/predict", json=VALID_PAYLOAD).json()
+    assert body["probability"] == pytest.approx(single["probability"], abs=1e-9)
+    assert body["decision"] == single["decision"]
+
+    assert client.post("/explain", json=VALID_PAYLOAD).json() == body
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    batch = client.post("/explain/batch", json=[{"SK_ID_CURR": 1}, VALID_PAYLOAD]).json()
+    assert batch["n_errors"] == 1
+    assert batch["results"][1]["contributions"] == body["contributions"]
+
+
+def test_drift_monitor_fed_by_predictions(monkeypatch):
+    """
+    Les lignes scorées par /predict et /predict/batch alimentent le
+    monitor en arrière-plan ; /monitoring/drift renvoie PSI / KS par
+    feature une fois la référence constituée.
+    """
+    import numpy as np
+    import app_api
+
+    monitor = app_api.OnlineDriftMonitor(app_api.FEATURE_NAMES, reference_rows=20, window_rows=15)
+    monkeypatch.setattr(app_api, "drift_monitor", monitor)
+
+    rng = np.random.default_rng(0)
+    reference = [dict(VALID_PAYLOAD, EXT_SOURCE_2=float(v)) for v in rng.uniform(0.5, 0.9, 20)]
+    client.post("/predict", json=reference[0])
+    client.post("/predict/batch", json=reference[1:])
+    monitor.flush()
+    assert client.get("/monitoring/drift").json()["state"] == "ready"
+
+    shifted = [dict(VALID_PAYLOAD, EXT_SOURCE_2=float(v)) for v in rng.uniform(0.0, 0.3, 20)]
+    client.post("/predict/batch", json=shifted)
+    monitor.flush()
+
+    body = client.get("/monitoring/drift").json()
+    assert body["n_rows"] == 40
+    assert body["windows"] == 1
+    features = {r["feature"]: r for r in body["report"]["features"]}
+    assert set(features) == set(app_api.FEATURE_NAMES)
+    assert features["EXT_SOURCE_2"]["drift"] and features["EXT_SOURCE_2"]["psi"] > 1
+    assert features["AMT_CREDIT"]["reason"] == "constant_both"
+    assert body["report"]["prediction"]["n_live"] == 20
+
+
+def test_metrics_endpoint_exposes_stages_and_decisions():
+    """
+    /metrics expose, au format Prometheus, les requêtes, les durées par
+    étape de /predict et les décisions rendues au seuil métier.
+    """
+    import app_api
+
+    before = app_api.DECISIONS.value(decision="0") + app_api.DECISIONS.value(decision="1")
+    n_stage = app_api.STAGE_LATENCY.count(endpoint="/predict", stage="predict")
+    risky = dict(VALID_PAYLOAD, EXT_SOURCE_1=0.1, EXT_SOURCE_2=0.1, EXT_SOURCE_3=0.1)
+    client.post("/predict", json=dict(VALID_PAYLOAD, OWN_CAR_AGE=17))
+    client.post("/predict/batch", json=[VALID_PAYLOAD, risky, {"SK_ID_CURR": 1}])
+
+    after = app_api.DECISIONS.value(decision="0") + app_api.DECISIONS.value(decision="1")
+    assert after - before == 3
+    assert app_api.STAGE_LATENCY.count(endpoint="/predict", stage="predict") == n_stage + 1
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    for stage in ("validation", "build", "predict", "serialization"):
+        assert f'predict_stage_duration_seconds_count{{endpoint="/predict",stage="{stage}"}}' in text
+    assert 'http_requests_total{endpoint="/predict",method="POST",status="200"}' in text
+    assert 'predict_stage_duration_seconds_bucket{endpoint="/predict/batch",stage="build",le="+Inf"}' in text
+    assert 'predict_invalid_rows_total{endpoint="/predict/batch"}' in text
+    assert "predict_threshold 0.29" in text
+    assert "model_load_time_seconds" in text
+
+
+def test_admin_profile_dumps_sampled_stacks(monkeypatch):
+    """
+    Profilage à la demande : les requêtes tirées au sort sont
+    échantillonnées, les piles sont servies en collapsed et speedscope
+    (endpoint protégé), avec le surcoût mesuré.
+    """
+    import app_api
+
+    assert client.get("/admin/profile").status_code == 403
+    monkeypatch.setattr(app_api, "ADMIN_TOKEN", "secret")
+    headers = {"X-Admin-Token": "secret"}
+    assert client.post("/admin/profile", params={"rate": 1}).status_code == 401
+    assert client.post("/admin/profile", params={"rate": 2}, headers=headers).status_code == 422
+
+    client.post("/admin/profile", params={"rate": 1, "reset": True}, headers=headers)
+    try:
+        rows = [dict(VALID_PAYLOAD, EXT_SOURCE_1=i / 2000) for i in range(2000)]
+        for _ in range(20):
+            client.post("/predict/batch", json=rows)
+            client.post("/predict", json=VALID_PAYLOAD)
+            if app_api.profiler.samples:
+                break
+    finally:
+        client.post("/admin/profile", params={"rate": 0}, headers=headers)
+
+    stats = client.get("/admin/profile", params={"format": "stats"}, headers=headers).json()
+    assert stats["requests"] >= 2 and stats["samples"] > 0
+    assert 0 <= stats["overhead_ratio"] <= 1
+
+    collapsed = client.get("/admin/profile", headers=headers)
+    assert collapsed.status_code == 200
+    assert "X-Profile-Overhead-Ratio" in collapsed.headers
+    lines = collapsed.text.splitlines()
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("predict_batch (app_api.py" in line for line in lines)
+
+    scope = client.get("/admin/profile", params={"format": "speedscope", "reset": True}, headers=headers).json()
+    profile = scope["profiles"][0]
+    assert profile["type"] == "sampled"
+    assert len(profile["samples"]) == len(profile["weights"]) == len(lines)
+    assert all(0 <= i < len(scope["shared"]["frames"]) for s in profile["samples"] for i in s)
+    assert app_api.profiler.samples == 0
+
+
+def test_audit_log_records_every_decision(monkeypatch, tmp_path):
+    """
+    Chaque décision de /predict et /predict/batch est journalisée avec
+    ses features, sa probabilité, le seuil et la version du modèle.
+    """
+    import app_api
+    import audit_log
+
+    log = audit_log.AuditLog(tmp_path, app_api.FEATURE_NAMES, flush_interval=0.01)
+    monkeypatch.setattr(app_api, "audit_log", log)
+
+    single = client.post("/predict", json=VALID_PAYLOAD).json()
+    batch = client.post("/predict/batch", json=[VALID_PAYLOAD, {"SK_ID_CURR": 1}]).json()
+    log.flush()
+
+    day = os.path.basename(os.path.dirname(log.stats()["current_file"]))
+    df = audit_log.read_day(tmp_path, day)
+    assert df["endpoint"].tolist() == ["/predict", "/predict/batch"]
+    assert df["probability"].tolist() == pytest.approx(
+        [single["probability"], batch["results"][0]["probability"]]
+    )
+    assert (df["model_version"] == app_api.bundle.signature).all()
+    assert (df["threshold"] == app_api.SEUIL_METIER).all()
+    assert df["AMT_CREDIT"].tolist() == [VALID_PAYLOAD["AMT_CREDIT"]] * 2
+    assert client.get("/stats").json()["audit_log"]["records"] == 2
+
+
+def test_predict_routes_to_registry_versions(monkeypatch, tmp_path):
+    """
+    /predict?model=... sert une version du registre avec son propre
+    seuil ; les versions sont chargées à la demande, au plus
+    MODEL_POOL_SIZE résidentes (LRU).
+    """
+    import app_api
+    import model_registry
+
+    registry = model_registry.ModelRegistry.load(model_registry.manifest_path(str(tmp_path)))
+    registry.register(app_api.MODEL_PATH, "strict", 0.01)
+    registry.register(app_api.MODEL_PATH, "lenient", 0.99)
+    registry.register(app_api.MODEL_PATH, "wide", 0.5, features=[f"f{i}" for i in range(138)])
+    registry.save()
+    monkeypatch.setattr(app_api, "MODEL_REGISTRY_PATH", registry.path)
+    pool = app_api.ModelPool(1, app_api._load_version)
+    monkeypatch.setattr(app_api, "model_pool", pool)
+
+    default = client.post("/predict", json=VALID_PAYLOAD).json()
+    strict = client.post("/predict", params={"model": "strict"}, json=VALID_PAYLOAD).json()
+    assert strict["probability"] == pytest.approx(default["probability"])
+    assert (strict["threshold"], strict["decision"], strict["model_version"]) == (0.01, 1, "strict")
+
+    lenient = client.post("/predict/batch", params={"model": "lenient"}, json=[VALID_PAYLOAD]).json()
+    assert lenient["threshold"] == 0.99 and lenient["results"][0]["decision"] == 0
+    client.post("/predict", params={"model": "lenient"}, json=VALID_PAYLOAD)
+    assert pool.stats() == {"size": 1, "resident": ["lenient"], "hits": 1, "loads": 2, "evictions": 1}
+
+    assert client.post("/predict", params={"model": "nope"}, json=VALID_PAYLOAD).status_code == 404
+    assert client.post("/predict", params={"model": "wide"}, json=VALID_PAYLOAD).status_code == 422
+
+    listing = client.get("/models").json()
+    assert {v["version"]: v["compatible"] for v in listing["versions"]} == {
+        "strict": True, "lenient": True, "wide": False
+    }
+
+    # Explications et flux routés : même seuil que /predict?model=...,
+    # sans passer par le cache des explications
+    cache = app_api.PredictionCache(8, 60, generation=app_api._cache_generation)
+    monkeypatch.setattr(app_api, "explanation_cache", cache)
+    explained = client.post("/explain", params={"model": "lenient"}, json=VALID_PAYLOAD).json()
+    assert (explained["threshold"], explained["decision"], explained["model_version"]) == (0.99, 0, "lenient")
+    assert explained["probability"] == pytest.approx(default["probability"])
+    batch = client.post("/explain/batch", params={"model": "strict"}, json=[VALID_PAYLOAD]).json()
+    assert (batch["threshold"], batch["model_version"], batch["results"][0]["decision"]) == (0.01, "strict", 1)
+    assert (cache.hits, cache.misses, len(cache._data)) == (0, 0, 0)
+    csv = ",".join(VALID_PAYLOAD) + "\n" + ",".join(map(str, VALID_PAYLOAD.values())) + "\n"
+    streamed = client.post("/predict/stream", params={"model": "strict"}, files={"file": ("c.csv", csv.encode())})
+    assert streamed.headers["X-Model-Version"] == "strict"
+    assert streamed.text.splitlines()[1].endswith(",1")
+
+
+def test_reload_to_registered_version_uses_its_threshold(monkeypatch, tmp_path):
+    """
+    Rechargement à chaud vers un artefact du registre : /predict annonce
+    la version et applique son seuil, identique à /predict?model=...
+    (servi par le bundle courant, sans second chargement).
+    """
+    import app_api
+    import model_registry
+
+    registry = model_registry.ModelRegistry.load(model_registry.manifest_path(str(tmp_path)))
+    registry.register(app_api.MODEL_PATH, "v2", 0.01)
+    registry.save()
+    monkeypatch.setattr(app_api, "_registry", app_api._registry)
+    monkeypatch.setattr(app_api, "MODEL_REGISTRY_PATH", registry.path)
+    pool = app_api.ModelPool(1, app_api._load_version)
+    monkeypatch.setattr(app_api, "model_pool", pool)
+
+    old = app_api.bundle
+    # Bundle par défaut restauré en fin de test
+    monkeypatch.setattr(app_api, "bundle", old)
+    app_api.reload_model(app_api.MODEL_PATH)
+    assert app_api.RELOAD_STATUS["state"] == "succeeded"
+    assert (app_api.bundle.version, app_api.bundle.threshold) == ("v2", 0.01)
+
+    default = client.post("/predict", json=VALID_PAYLOAD).json()
+    routed = client.post("/predict", params={"model": "v2"}, json=VALID_PAYLOAD).json()
+    assert (default["model_version"], default["threshold"], default["decision"]) == ("v2", 0.01, 1)
+    assert routed == default
+    assert pool.stats()["loads"] == 0
+    assert app_api._cache_generation() == (old.signature, 0.01)
+    assert "predict_threshold 0.01" in client.get("/metrics").text
+
+
+def test_audit_backpressure_does_not_block_event_loop(monkeypatch, tmp_path):
+    """
+    File d'audit pleine en mode "block" : /predict attend dans le
+    threadpool, /health/live continue de répondre immédiatement.
+    """
+    import threading
+    import time
+    import numpy as np
+    import app_api
+    import audit_log
+
+    log = audit_log.AuditLog(tmp_path, app_api.FEATURE_NAMES, queue_size=1, block_timeout=1.0)
+    start = log._start
+    log._start = lambda: None  # pas d'écrivain : la file reste pleine
+    log.submit(np.zeros((1, len(app_api.FEATURE_NAMES))), np.array([0.5]), 0.29, "v", "/predict")
+    monkeypatch.setattr(app_api, "audit_log", log)
+
+    with TestClient(app) as c:
+        try:
+            c.post("/predict", json=VALID_PAYLOAD)  # modèle prêt, cache chaud
+            slow = threading.Thread(target=c.post, args=("/predict",), kwargs={"json": VALID_PAYLOAD})
+            slow.start()
+            time.sleep(0.2)
+            t0 = time.perf_counter()
+            assert c.get("/health/live").status_code == 200
+            assert time.perf_counter() - t0 < 0.5
+            slow.join()
+            assert log.dropped == 2
+        finally:
+            # Écrivain relancé : la file se vide avant l'arrêt (lifespan)
+            log._start = start
+            log._start()
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import audit_log as al
+
+
+FEATURES = ["A", "B"]
+
+
+def test_audit_log_roundtrip_rotation_and_truncated_tail(tmp_path):
+    """
+    Les décisions déposées sont relues telles quelles (NaN -> null) ;
+    la rotation par taille crée plusieurs fichiers du même jour, et un
+    dernier membre gzip tronqué n'empêche pas la lecture.
+    """
+    log = al.AuditLog(tmp_path, FEATURES, flush_interval=0.01, rotate_bytes=1)
+    X = np.array([[1.0, np.nan], [2.5, 3.0], [4.0, 5.0]])
+    log.submit(X[:2], np.array([0.1, 0.5]), 0.29, "abc123", "/predict/batch")
+    log.flush()
+    log.submit(X[2:], np.array([0.2]), 0.29, "def456", "/predict")
+    log.flush()
+
+    assert log.records == 3 and log.files == 2 and log.dropped == 0
+    day = os.path.basename(os.path.dirname(log.stats()["current_file"]))
+    files = al.day_files(tmp_path, day)
+    assert len(files) == 2
+
+    df = al.read_day(tmp_path, day)
+    assert list(df.columns[:6]) == al.META_COLUMNS
+    assert df["probability"].tolist() == [0.1, 0.5, 0.2]
+    assert df["decision"].tolist() == [0, 1, 0]
+    assert df["A"].tolist() == [1.0, 2.5, 4.0]
+    assert np.isnan(df["B"].iloc[0]) and df["B"].iloc[1] == 3.0
+    assert (al.read_day(tmp_path, day, model_version="abc")["model_version"] == "abc123").all()
+
+    # Paquet à moitié écrit (arrêt brutal) : seul ce paquet est perdu
+    with open(files[-1], "rb") as f:
+        data = f.read()
+    with open(files[-1], "ab") as f:
+        f.write(data[: len(data) // 2])
+    assert len(al.read_day(tmp_path, day)) == 3
+
+
+def test_audit_log_backpressure_modes(tmp_path):
+    """File pleine : "drop" perd et compte sans attendre, "block" attend au plus block_timeout."""
+    with pytest.raises(ValueError):
+        al.AuditLog(tmp_path, FEATURES, backpressure="ignore")
+
+    for mode in ("drop", "block"):
+        log = al.AuditLog(tmp_path, FEATURES, backpressure=mode, queue_size=1, block_timeout=0.01)
+        log._start = lambda: None  # pas d'écrivain : la file reste pleine
+        log.submit(np.ones((1, 2)), np.array([0.5]), 0.29, "v", "/predict")
+        log.submit(np.ones((2, 2)), np.array([0.5, 0.6]), 0.29, "v", "/predict")
+        assert log.dropped == 2
+        assert log.stats()["queued"] == 1
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+import sys
+import os
+
+from sklearn.metrics import confusion_matrix
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from business_cost import DEFAULT_THRESHOLDS, business_cost_with_best_threshold, cost_curve
+
+
+def _naive(y_true, y_proba, thresholds, cost_fp=1, cost_fn=10):
+    """Boucle historique du notebook (un confusion_matrix par seuil)."""
+    best_cost, best_threshold, best_cm = np.inf, None, None
+    for t in thresholds:
+        cm = confusion_matrix(y_true, (y_proba >= t).astype(int), labels=[0, 1])
+        tn, fp, fn, tp = cm.ravel()
+        cost = cost_fp * fp + cost_fn * fn
+        if cost < best_cost:
+            best_cost, best_threshold, best_cm = cost, t, cm
+    return best_cost, best_threshold, best_cm
+
+
+@pytest.mark.parametrize("cost_fp, cost_fn", [(1, 10), (3, 2)])
+def test_vectorized_search_matches_naive_loop(cost_fp, cost_fn):
+    rng = np.random.default_rng(0)
+    y = (rng.random(5000) < 0.08).astype(int)
+    # Probabilités arrondies : beaucoup d'égalités avec la grille
+    proba = np.round(np.clip(0.3 * y + rng.beta(2, 6, y.size), 0, 1), 2)
+
+    # Grille du notebook : pas de 0.01, le seuil métier 0.29 en fait partie
+    grid = np.linspace(0.01, 0.99, 99)
+    np.testing.assert_array_equal(DEFAULT_THRESHOLDS, grid)
+    assert np.isclose(grid, 0.29).any()
+    expected = _naive(y, proba, grid, cost_fp, cost_fn)
+    cost, threshold, cm = business_cost_with_best_threshold(y, proba, cost_fp, cost_fn)
+    assert cost == expected[0]
+    assert threshold == expected[1]
+    np.testing.assert_array_equal(cm, expected[2])
+
+    # Optimum exact : identique à la boucle sur toutes les probabilités distinctes
+    exact_grid = np.append(np.unique(proba), np.nextafter(proba.max(), np.inf))
+    expected = _naive(y, proba, exact_grid, cost_fp, cost_fn)
+    cost, threshold, cm = business_cost_with_best_threshold(
+        y, proba, cost_fp, cost_fn, thresholds="exact"
+    )
+    assert (cost, threshold) == expected[:2]
+    np.testing.assert_array_equal(cm, expected[2])
+
+
+def test_cost_curve_custom_grid():
+    y = np.array([0, 0, 1, 1])
+    proba = np.array([0.1, 0.6, 0.4, 0.9])
+    thresholds, fp, fn, cost = cost_curve(y, proba, thresholds=[0.0, 0.5, 1.0])
+    np.testing.assert_array_equal(fp, [2, 1, 0])
+    np.testing.assert_array_equal(fn, [0, 1, 2])
+    np.testing.assert_array_equal(cost, [2, 11, 20])
+
+
+def test_business_scoring_in_grid_search():
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import GridSearchCV, StratifiedKFold
+    from business_cost import business_cost_scorer, business_scoring, min_business_cost
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 3))
+    y = (X[:, 0] + rng.normal(size=600) > 1.2).astype(int)
+
+    model = LogisticRegression().fit(X, y)
+    assert business_cost_scorer(model, X, y) == -min_business_cost(y, model.predict_proba(X)[:, 1])
+
+    search = GridSearchCV(
+        LogisticRegression(), {"C": [0.01, 1.0]},
+        scoring=business_scoring(), refit="business_cost",
+        cv=StratifiedKFold(3, shuffle=True, random_state=0)
+    ).fit(X, y)
+    res = search.cv_results_
+    assert search.best_index_ == int(np.argmax(res["mean_test_business_cost"]))
+    assert (res["mean_test_business_cost"] < 0).all()
+    assert ((res["mean_test_business_threshold"] > 0) & (res["mean_test_business_threshold"] < 1)).all()
+    assert "mean_test_roc_auc" in res
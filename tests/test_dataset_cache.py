@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app_api
+import dataset_cache
+
+
+def test_dataset_cache_types_subsets_and_refresh(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 1000
+    df = pd.DataFrame({
+        "SK_ID_CURR": np.arange(100000, 100000 + n),
+        "TARGET": (rng.random(n) < 0.1).astype(int),
+        "CNT_CHILDREN": rng.integers(0, 5, n),
+        "NAME_CONTRACT": rng.choice(["Cash loans", "Revolving loans"], n),
+    })
+    for name in app_api.FEATURE_NAMES:
+        col = rng.normal(size=n)
+        col[rng.random(n) < 0.2] = np.nan
+        df[name] = col
+    df.loc[::7, "CNT_CHILDREN"] = np.nan
+    source = str(tmp_path / "app_train.csv")
+    df.to_csv(source, index=False)
+    cache_dir = str(tmp_path / "cache")
+
+    loaded = dataset_cache.load_dataset(source, cache_dir=cache_dir)
+    assert os.path.exists(dataset_cache.cache_path(source, cache_dir))
+    assert loaded["TARGET"].dtype == np.int8
+    assert loaded["SK_ID_CURR"].dtype == np.int32
+    assert loaded["CNT_CHILDREN"].dtype == np.float32
+    assert loaded["NAME_CONTRACT"].dtype == "category"
+    assert loaded["EXT_SOURCE_2"].dtype == np.float32
+    np.testing.assert_allclose(loaded["EXT_SOURCE_2"], df["EXT_SOURCE_2"], rtol=1e-6)
+    assert loaded["EXT_SOURCE_2"].isna().sum() == df["EXT_SOURCE_2"].isna().sum()
+
+    # Par défaut, DataFrame modifiable en place (imputation du notebook)
+    loaded.loc[0, "EXT_SOURCE_2"] = 0.5
+    loaded["CNT_CHILDREN"] = loaded["CNT_CHILDREN"].fillna(0)
+    loaded.fillna({"EXT_SOURCE_1": 0.0}, inplace=True)
+    # memory_map=True : sans copie, en lecture seule (opt-in explicite)
+    mapped = dataset_cache.load_dataset(source, cache_dir=cache_dir, memory_map=True)
+    assert not mapped["EXT_SOURCE_2"].to_numpy().flags.writeable
+
+    # Sous-ensembles de colonnes
+    api = dataset_cache.load_dataset(source, columns="api", cache_dir=cache_dir)
+    assert list(api.columns) == app_api.FEATURE_NAMES
+    assert list(dataset_cache.load_dataset(source, ["TARGET"], cache_dir).columns) == ["TARGET"]
+
+    # Source modifiée : le cache est reconstruit
+    df.iloc[:10].to_csv(source, index=False)
+    assert len(dataset_cache.load_dataset(source, cache_dir=cache_dir)) == 10
@@ -0,0 +1,96 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scipy.stats import ks_2samp
+
+import drift_monitoring as dm
+
+
+def test_sketch_ks_psi_and_merge():
+    """
+    Le KS calculé sur histogrammes approche ks_2samp ; une fenêtre
+    alimentée en deux morceaux puis fusionnée égale la fenêtre entière.
+    """
+    rng = np.random.default_rng(0)
+    ref_values = rng.normal(size=50_000)
+    live_values = rng.normal(0.1, 1.0, size=20_000)
+    live_values[::10] = np.nan
+
+    ref = dm.HistogramSketch.from_quantiles(ref_values, bins=50).update(ref_values)
+    live = ref.empty_like().update(live_values)
+
+    exact = ks_2samp(ref_values, live_values[~np.isnan(live_values)])
+    assert dm.ks_statistic(ref, live) == pytest.approx(exact.statistic, abs=0.01)
+    assert dm.ks_statistic(ref, live) <= exact.statistic + 1e-12
+    assert dm.compare_sketches(ref, live)["drift"]
+    assert dm.compare_sketches(ref, live)["missing_live"] == pytest.approx(0.1)
+    assert dm.psi(ref, ref) == pytest.approx(0.0)
+    assert dm.psi(ref, live) > 0.01
+
+    same = ref.empty_like().update(rng.normal(size=20_000))
+    assert not dm.compare_sketches(ref, same)["drift"]
+
+    halves = ref.empty_like().update(live_values[:7000]).merge(ref.empty_like().update(live_values[7000:]))
+    assert halves.counts.tolist() == live.counts.tolist()
+    assert halves.n_missing == live.n_missing
+    assert halves.variance == pytest.approx(np.nanvar(live_values), rel=1e-12)
+    with pytest.raises(ValueError):
+        ref.merge(dm.HistogramSketch([0.0]))
+
+
+def test_reason_codes_match_notebook():
+    """Codes du notebook : constant_train / constant_test / low_variance."""
+    ref = dm.HistogramSketch([0.0])
+    spread = np.array([-1.0, 0.0, 1.0]) * 1e6
+    assert dm.reason_code(ref.empty_like().update([1.0, 1.0]), ref.empty_like().update([1.0])) == "constant_both"
+    assert dm.reason_code(ref.empty_like().update([1.0, 1.0]), ref.empty_like().update(spread)) == "constant_train"
+    assert dm.reason_code(ref.empty_like().update(spread), ref.empty_like().update([2.0])) == "constant_test"
+    # Fenêtre live quasi constante au regard de la dispersion de la référence
+    tiny = 5e5 + np.array([0.0, 1e-3, 2e-3])
+    assert dm.reason_code(ref.empty_like().update(spread), ref.empty_like().update(tiny)) == "low_variance"
+    assert dm.reason_code(ref.empty_like().update(spread), ref.empty_like().update(spread / 2)) == "ks_test"
+    assert dm.reason_code(ref.empty_like(), ref.empty_like().update(spread)) == "empty_sample"
+
+    # Profil enregistré sans moments : variance inconnue, test KS
+    old = {k: v for k, v in ref.empty_like().update(spread).to_dict().items() if k not in ("mean", "m2")}
+    assert np.isnan(dm.HistogramSketch.from_dict(old).variance)
+    assert dm.reason_code(dm.HistogramSketch.from_dict(old), ref.empty_like().update(tiny)) == "ks_test"
+
+
+def test_profile_report_html_json_and_persistence(tmp_path):
+    """
+    Un profil de référence rechargé depuis JSON produit le même rapport ;
+    HTML et JSON sont générés à partir des seuls histogrammes.
+    """
+    rng = np.random.default_rng(1)
+    ref_df = pd.DataFrame({"A": rng.normal(size=5000), "B": rng.integers(0, 3, 5000), "C": np.ones(5000)})
+    live_df = pd.DataFrame({"A": rng.normal(1.0, 1.0, 3000), "B": rng.integers(0, 3, 3000), "C": np.ones(3000)})
+    ref_scores, live_scores = rng.beta(2, 8, 5000), rng.beta(2, 6, 3000)
+
+    reference = dm.DriftProfile.fit(ref_df, ref_scores, target=rng.random(5000) < 0.08)
+    live = dm.profile_chunks(
+        ((live_df.iloc[i:i + 1000], (rng.random(1000) < 0.08)) for i in range(0, 3000, 1000)),
+        reference=reference, score_fn=lambda X: live_scores[X.index]
+    )
+    reference.save(str(tmp_path / "reference.json"))
+    reloaded = dm.DriftProfile.load(str(tmp_path / "reference.json"))
+
+    report = dm.drift_report(reloaded, live)
+    assert report == dm.drift_report(reference, live)
+    by_feature = {r["feature"]: r for r in report["features"]}
+    assert by_feature["A"]["drift"] and not by_feature["B"]["drift"]
+    assert by_feature["C"]["reason"] == "constant_both"
+    assert report["features"][0]["feature"] == "A"
+    assert report["prediction"]["drift"]
+    assert report["target"]["n_live"] == 3000
+
+    dm._save_outputs(report, str(tmp_path / "drift.html"), str(tmp_path / "drift.json"))
+    assert "Feature Drift" in (tmp_path / "drift.html").read_text(encoding="utf-8")
+    with open(tmp_path / "drift.json") as f:
+        assert json.load(f)["n_drift"] == report["n_drift"]
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app_api
+from fast_scorer import FastScorer
+
+
+@pytest.mark.skipif(app_api.bundle is None, reason="modèle non disponible")
+@pytest.mark.parametrize("n_rows", [1, 16, 2000])
+def test_fast_scorer_parity_with_pipeline(n_rows):
+    """
+    Le scorer NumPy doit reproduire model.predict_proba à 1e-6 près,
+    y compris avec des valeurs manquantes (imputation médiane).
+    """
+    model = app_api.bundle.pipe
+    scorer = FastScorer.from_pipeline(model, app_api.FEATURE_NAMES)
+
+    rng = np.random.default_rng(42)
+    X = np.empty((n_rows, len(app_api.FEATURE_NAMES)))
+    X[:, scorer.col_idx] = scorer.statistics + scorer.scale * rng.normal(0, 1.5, X.shape)
+    X[rng.random(X.shape) < 0.1] = np.nan
+
+    expected = model.predict_proba(
+        pd.DataFrame(X, columns=app_api.FEATURE_NAMES)
+    )[:, 1]
+
+    np.testing.assert_allclose(scorer.predict_proba(X), expected, rtol=0, atol=1e-6)
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lightgbm import LGBMClassifier
+from sklearn.pipeline import Pipeline
+
+import app_api
+from fast_scorer import FastScorer
+from float32_preprocess import Float32Preprocessor, lgb_dataset
+from training import make_preprocess
+
+
+def _frame(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, len(app_api.FEATURE_NAMES))) * 50 + 10,
+                     columns=app_api.FEATURE_NAMES)
+    X[rng.random(X.shape) < 0.1] = np.nan
+    y = (np.nan_to_num(X["EXT_SOURCE_2"]) + rng.normal(0, 40, n) > 40).astype(int)
+    return X, y
+
+
+def test_float32_preprocess_matches_column_transformer_in_place():
+    X, _ = _frame()
+    cols = app_api.FEATURE_NAMES[::-1][:12]
+    expected = make_preprocess(cols).fit(X).transform(X)
+    pre = Float32Preprocessor(cols).fit(X)
+    out = pre.transform(X)
+    assert out.dtype == np.float32 and out.flags.c_contiguous
+    np.testing.assert_allclose(out, expected, atol=1e-5)
+    assert list(pre.get_feature_names_out()) == cols
+
+    # copy=False : tableau float32 C-contigu transformé sur place
+    Xa = np.ascontiguousarray(X.to_numpy(np.float32))
+    inplace = Float32Preprocessor(copy=False).fit(Xa)
+    assert inplace.transform(Xa) is Xa
+    assert lgb_dataset(Xa, np.zeros(len(Xa))).construct().num_data() == len(Xa)
+
+
+def test_fast_scorer_supports_float32_pipeline():
+    X, y = _frame()
+    pipe = Pipeline([
+        ("preprocess", make_preprocess(app_api.FEATURE_NAMES, float32=True)),
+        ("clf", LGBMClassifier(n_estimators=40, verbose=-1))
+    ]).fit(X, y)
+    scorer = FastScorer.from_pipeline(pipe, app_api.FEATURE_NAMES)
+    assert scorer.dtype == np.float32
+
+    X_test, _ = _frame(n=300, seed=1)
+    expected = pipe.predict_proba(X_test)[:, 1]
+    for n in (1, 16, 300):
+        np.testing.assert_allclose(scorer.predict_proba(X_test.to_numpy()[:n]), expected[:n], atol=1e-9)
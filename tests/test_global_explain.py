@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+import pandas as pd
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+
+import app_api
+import global_explain
+
+client = TestClient(app_api.app)
+
+# Features qui varient dans la population synthétique (les autres : WARMUP_CLIENT)
+VARIED = ["AMT_CREDIT", "DAYS_BIRTH", "EXT_SOURCE_1", "EXT_SOURCE_2", "EXT_SOURCE_3"]
+
+
+def test_global_summary_build_and_endpoints(tmp_path, monkeypatch):
+    """
+    Le résumé construit hors-ligne est servi par /explain/global ;
+    les quantiles d'une feature encadrent les contributions de /explain.
+    """
+    rng = np.random.default_rng(0)
+    n = 300
+    base = app_api.WARMUP_CLIENT
+    df = pd.DataFrame({name: np.full(n, base[name]) for name in app_api.FEATURE_NAMES})
+    for name in VARIED:
+        df[name] = base[name] * (1 + 0.3 * rng.normal(size=n))
+    df.insert(0, "SK_ID_CURR", np.arange(n))
+    data = str(tmp_path / "app_train.csv")
+    df.to_csv(data, index=False)
+
+    output = str(tmp_path / "top20.explain.npz")
+    monkeypatch.setattr(app_api, "GLOBAL_EXPLAIN_PATH", output)
+    assert client.get("/explain/global").status_code == 503
+
+    global_explain.save_summary(global_explain.build_summary(app_api.MODEL_PATH, data, sample=200), output)
+
+    body = client.get("/explain/global").json()
+    assert body["n_rows"] == 200
+    ranks = [f["rank"] for f in body["features"]]
+    assert ranks == list(range(1, 21))
+    mean_abs = [f["mean_abs_shap"] for f in body["features"]]
+    assert mean_abs == sorted(mean_abs, reverse=True)
+
+    feature = body["features"][0]["feature"]
+    full = client.get(f"/explain/global/{feature}").json()
+    assert len(full["quantiles"]) == len(global_explain.LEVELS)
+    assert full["quantiles"] == sorted(full["quantiles"])
+
+    sliced = client.get(f"/explain/global/{feature}", params={"levels": [0.05, 0.5, 0.95]}).json()
+    assert sliced["levels"] == pytest.approx([0.05, 0.5, 0.95])
+    assert sliced["quantiles"] == [full["quantiles"][i] for i in (5, 50, 95)]
+
+    # Contribution d'un client de la population : dans [min, max] du résumé
+    row = dict(base, **{name: float(df.at[0, name]) for name in VARIED})
+    contrib = client.post("/explain", json=row).json()["contributions"][feature]
+    assert full["quantiles"][0] - 1e-6 <= contrib <= full["quantiles"][-1] + 1e-6
+
+    assert client.get("/explain/global/INCONNUE").status_code == 404
+
+    # Version du registre : le modèle par défaut partage son résumé
+    assert client.get("/explain/global", params={"model": app_api._get_registry().default}).json() == body
+    assert client.get("/explain/global", params={"model": "inconnue"}).status_code == 404
+
+    # Fichier reconstruit : relu au contrôle suivant seulement (pas d'os.stat par requête)
+    monkeypatch.setattr(app_api, "GLOBAL_EXPLAIN_CHECK_S", 3600)
+    global_explain.save_summary(global_explain.build_summary(app_api.MODEL_PATH, data, sample=100), output)
+    assert client.get("/explain/global").json()["n_rows"] == 200
+    monkeypatch.setattr(app_api, "GLOBAL_EXPLAIN_CHECK_S", 0)
+    assert client.get("/explain/global").json()["n_rows"] == 100
+
+    # Résumé d'un autre modèle : refusé
+    monkeypatch.setattr(app_api.bundle, "signature", "autre")
+    assert client.get("/explain/global").status_code == 409
@@ -0,0 +1,44 @@
+import json
+import pytest
+import shutil
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import model_registry as mr
+
+ARTIFACT = os.path.join(mr.MODELS_DIR, "pipeline_best_model_top20.joblib")
+
+
+def test_register_copies_verifies_and_persists(tmp_path):
+    """
+    Un artefact hors du dossier du registre y est copié ; les features
+    sont lues dans le pipeline ; un artefact réécrit est refusé.
+    """
+    models = tmp_path / "models"
+    models.mkdir()
+    registry = mr.ModelRegistry.load(mr.manifest_path(str(models)))
+    assert registry.versions == {} and registry.default is None
+
+    entry = registry.register(ARTIFACT, "v1", 0.29, {"auc": 0.75})
+    registry.register(str(models / "v1.joblib"), "v1-strict", 0.5)
+    registry.save()
+    assert entry["artifact"] == "v1.joblib" and len(entry["features"]) == 20
+    assert entry["sha256"] == mr.file_sha256(ARTIFACT)
+    with pytest.raises(ValueError):
+        registry.register(ARTIFACT, "v1", 0.3)
+
+    reloaded = mr.ModelRegistry.load(registry.path)
+    assert reloaded.default == "v1"
+    assert reloaded.get("v1-strict")["threshold"] == 0.5
+    assert reloaded.find(entry["sha256"]) == "v1"
+    assert reloaded.verify("v1") == str(models / "v1.joblib")
+
+    with open(models / "v1.joblib", "ab") as f:
+        f.write(b"\0")
+    with pytest.raises(mr.ArtifactMismatch):
+        reloaded.verify("v1")
+    with pytest.raises(KeyError):
+        reloaded.get("v2")
+    assert json.loads((models / "registry.json").read_text())["default"] == "v1"
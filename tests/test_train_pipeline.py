@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import train_pipeline
+
+
+def _write_dataset(path, n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 12))
+    X[rng.random(X.shape) < 0.05] = np.nan
+    df = pd.DataFrame(X, columns=[f"F{i:02d}" for i in range(12)])
+    df.insert(0, "SK_ID_CURR", np.arange(n))
+    df["TARGET"] = (np.nan_to_num(X[:, 0] + X[:, 3]) + rng.normal(size=n) > 1.8).astype(int)
+    df.to_csv(path, index=False)
+
+
+def test_pipeline_recomputes_only_changed_stages(tmp_path):
+    data = str(tmp_path / "train.csv")
+    _write_dataset(data)
+    args = [data, "--cache-dir", str(tmp_path / "cache"), "--families", "log_reg", "lgbm",
+            "--top-k", "4", "--n-jobs", "1"]
+
+    first = train_pipeline.main(args)
+    assert set(first["stages"].values()) <= {"calculé", "ignoré"}
+    assert len(first["features"]) <= 4
+    proba = first["pipeline"].predict_proba(pd.read_csv(data)[first["features"]])[:, 1]
+    assert 0 < first["metrics"]["best_threshold"] < 1
+
+    # Rien n'a changé : tout est relu, le split n'est même pas rechargé
+    second = train_pipeline.main(args)
+    assert set(second["stages"].values()) <= {"cache", "ignoré"}
+    np.testing.assert_allclose(
+        second["pipeline"].predict_proba(pd.read_csv(data)[second["features"]])[:, 1], proba
+    )
+
+    # Nouveaux hyperparamètres d'une famille : seul son fit est recalculé
+    other = next(f for f in ("log_reg", "lgbm") if f != first["best_family"])
+    params = {"log_reg": {"clf__C": 0.05}, "lgbm": {"clf__n_estimators": 50}}[other]
+    third = train_pipeline.run_pipeline(
+        data, cache_dir=str(tmp_path / "cache"), families=["log_reg", "lgbm"],
+        params={other: params}, top_k=4, n_jobs=1
+    )
+    assert third["stages"][f"fit:{other}"] == "calculé"
+    assert third["stages"][f"fit:{first['best_family']}"] == "cache"
+    assert third["stages"]["data"] == third["stages"]["preprocess"] == "cache"
+
+    # Données modifiées : toute la chaîne est recalculée
+    _write_dataset(data, seed=1)
+    fourth = train_pipeline.main(args)
+    assert set(fourth["stages"].values()) <= {"calculé", "ignoré"}
+
+
+def test_explain_stage_uses_native_contributions(tmp_path):
+    data = str(tmp_path / "train.csv")
+    _write_dataset(data)
+    res = train_pipeline.run_pipeline(
+        data, cache_dir=str(tmp_path / "cache"), families=["lgbm"],
+        params={"lgbm": {"clf__n_estimators": 30}}, top_k=4, n_jobs=1
+    )
+    assert res["stages"]["explain"] == "calculé"
+    assert sorted(res["explain"]["feature"]) == res["features"]
+    assert (res["explain"]["mean_abs_contribution"] >= 0).all()
+
+
+def test_export_registers_version(tmp_path):
+    """--register ajoute le pipeline exporté au registre, avec son seuil et ses métriques."""
+    import model_registry
+
+    data = str(tmp_path / "train.csv")
+    _write_dataset(data)
+    manifest = model_registry.manifest_path(str(tmp_path))
+    res = train_pipeline.main([
+        data, "--cache-dir", str(tmp_path / "cache"), "--families", "log_reg", "--top-k", "4",
+        "--n-jobs", "1", "--export", str(tmp_path / "v1.joblib"), "--register", "v1", "--manifest", manifest
+    ])
+
+    entry = model_registry.ModelRegistry.load(manifest).get("v1")
+    assert entry["artifact"] == "v1.joblib" and entry["features"] == res["features"]
+    assert entry["threshold"] == res["metrics"]["best_threshold"]
+    assert "cm" not in entry["metrics"] and entry["metrics"]["auc"] == res["metrics"]["auc"]
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import training
+
+
+def _write_dataset(path, n=400):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(n, 5))
+    X[rng.random(X.shape) < 0.05] = np.nan
+    df = pd.DataFrame(X, columns=[f"F{i}" for i in range(5)])
+    df.insert(0, "SK_ID_CURR", np.arange(n))
+    df["TARGET"] = (np.nan_to_num(X[:, 0]) + rng.normal(size=n) > 1.3).astype(int)
+    df.to_csv(path, index=False)
+
+
+def test_search_checkpoints_and_resumes(tmp_path):
+    """
+    Chaque essai est enregistré ; une relance ne recalcule que les
+    essais absents du checkpoint.
+    """
+    data = str(tmp_path / "train.csv")
+    _write_dataset(data)
+    out_dir = str(tmp_path / "search")
+    args = [data, "--out-dir", out_dir, "--families", "log_reg", "lgbm",
+            "--n-iter", "2", "--workers", "2", "--threads", "1"]
+
+    first = training.main(args)
+    assert first["computed"] == 4
+    assert sorted(first["best"]) == ["lgbm", "log_reg"]
+    assert len(training.load_trials(out_dir)) == 4
+    # preprocess ajusté en cache sur disque, partagé par les familles
+    assert os.listdir(os.path.join(out_dir, "preprocess_cache"))
+
+    # Arrêt brutal simulé : dernier essai perdu + ligne tronquée
+    path = os.path.join(out_dir, training.TRIALS_FILE)
+    lines = open(path).read().splitlines()
+    with open(path, "w") as f:
+        f.write("\n".join(lines[:-1]) + "\n" + lines[-1][:10])
+
+    resumed = training.main(args)
+    assert resumed["computed"] == 1
+    assert [t["params"] for t in resumed["trials"]] == [t["params"] for t in first["trials"]]
+    assert len(training.load_trials(out_dir)) == 4
+    assert training.main(args)["computed"] == 0
+
+
+def test_successive_halving_keeps_best_candidates(tmp_path):
+    data = str(tmp_path / "train.csv")
+    _write_dataset(data, n=1500)
+    out_dir = str(tmp_path / "halving")
+
+    summary = training.main([
+        data, "--out-dir", out_dir, "--halving", "--families", "lgbm", "xgb",
+        "--candidates", "4", "--factor", "2", "--max-rounds", "200",
+        "--min-rows", "200", "--workers", "1", "--threads", "1"
+    ])
+    assert [r["candidates"] for r in summary["schedule"]] == [4, 2, 1]
+    for family in ("lgbm", "xgb"):
+        rungs = [[r for r in summary["history"] if r["family"] == family and r["rung"] == i]
+                 for i in range(3)]
+        assert [len(r) for r in rungs] == [4, 2, 1]
+        # Les lignes et rounds augmentent ; les survivants sont les meilleurs du rung précédent
+        assert rungs[0][0]["rows"] < rungs[1][0]["rows"] < rungs[2][0]["rows"]
+        best_first = sorted(rungs[0], key=lambda r: (r["business_cost"], -r["roc_auc"]))[:2]
+        assert {r["trial"] for r in rungs[1]} == {r["trial"] for r in best_first}
+        best = summary["best"][family]
+        assert best["params"]["clf__n_estimators"] == best["best_iteration"] <= 200
+    assert os.path.exists(os.path.join(out_dir, training.HALVING_FILE))
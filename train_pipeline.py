@@ -0,0 +1,390 @@
+"""
+Chaîne d'entraînement du notebook de modélisation, découpée en étapes
+aux artefacts adressés par contenu :
+
+    data        split train / test          <- sha256 du fichier brut
+    preprocess  SimpleImputer + StandardScaler ajusté sur X_train
+    fit:<fam>   classifieur ajusté + métriques (équivalent fit_eval_model)
+    reduce      pipeline top-k features (modèle exporté pour l'API)
+    explain     importances globales (contributions natives LightGBM / XGBoost)
+
+La clé d'une étape est le hash de ses entrées (clés des étapes amont,
+paramètres, version de l'étape). Une relance ne recalcule que les
+étapes dont une entrée a changé ; les autres sont relues depuis le
+cache local, et les artefacts amont ne sont même pas chargés quand
+toutes les étapes aval sont déjà en cache.
+
+Usage :
+    python -m train_pipeline Data/app_train.csv
+    python -m train_pipeline Data/app_train.csv --params-from runs/search/halving.json \\
+        --export models/pipeline_best_model_top20.joblib
+    python -m train_pipeline Data/app_train.csv --export models/top20-v2.joblib --register top20-v2
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import f1_score, roc_auc_score
+from sklearn.pipeline import Pipeline
+
+import training
+from business_cost import business_cost_with_best_threshold
+from model_registry import ModelRegistry, manifest_path
+
+
+CACHE_DIR = os.path.join(".cache", "train_pipeline")
+
+# À incrémenter quand le code d'une étape change : ses artefacts
+# (et ceux des étapes aval) sont alors recalculés
+STAGE_VERSIONS = {"data": 2, "preprocess": 1, "fit": 1, "reduce": 1, "explain": 1}
+
+_STAGE_ORDER = ["data", "preprocess", "fit", "reduce", "explain"]
+
+TOP_K = 20
+EXPLAIN_ROWS = 5000
+
+
+# ============================================================
+# 🗄️ CACHE D'ARTEFACTS
+# ============================================================
+
+
+class ArtifactCache:
+    """
+    Artefacts joblib rangés par étape et par clé de contenu :
+    <root>/<stage>/<key>.joblib + <key>.json (métadonnées lisibles
+    sans charger l'artefact : métriques, durée de calcul).
+    """
+
+    def __init__(self, root=CACHE_DIR):
+        self.root = root
+
+    def key(self, stage, **inputs):
+        payload = json.dumps(
+            {"stage": stage, "version": STAGE_VERSIONS[stage], "inputs": inputs},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    def _path(self, stage, key, ext):
+        return os.path.join(self.root, stage, f"{key}.{ext}")
+
+    def has(self, stage, key):
+        return (os.path.exists(self._path(stage, key, "joblib"))
+                and os.path.exists(self._path(stage, key, "json")))
+
+    def load(self, stage, key):
+        return joblib.load(self._path(stage, key, "joblib"))
+
+    def meta(self, stage, key):
+        with open(self._path(stage, key, "json")) as f:
+            return json.load(f)
+
+    def save(self, stage, key, obj, meta):
+        os.makedirs(os.path.join(self.root, stage), exist_ok=True)
+        # Écriture atomique ; les métadonnées en dernier : elles valident l'artefact
+        for ext, write in (
+            ("joblib", lambda p: joblib.dump(obj, p)),
+            ("json", lambda p: _write_json(p, meta)),
+        ):
+            path = self._path(stage, key, ext)
+            write(path + ".tmp")
+            os.replace(path + ".tmp", path)
+
+
+def _write_json(path, obj):
+    with open(path, "w") as f:
+        json.dump(obj, f, indent=2, default=str)
+
+
+def file_sha256(path, cache):
+    """sha256 du fichier brut, mémorisé par (taille, mtime) pour éviter de le relire."""
+    st = os.stat(path)
+    memo_path = os.path.join(cache.root, "raw_hashes.json")
+    memo = {}
+    if os.path.exists(memo_path):
+        with open(memo_path) as f:
+            memo = json.load(f)
+
+    entry = memo.get(os.path.abspath(path))
+    if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+        return entry["sha256"]
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    memo[os.path.abspath(path)] = {
+        "size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": h.hexdigest()
+    }
+    os.makedirs(cache.root, exist_ok=True)
+    _write_json(memo_path + ".tmp", memo)
+    os.replace(memo_path + ".tmp", memo_path)
+    return h.hexdigest()
+
+
+def _stage(cache, report, name, stage, key, compute):
+    """Relit l'artefact `key` ou le calcule (compute() -> (artefact, métadonnées))."""
+    if cache.has(stage, key):
+        report[name] = "cache"
+        return cache.load(stage, key)
+    t0 = time.perf_counter()
+    obj, meta = compute()
+    meta = dict(meta, key=key, compute_time_s=time.perf_counter() - t0)
+    cache.save(stage, key, obj, meta)
+    report[name] = "calculé"
+    print(f"  ⚙️ {name:14s} calculé en {meta['compute_time_s']:.1f}s")
+    return obj
+
+
+# ============================================================
+# 🧪 ÉTAPES
+# ============================================================
+
+
+def _evaluate(proba, pred, y_test):
+    cost, threshold, cm = business_cost_with_best_threshold(y_test, proba)
+    return {
+        "auc": float(roc_auc_score(y_test, proba)),
+        "f1": float(f1_score(y_test, pred)),
+        "business_cost": float(cost),
+        "best_threshold": threshold,
+        "cm": cm.tolist()
+    }
+
+
+def _make_classifier(family, params, y_train, n_jobs):
+    scale_pos = float((y_train == 0).sum() / max((y_train == 1).sum(), 1))
+    clf = training.MODEL_FAMILIES[family][0](scale_pos, n_jobs)
+    clf.set_params(**{k.split("__", 1)[1]: v for k, v in params.items()})
+    return clf
+
+
+def feature_importances(clf, feature_names):
+    """Importances du classifieur (feature_importances_ ou |coef_|), triées."""
+    if hasattr(clf, "feature_importances_"):
+        importances = clf.feature_importances_
+    elif hasattr(clf, "coef_"):
+        importances = np.abs(clf.coef_).ravel()
+    else:
+        raise ValueError("Modèle non compatible feature importance")
+    return (
+        pd.DataFrame({"feature": feature_names, "importance": importances})
+        .sort_values("importance", ascending=False, kind="mergesort")
+        .reset_index(drop=True)
+    )
+
+
+def native_contributions(pipe, X):
+    """
+    Contributions SHAP natives (LightGBM pred_contrib / XGBoost
+    pred_contribs) du pipeline réduit ; None pour les autres familles.
+    Dernière colonne : biais.
+    """
+    clf = pipe.named_steps["clf"]
+    Xt = pipe.named_steps["preprocess"].transform(X)
+    module = type(clf).__module__.split(".")[0]
+    if module == "lightgbm":
+        return clf.booster_.predict(Xt, pred_contrib=True)
+    if module == "xgboost":
+        import xgboost
+        return clf.get_booster().predict(xgboost.DMatrix(Xt), pred_contribs=True)
+    return None
+
+
+# ============================================================
+# 🚀 CHAÎNE COMPLÈTE
+# ============================================================
+
+
+def run_pipeline(data_path, cache_dir=CACHE_DIR, families=None, params=None,
+                 test_size=0.2, top_k=TOP_K, n_jobs=None, export=None, float32=False):
+    """
+    Exécute la chaîne en ne recalculant que les étapes dont les entrées
+    ont changé. Renvoie le pipeline réduit, les métriques par famille,
+    la famille retenue (coût métier minimal) et le statut de chaque étape.
+    """
+    cache = ArtifactCache(cache_dir)
+    families = families or training.available_families()
+    params = params or {}
+    n_jobs = n_jobs or os.cpu_count() or 1
+    report = {}
+    t0 = time.perf_counter()
+
+    # --- data ------------------------------------------------
+    data_key = cache.key(
+        "data", raw_sha256=file_sha256(data_path, cache),
+        test_size=test_size, random_state=training.RANDOM_STATE, float32=float32
+    )
+
+    @functools.lru_cache(maxsize=None)
+    def split():
+        def compute():
+            X, y = training.load_xy(data_path, float32)
+            X_train, X_test, y_train, y_test = training.split_train_test(X, y, test_size)
+            data = {"X_train": X_train, "X_test": X_test, "y_train": y_train, "y_test": y_test}
+            return data, {"rows": len(y), "columns": X.shape[1], "positive_rate": float(y.mean())}
+        return _stage(cache, report, "data", "data", data_key, compute)
+
+    # --- preprocess ------------------------------------------
+    prep_key = cache.key("preprocess", data=data_key, float32=float32)
+
+    @functools.lru_cache(maxsize=None)
+    def preprocess():
+        def compute():
+            X_train = split()["X_train"]
+            return training.make_preprocess(X_train.columns, float32).fit(X_train), {}
+        return _stage(cache, report, "preprocess", "preprocess", prep_key, compute)
+
+    @functools.lru_cache(maxsize=None)
+    def transformed():
+        d = split()
+        return preprocess().transform(d["X_train"]), preprocess().transform(d["X_test"])
+
+    # --- fit:<famille> ----------------------------------------
+    fits = {}
+    for family in families:
+        fit_key = cache.key("fit", preprocess=prep_key, family=family,
+                            params=params.get(family, {}))
+
+        def compute(family=family):
+            d = split()
+            Xt_train, Xt_test = transformed()
+            clf = _make_classifier(family, params.get(family, {}), d["y_train"], n_jobs)
+            clf.fit(Xt_train, d["y_train"])
+            metrics = _evaluate(clf.predict_proba(Xt_test)[:, 1], clf.predict(Xt_test), d["y_test"])
+            return clf, {"family": family, "params": params.get(family, {}), "metrics": metrics}
+
+        if cache.has("fit", fit_key):
+            report[f"fit:{family}"] = "cache"
+        else:
+            _stage(cache, report, f"fit:{family}", "fit", fit_key, compute)
+        fits[family] = {"key": fit_key, **cache.meta("fit", fit_key)}
+
+    best_family = min(fits, key=lambda f: fits[f]["metrics"]["business_cost"])
+
+    # --- reduce ------------------------------------------------
+    reduce_key = cache.key("reduce", fit=fits[best_family]["key"], top_k=top_k)
+
+    def compute_reduce():
+        d = split()
+        clf = cache.load("fit", fits[best_family]["key"])
+        fi = feature_importances(clf, preprocess().get_feature_names_out())
+        api_features = sorted({
+            f.replace("num__", "").replace("num_", "") for f in fi["feature"].head(top_k)
+        })
+        pipe = Pipeline([
+            ("preprocess", training.make_preprocess(api_features, float32)),
+            ("clf", clone(clf))
+        ])
+        pipe.fit(d["X_train"][api_features], d["y_train"])
+        proba = pipe.predict_proba(d["X_test"][api_features])[:, 1]
+        metrics = _evaluate(proba, pipe.predict(d["X_test"][api_features]), d["y_test"])
+        return pipe, {"family": best_family, "features": api_features, "metrics": metrics}
+
+    reduced = _stage(cache, report, "reduce", "reduce", reduce_key, compute_reduce)
+    reduced_meta = cache.meta("reduce", reduce_key)
+
+    # --- explain -----------------------------------------------
+    explain_key = cache.key("explain", reduce=reduce_key, rows=EXPLAIN_ROWS)
+
+    def compute_explain():
+        X_test = split()["X_test"][reduced_meta["features"]]
+        sample = X_test.sample(min(EXPLAIN_ROWS, len(X_test)), random_state=training.RANDOM_STATE)
+        contrib = native_contributions(reduced, sample)
+        importances = pd.DataFrame({
+            "feature": reduced_meta["features"],
+            "mean_abs_contribution": np.abs(contrib[:, :-1]).mean(axis=0)
+        }).sort_values("mean_abs_contribution", ascending=False).reset_index(drop=True)
+        return importances, {"rows": len(sample)}
+
+    explain = None
+    if best_family in training.HALVING_FAMILIES:
+        explain = _stage(cache, report, "explain", "explain", explain_key, compute_explain)
+    else:
+        report["explain"] = "ignoré"
+
+    # Étapes amont jamais chargées : tout l'aval était déjà en cache
+    for name, stage, key in (("data", "data", data_key), ("preprocess", "preprocess", prep_key)):
+        report.setdefault(name, "cache" if cache.has(stage, key) else "non requis")
+    report = dict(sorted(report.items(), key=lambda kv: _STAGE_ORDER.index(kv[0].split(":")[0])))
+
+    if export:
+        os.makedirs(os.path.dirname(os.path.abspath(export)), exist_ok=True)
+        joblib.dump(reduced, export + ".tmp")
+        os.replace(export + ".tmp", export)
+        print(f"📦 Modèle réduit exporté : {export}")
+
+    print(f"✅ Chaîne terminée en {time.perf_counter() - t0:.1f}s — famille retenue : {best_family}")
+    for name, status in report.items():
+        print(f"  {'♻️' if status == 'cache' else '⚙️'} {name:14s} {status}")
+
+    return {
+        "pipeline": reduced,
+        "features": reduced_meta["features"],
+        "metrics": reduced_meta["metrics"],
+        "best_family": best_family,
+        "fits": fits,
+        "explain": explain,
+        "stages": report,
+    }
+
+
+def load_params(path):
+    """Meilleurs paramètres par famille depuis halving.json ou trials.jsonl (training)."""
+    if path.endswith(".jsonl"):
+        with open(path) as f:
+            best = training.best_trials(json.loads(line) for line in f if line.strip())
+    else:
+        with open(path) as f:
+            best = json.load(f)["best"]
+    return {family: r["params"] for family, r in best.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chaîne d'entraînement incrémentale (artefacts en cache).")
+    parser.add_argument("data", help="jeu d'entraînement CSV ou Parquet (avec TARGET)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--families", nargs="+", choices=list(training.MODEL_FAMILIES), default=None)
+    parser.add_argument("--params-from", default=None, help="halving.json ou trials.jsonl (training)")
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--top-k", type=int, default=TOP_K)
+    parser.add_argument("--n-jobs", type=int, default=None)
+    parser.add_argument("--float32", action="store_true", help="prétraitement float32 (Float32Preprocessor)")
+    parser.add_argument("--export", default=None, help="chemin du pipeline réduit à écrire (joblib)")
+    parser.add_argument("--register", default=None, metavar="VERSION",
+                        help="enregistre le pipeline exporté dans le registre (model_registry)")
+    parser.add_argument("--manifest", default=manifest_path(), help="manifeste du registre")
+    args = parser.parse_args(argv)
+    if args.register and not args.export:
+        parser.error("--register exige --export")
+
+    params = load_params(args.params_from) if args.params_from else None
+    result = run_pipeline(
+        args.data, cache_dir=args.cache_dir, families=args.families, params=params,
+        test_size=args.test_size, top_k=args.top_k, n_jobs=args.n_jobs, export=args.export,
+        float32=args.float32
+    )
+
+    if args.register:
+        # Seuil métier et métriques du pipeline réduit, évalué sur le jeu de test
+        metrics = {k: v for k, v in result["metrics"].items() if k != "cm"}
+        registry = ModelRegistry.load(args.manifest)
+        registry.register(
+            args.export, args.register, metrics["best_threshold"], metrics, features=result["features"]
+        )
+        registry.save()
+        print(f"🗂️ Version enregistrée : {args.register} (seuil {metrics['best_threshold']:.3f})")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,627 @@
+"""
+Recherche d'hyperparamètres des quatre familles de modèles du notebook
+(régression logistique, XGBoost, LightGBM, Gradient Boosting) sur un
+pool de processus, avec le coût métier comme critère de sélection.
+
+- Prétraitement mis en cache : chaque pipeline est construit avec
+  Pipeline(memory=...) ; le preprocess (SimpleImputer + StandardScaler)
+  ajusté sur un fold est réutilisé par tous les essais, toutes familles
+  confondues, au lieu d'être recalculé à chaque fit.
+- Parallélisme contrôlé : `--workers` processus, chacun limité à
+  `--threads` threads (OpenMP / BLAS via threadpoolctl, n_jobs du
+  classifieur) pour éviter la sur-souscription des cœurs.
+- Reprise : chaque essai terminé est ajouté à `trials.jsonl` ; un run
+  interrompu reprend sans recalculer les essais déjà présents.
+- `--halving` (LightGBM / XGBoost) : successive halving sur le nombre
+  de lignes et de rounds de boosting, avec early stopping natif sur un
+  fold de validation ; les mauvaises configurations sont éliminées tôt.
+
+Usage :
+    python -m training Data/app_train.csv --out-dir runs/search --workers 4
+    python -m training Data/app_train.csv --families lgbm xgb --n-iter 10
+    python -m training Data/app_train.csv --halving --candidates 27 --factor 3
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import (
+    ParameterGrid, ParameterSampler, StratifiedKFold, cross_validate, train_test_split
+)
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from threadpoolctl import threadpool_limits
+
+from business_cost import business_cost_with_best_threshold, business_scoring
+from dataset_cache import load_dataset
+from float32_preprocess import Float32Preprocessor
+
+try:
+    import lightgbm as lgb
+    from lightgbm import LGBMClassifier
+    HAS_LGBM = True
+except ImportError:
+    HAS_LGBM = False
+
+try:
+    from xgboost import XGBClassifier
+    HAS_XGB = True
+except ImportError:
+    HAS_XGB = False
+
+
+TARGET_COL = "TARGET"
+ID_COL = "SK_ID_CURR"
+RANDOM_STATE = 42
+
+TRIALS_FILE = "trials.jsonl"
+HALVING_FILE = "halving.json"
+MANIFEST = "_manifest.json"
+
+# Successive halving : familles à boosting et arrêt anticipé natif
+HALVING_FAMILIES = ("lgbm", "xgb")
+EARLY_STOPPING_ROUNDS = 50
+
+
+# ============================================================
+# 🧱 PIPELINES (mêmes choix que le notebook de modélisation)
+# ============================================================
+
+
+def make_preprocess(columns, float32=False):
+    """
+    Imputation médiane + standardisation sur toutes les colonnes numériques.
+    float32=True : Float32Preprocessor (une seule matrice float32, transform
+    sur place, passage sans copie aux boosters).
+    """
+    if float32:
+        return Float32Preprocessor(columns=list(columns))
+    numeric_pipe = Pipeline([
+        ("imputer", SimpleImputer(strategy="median")),
+        ("scaler", StandardScaler())
+    ])
+    return ColumnTransformer([("num", numeric_pipe, list(columns))])
+
+
+def _log_reg(scale_pos, n_jobs):
+    return LogisticRegression(
+        penalty="l2", solver="lbfgs", class_weight="balanced", max_iter=1000
+    )
+
+
+def _xgb(scale_pos, n_jobs):
+    return XGBClassifier(
+        objective="binary:logistic", scale_pos_weight=scale_pos, tree_method="hist",
+        eval_metric="auc", random_state=RANDOM_STATE, n_jobs=n_jobs
+    )
+
+
+def _lgbm(scale_pos, n_jobs):
+    return LGBMClassifier(
+        objective="binary", scale_pos_weight=scale_pos, n_estimators=500,
+        learning_rate=0.03, num_leaves=31, subsample=0.8, colsample_bytree=0.8,
+        random_state=RANDOM_STATE, n_jobs=n_jobs, verbose=-1
+    )
+
+
+def _gb(scale_pos, n_jobs):
+    return GradientBoostingClassifier(
+        learning_rate=0.05, n_estimators=300, max_depth=3, subsample=0.8,
+        random_state=RANDOM_STATE
+    )
+
+
+# famille -> (classifieur, espace de recherche, nombre d'essais)
+MODEL_FAMILIES = {
+    "log_reg": (_log_reg, {"clf__C": [0.01, 0.1, 1, 10]}, 4),
+    "xgb": (_xgb, {
+        "clf__n_estimators": [200, 400, 600],
+        "clf__learning_rate": [0.01, 0.03, 0.05, 0.1],
+        "clf__max_depth": [3, 5, 7],
+        "clf__subsample": [0.7, 0.8, 0.9, 1.0],
+        "clf__colsample_bytree": [0.7, 0.8, 1.0],
+        "clf__reg_lambda": [0.5, 1.0, 2.0],
+    }, 25),
+    "lgbm": (_lgbm, {
+        "clf__n_estimators": [200, 400, 600],
+        "clf__learning_rate": [0.01, 0.03, 0.05, 0.1],
+        "clf__num_leaves": [31, 63, 127],
+        "clf__subsample": [0.8, 1.0],
+        "clf__colsample_bytree": [0.7, 0.8, 1.0],
+    }, 25),
+    "gb": (_gb, {
+        "clf__n_estimators": [100, 200, 300],
+        "clf__learning_rate": [0.03, 0.05, 0.1],
+        "clf__max_depth": [2, 3, 4],
+        "clf__subsample": [0.8, 1.0],
+    }, 10),
+}
+
+
+def available_families():
+    unavailable = set()
+    if not HAS_XGB:
+        unavailable.add("xgb")
+    if not HAS_LGBM:
+        unavailable.add("lgbm")
+    return [f for f in MODEL_FAMILIES if f not in unavailable]
+
+
+def build_pipeline(family, columns, scale_pos=1.0, n_jobs=1, memory=None, float32=False):
+    """
+    Pipeline preprocess -> clf d'une famille. Avec `memory` (dossier ou
+    joblib.Memory), le preprocess ajusté est mis en cache sur disque.
+    """
+    factory = MODEL_FAMILIES[family][0]
+    return Pipeline([
+        ("preprocess", make_preprocess(columns, float32)),
+        ("clf", factory(scale_pos, n_jobs))
+    ], memory=memory)
+
+
+def sample_trials(families, n_iter=None, random_state=RANDOM_STATE):
+    """
+    Liste déterministe des essais (famille, indice, paramètres),
+    entrelacés entre familles pour qu'elles avancent en parallèle.
+    """
+    per_family = []
+    for family in families:
+        _, space, default_iter = MODEL_FAMILIES[family]
+        n = min(n_iter or default_iter, len(ParameterGrid(space)))
+        sampler = ParameterSampler(space, n_iter=n, random_state=random_state)
+        per_family.append([
+            {"family": family, "trial": i, "params": _jsonable(p)}
+            for i, p in enumerate(sampler)
+        ])
+
+    trials = []
+    for rank in range(max((len(t) for t in per_family), default=0)):
+        trials.extend(t[rank] for t in per_family if rank < len(t))
+    return trials
+
+
+# ============================================================
+# 📥 DONNÉES
+# ============================================================
+
+
+def load_xy(path, float32=False):
+    """
+    X (colonnes numériques hors identifiant) et y (TARGET) du jeu complet.
+    float32=True : lus depuis le cache Feather typé du CSV (float32) ;
+    sinon lecture float64 du fichier, comme le notebook.
+    """
+    if float32:
+        df = load_dataset(path)
+    else:
+        df = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+    if TARGET_COL not in df.columns:
+        raise ValueError(f"colonne cible {TARGET_COL} absente de {path}")
+
+    y = df[TARGET_COL].astype(int)
+    X = df.drop(columns=[TARGET_COL, ID_COL], errors="ignore")
+    return X.select_dtypes(include=[np.number]), y
+
+
+def split_train_test(X, y, test_size=0.2, random_state=RANDOM_STATE):
+    """Split stratifié du notebook : X_train, X_test, y_train, y_test."""
+    return train_test_split(X, y, test_size=test_size, stratify=y, random_state=random_state)
+
+
+def load_training_data(path, test_size=0.2, random_state=RANDOM_STATE, float32=False):
+    """
+    X_train / y_train du notebook : même split stratifié 80/20,
+    le jeu de test restant réservé à l'évaluation finale.
+    """
+    X, y = load_xy(path, float32)
+    if not test_size:
+        return X, y
+    X_train, _, y_train, _ = split_train_test(X, y, test_size, random_state)
+    return X_train, y_train
+
+
+# ============================================================
+# 👷 WORKERS
+# ============================================================
+
+# Renseignés dans chaque worker par _init_worker()
+_worker = {}
+
+
+def _init_worker(data_path, test_size, cache_dir, n_threads, float32=False):
+    # Avant tout calcul : un nombre fixe de threads OpenMP / BLAS par processus
+    # (via threadpoolctl : OMP_NUM_THREADS serait sans effet, les bibliothèques
+    # natives sont déjà chargées ; n_jobs du classifieur fait le reste)
+    threadpool_limits(limits=n_threads)
+    X, y = load_training_data(data_path, test_size, float32=float32)
+    _worker.update(X=X, y=y, cache_dir=cache_dir, n_threads=n_threads, float32=float32)
+
+
+def evaluate_trial(trial, X, y, cv=3, cache_dir=None, n_threads=1, float32=False):
+    """Validation croisée d'un essai ; renvoie l'essai complété de ses scores."""
+    scale_pos = float((y == 0).sum() / max((y == 1).sum(), 1))
+    pipe = build_pipeline(trial["family"], X.columns, scale_pos, n_threads,
+                          memory=cache_dir, float32=float32)
+    pipe.set_params(**trial["params"])
+
+    t0 = time.perf_counter()
+    with threadpool_limits(limits=n_threads):
+        scores = cross_validate(
+            pipe, X, y, scoring=business_scoring(), n_jobs=1,
+            cv=StratifiedKFold(n_splits=cv, shuffle=True, random_state=RANDOM_STATE)
+        )
+    return dict(
+        trial,
+        business_cost=float(-np.mean(scores["test_business_cost"])),
+        business_threshold=float(np.mean(scores["test_business_threshold"])),
+        roc_auc=float(np.mean(scores["test_roc_auc"])),
+        fit_time_s=float(np.sum(scores["fit_time"])),
+        elapsed_s=time.perf_counter() - t0
+    )
+
+
+def _run_trial(trial, cv):
+    return evaluate_trial(
+        trial, _worker["X"], _worker["y"], cv=cv,
+        cache_dir=_worker["cache_dir"], n_threads=_worker["n_threads"],
+        float32=_worker["float32"]
+    )
+
+
+# ============================================================
+# 💾 CHECKPOINT
+# ============================================================
+
+
+def _trial_key(trial):
+    return trial["family"], trial["trial"]
+
+
+def load_trials(out_dir):
+    """Essais déjà terminés ; une dernière ligne tronquée (arrêt brutal) est ignorée."""
+    path = os.path.join(out_dir, TRIALS_FILE)
+    done = []
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                try:
+                    done.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+    return done
+
+
+def _rewrite_trials(out_dir, done):
+    """Réécrit le checkpoint sans la ligne tronquée éventuelle (avant d'y ajouter des essais)."""
+    path = os.path.join(out_dir, TRIALS_FILE)
+    with open(path + ".tmp", "w") as f:
+        f.writelines(json.dumps(r) + "\n" for r in done)
+    os.replace(path + ".tmp", path)
+
+
+def _append_trial(out_dir, result):
+    with open(os.path.join(out_dir, TRIALS_FILE), "a") as f:
+        f.write(json.dumps(result) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _check_manifest(out_dir, manifest):
+    """Refuse de reprendre une recherche lancée avec d'autres paramètres."""
+    path = os.path.join(out_dir, MANIFEST)
+    if os.path.exists(path):
+        with open(path) as f:
+            previous = json.load(f)
+        if previous != manifest:
+            raise SystemExit(
+                f"❌ {out_dir} contient une recherche différente ({previous}) — "
+                "changez --out-dir ou supprimez ce dossier."
+            )
+    else:
+        with open(path, "w") as f:
+            json.dump(manifest, f, indent=2)
+
+
+def _jsonable(params):
+    return {k: v.item() if isinstance(v, np.generic) else v for k, v in params.items()}
+
+
+# ============================================================
+# 🚀 RECHERCHE
+# ============================================================
+
+
+def run_search(data_path, out_dir, families=None, n_iter=None, cv=3,
+               workers=None, threads=None, test_size=0.2, cache_dir=None, float32=False):
+    """
+    Lance (ou reprend) la recherche et renvoie, par famille, le
+    meilleur essai au sens du coût métier.
+    """
+    families = families or available_families()
+    workers = workers or min(len(families), os.cpu_count() or 1)
+    threads = threads or max(1, (os.cpu_count() or 1) // workers)
+    cache_dir = cache_dir or os.path.join(out_dir, "preprocess_cache")
+    os.makedirs(out_dir, exist_ok=True)
+
+    st = os.stat(data_path)
+    _check_manifest(out_dir, {
+        "data": os.path.abspath(data_path),
+        "data_size": st.st_size,
+        "data_mtime_ns": st.st_mtime_ns,
+        "test_size": test_size,
+        "cv": cv,
+        "n_iter": n_iter,
+        "families": families,
+        "float32": float32
+    })
+
+    trials = sample_trials(families, n_iter)
+    previous = load_trials(out_dir)
+    _rewrite_trials(out_dir, previous)
+    done = {_trial_key(t): t for t in previous}
+    todo = [t for t in trials if _trial_key(t) not in done]
+    print(f"🔎 {len(trials)} essais ({len(done)} repris) — {workers} workers × {threads} threads")
+
+    t0 = time.perf_counter()
+    if todo:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(data_path, test_size, cache_dir, threads, float32)
+        ) as pool:
+            pending = {pool.submit(_run_trial, t, cv) for t in todo}
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    result = fut.result()
+                    _append_trial(out_dir, result)
+                    done[_trial_key(result)] = result
+                    print(
+                        f"  ✔ {result['family']}#{result['trial']} coût={result['business_cost']:.0f} "
+                        f"auc={result['roc_auc']:.4f} ({result['elapsed_s']:.1f}s) "
+                        f"[{len(done)}/{len(trials)}]",
+                        file=sys.stderr
+                    )
+
+    results = [done[_trial_key(t)] for t in trials]
+    best = best_trials(results)
+    print(f"✅ Recherche terminée en {time.perf_counter() - t0:.1f}s")
+    for family, r in best.items():
+        print(f"  🏆 {family:8s} coût={r['business_cost']:.0f} auc={r['roc_auc']:.4f} {r['params']}")
+    return {"trials": results, "best": best, "computed": len(todo)}
+
+
+def best_trials(results):
+    """Meilleur essai par famille (coût métier minimal)."""
+    best = {}
+    for r in results:
+        if r["family"] not in best or r["business_cost"] < best[r["family"]]["business_cost"]:
+            best[r["family"]] = r
+    return best
+
+
+# ============================================================
+# ✂️ SUCCESSIVE HALVING (LightGBM / XGBoost)
+# ============================================================
+# Rung i : budget = factor^-(R-1-i) des lignes d'entraînement et du
+# nombre maximal de rounds ; chaque candidat s'arrête de lui-même
+# (early stopping sur le fold de validation) et seul le meilleur
+# 1/factor (coût métier sur la validation) passe au rung suivant.
+# ------------------------------------------------------------
+
+
+def halving_schedule(n_candidates, factor=3, n_rows=None, min_rows=1000,
+                     max_rounds=1000, min_rounds=50):
+    """Liste des rungs : (candidats gardés, lignes, rounds max)."""
+    n_rungs = 1
+    while factor ** n_rungs <= n_candidates:
+        n_rungs += 1
+    if n_rows is not None:
+        # Pas de rung plus petit que min_rows
+        while n_rungs > 1 and n_rows / factor ** (n_rungs - 1) < min_rows:
+            n_rungs -= 1
+
+    schedule = []
+    for i in range(n_rungs):
+        fraction = float(factor) ** -(n_rungs - 1 - i)
+        schedule.append({
+            "rung": i,
+            "candidates": max(1, n_candidates // factor ** i),
+            "fraction": fraction,
+            "max_rounds": max(min_rounds, int(round(max_rounds * fraction)))
+        })
+    return schedule
+
+
+def sample_halving_candidates(families, n_candidates, random_state=RANDOM_STATE):
+    """Candidats par famille ; n_estimators est remplacé par le budget de rounds."""
+    candidates = []
+    for family in families:
+        space = {k: v for k, v in MODEL_FAMILIES[family][1].items() if k != "clf__n_estimators"}
+        n = min(n_candidates, len(ParameterGrid(space)))
+        for i, p in enumerate(ParameterSampler(space, n_iter=n, random_state=random_state)):
+            candidates.append({"family": family, "trial": i, "params": _jsonable(p)})
+    return candidates
+
+
+def _halving_rows(X, y, val_size, fraction, random_state=RANDOM_STATE):
+    """Fold de validation fixe + sous-échantillon stratifié des lignes d'entraînement."""
+    X_tr, X_val, y_tr, y_val = train_test_split(
+        X, y, test_size=val_size, stratify=y, random_state=random_state
+    )
+    if fraction < 1:
+        X_tr, _, y_tr, _ = train_test_split(
+            X_tr, y_tr, train_size=fraction, stratify=y_tr, random_state=random_state
+        )
+    return X_tr, y_tr, X_val, y_val
+
+
+def fit_early_stopping(candidate, X_tr, y_tr, X_val, y_val, max_rounds, n_threads=1,
+                       float32=False):
+    """
+    Preprocess ajusté sur X_tr puis booster entraîné jusqu'à `max_rounds`
+    rounds avec arrêt anticipé natif sur (X_val, y_val).
+    Renvoie le candidat complété : rounds utiles, coût métier, seuil, AUC.
+    """
+    family = candidate["family"]
+    if family not in HALVING_FAMILIES:
+        raise ValueError(f"famille sans early stopping natif : {family}")
+
+    scale_pos = float((y_tr == 0).sum() / max((y_tr == 1).sum(), 1))
+    preprocess = make_preprocess(X_tr.columns, float32)
+    Xt = preprocess.fit_transform(X_tr)
+    Xv = preprocess.transform(X_val)
+
+    clf = MODEL_FAMILIES[family][0](scale_pos, n_threads)
+    clf.set_params(n_estimators=max_rounds, **{
+        k.split("__", 1)[1]: v for k, v in candidate["params"].items()
+    })
+
+    t0 = time.perf_counter()
+    with threadpool_limits(limits=n_threads):
+        if family == "lgbm":
+            clf.fit(Xt, y_tr, eval_set=[(Xv, y_val)],
+                    callbacks=[lgb.early_stopping(EARLY_STOPPING_ROUNDS, verbose=False)])
+            best_iteration = clf.best_iteration_ or max_rounds
+            proba = clf.predict_proba(Xv, num_iteration=best_iteration)[:, 1]
+        else:
+            clf.set_params(early_stopping_rounds=EARLY_STOPPING_ROUNDS)
+            clf.fit(Xt, y_tr, eval_set=[(Xv, y_val)], verbose=False)
+            # XGBoost >= 2.0 prédit avec best_iteration après early stopping
+            best_iteration = clf.best_iteration + 1
+            proba = clf.predict_proba(Xv)[:, 1]
+    fit_time = time.perf_counter() - t0
+
+    cost, threshold, _ = business_cost_with_best_threshold(y_val, proba)
+    return dict(
+        candidate,
+        rows=int(len(y_tr)),
+        max_rounds=max_rounds,
+        best_iteration=int(best_iteration),
+        business_cost=float(cost),
+        business_threshold=threshold,
+        roc_auc=float(roc_auc_score(y_val, proba)),
+        fit_time_s=fit_time
+    )
+
+
+def _run_halving(candidate, val_size, fraction, max_rounds):
+    X_tr, y_tr, X_val, y_val = _halving_rows(_worker["X"], _worker["y"], val_size, fraction)
+    return fit_early_stopping(candidate, X_tr, y_tr, X_val, y_val, max_rounds,
+                              _worker["n_threads"], _worker["float32"])
+
+
+def run_halving(data_path, out_dir, families=None, n_candidates=27, factor=3,
+                max_rounds=1000, min_rows=1000, val_size=0.2, workers=None,
+                threads=None, test_size=0.2, float32=False):
+    """
+    Successive halving par famille ; tous les candidats d'un rung
+    tournent en parallèle sur le pool. Écrit `halving.json` et renvoie
+    l'historique des rungs et le meilleur candidat par famille
+    (params avec n_estimators = rounds utiles au dernier rung).
+    """
+    families = families or [f for f in HALVING_FAMILIES if f in available_families()]
+    workers = workers or os.cpu_count() or 1
+    threads = threads or max(1, (os.cpu_count() or 1) // workers)
+    os.makedirs(out_dir, exist_ok=True)
+
+    X, y = load_training_data(data_path, test_size, float32=float32)
+    n_train_rows = int(len(y) * (1 - val_size))
+    schedule = halving_schedule(n_candidates, factor, n_train_rows, min_rows, max_rounds)
+    alive = sample_halving_candidates(families, n_candidates)
+    print(f"✂️ Successive halving : {len(alive)} candidats, {len(schedule)} rungs — "
+          f"{workers} workers × {threads} threads")
+
+    t0 = time.perf_counter()
+    history = []
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker,
+        initargs=(data_path, test_size, None, threads, float32)
+    ) as pool:
+        for rung in schedule:
+            futures = [
+                pool.submit(_run_halving, c, val_size, rung["fraction"], rung["max_rounds"])
+                for c in alive
+            ]
+            results = [dict(f.result(), rung=rung["rung"]) for f in futures]
+            history.extend(results)
+
+            keep = max(1, rung["candidates"] // factor)
+            alive = []
+            for family in families:
+                ranked = sorted(
+                    (r for r in results if r["family"] == family),
+                    key=lambda r: (r["business_cost"], -r["roc_auc"])
+                )
+                alive.extend(
+                    {"family": r["family"], "trial": r["trial"], "params": r["params"]}
+                    for r in ranked[:keep]
+                )
+            print(
+                f"  rung {rung['rung']} : {len(results)} candidats × {results[0]['rows']:,} lignes, "
+                f"≤ {rung['max_rounds']} rounds ({time.perf_counter() - t0:.1f}s)",
+                file=sys.stderr
+            )
+
+    last_rung = schedule[-1]["rung"]
+    best = best_trials([r for r in history if r["rung"] == last_rung])
+    for r in best.values():
+        r["params"] = dict(r["params"], clf__n_estimators=r["best_iteration"])
+
+    summary = {"schedule": schedule, "history": history, "best": best,
+               "elapsed_s": time.perf_counter() - t0}
+    with open(os.path.join(out_dir, HALVING_FILE), "w") as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"✅ Successive halving terminé en {summary['elapsed_s']:.1f}s")
+    for family, r in best.items():
+        print(f"  🏆 {family:8s} coût={r['business_cost']:.0f} auc={r['roc_auc']:.4f} {r['params']}")
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recherche d'hyperparamètres parallèle avec reprise.")
+    parser.add_argument("data", help="jeu d'entraînement CSV ou Parquet (avec TARGET)")
+    parser.add_argument("--out-dir", default="runs/search")
+    parser.add_argument("--families", nargs="+", choices=list(MODEL_FAMILIES), default=None)
+    parser.add_argument("--n-iter", type=int, default=None, help="essais par famille (défaut : notebook)")
+    parser.add_argument("--cv", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--threads", type=int, default=None, help="threads par worker")
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--cache-dir", default=None, help="cache du preprocess (défaut : <out-dir>/preprocess_cache)")
+    parser.add_argument("--float32", action="store_true", help="prétraitement float32 (Float32Preprocessor)")
+    parser.add_argument("--halving", action="store_true", help="successive halving (lgbm / xgb)")
+    parser.add_argument("--candidates", type=int, default=27, help="candidats par famille (--halving)")
+    parser.add_argument("--factor", type=int, default=3, help="facteur d'élimination (--halving)")
+    parser.add_argument("--max-rounds", type=int, default=1000, help="rounds de boosting au dernier rung")
+    parser.add_argument("--min-rows", type=int, default=1000, help="lignes au premier rung (minimum)")
+    args = parser.parse_args(argv)
+
+    if args.halving:
+        return run_halving(
+            args.data, args.out_dir, families=args.families, n_candidates=args.candidates,
+            factor=args.factor, max_rounds=args.max_rounds, min_rows=args.min_rows,
+            workers=args.workers, threads=args.threads, test_size=args.test_size,
+            float32=args.float32
+        )
+
+    return run_search(
+        args.data, args.out_dir, families=args.families, n_iter=args.n_iter,
+        cv=args.cv, workers=args.workers, threads=args.threads,
+        test_size=args.test_size, cache_dir=args.cache_dir, float32=args.float32
+    )
+
+
+if __name__ == "__main__":
+    main()